@@ -0,0 +1,423 @@
+"""ObjectiveTextMiner-JP のパイプライン各段階のベンチマーク
+
+合成した日本語コーパスで各段階の処理時間とメモリ使用量を個別に計測し、JSONで出力する。
+前回の結果と比較して、処理時間が悪化した段階を検出できる。
+
+    python benchmark.py --docs 1000 --profile mail --output bench.json
+    python benchmark.py --docs 1000 --profile mail --compare bench.json
+    python benchmark.py --docs 100000 --stages tokenize,filter,cooccurrence --memory
+    python benchmark.py --stages centrality --centrality-nodes 5000 --betweenness-samples 256
+"""
+import os
+import sys
+import io
+import json
+import time
+import copy
+import random
+import platform
+import argparse
+import tempfile
+import contextlib
+import tracemalloc
+from datetime import datetime
+from collections import Counter
+
+import objective_text_miner as otm
+
+
+# 合成コーパス用の語彙（フィルタで残る語と除外される語を混ぜる）
+NOUNS = [
+    '社会', '経済', '信頼', '価値', '技術', '教育', '環境', '政策', '市場', '企業',
+    '地域', '文化', '情報', '研究', '制度', '医療', '労働', '資源', '安全', '歴史',
+    '組織', '言語', '科学', '投資', '生産', '物流', '品質', '顧客', '契約', '予算',
+    '計画', '会議', '資料', '報告', '課題', '成果', '工程', '設備', '人材', '戦略',
+    'エネルギー', 'データ', 'システム', 'ネットワーク', 'プロジェクト', 'サービス',
+]
+VERBS = ['発展する', '向上する', '変化する', '拡大する', '支える', '生み出す', '結ぶ', '守る', '築く', '高める']
+ADJECTIVES = ['重要な', '新しい', '大きい', '難しい', '強い', '広い', '早い', '詳しい']
+SUBJECTIVE = ['と思います', 'と感じます', 'と考えます', 'ようです', 'かもしれません', 'らしいです']
+CONNECTIVES = ['しかし', 'そして', 'また', 'つまり', '例えば', 'さらに', 'ところで', 'なお']
+NAMES = ['田中', '佐藤', '鈴木', '高橋', '伊藤', '渡辺']
+HONORIFICS = ['さん', '様', '氏']
+
+TEMPLATES = [
+    '{conn}、{n1}は{n2}の{n3}を{verb}。',
+    '{name}{hon}は{adj}{n1}について{n2}を{verb}{subj}。',
+    '{n1}と{n2}が{verb}ことは{adj}{n3}です。',
+    '{n1}の{n2}によって{n3}が{verb}。',
+    '{conn}、{adj}{n1}を{verb}ため{n2}と{n3}を見直します。',
+]
+
+# 文書の長さのプロファイル（1文書あたりの文数の範囲）
+PROFILES = {
+    'mail': (3, 15),
+    'article': (20, 60),
+    'report': (80, 300),
+}
+
+STAGES = (
+    'tokenize', 'filter', 'cooccurrence', 'extract_enhanced_features',
+    'find_optimal_topics', 'advanced_topic_modeling',
+    'build_network', 'create_interactive_network', 'create_static_network',
+    'create_wordcloud', 'create_analysis_dashboard', 'centrality',
+)
+
+
+def generate_document(rng, min_sentences, max_sentences):
+    """テンプレートから1文書分の日本語テキストを生成"""
+    sentences = []
+    for _ in range(rng.randint(min_sentences, max_sentences)):
+        n1, n2, n3 = rng.sample(NOUNS, 3)
+        sentences.append(rng.choice(TEMPLATES).format(
+            conn=rng.choice(CONNECTIVES), n1=n1, n2=n2, n3=n3,
+            verb=rng.choice(VERBS), adj=rng.choice(ADJECTIVES), subj=rng.choice(SUBJECTIVE),
+            name=rng.choice(NAMES), hon=rng.choice(HONORIFICS)))
+    return '\n'.join(sentences)
+
+
+def generate_corpus(num_docs, profile='mail', seed=0):
+    """合成コーパスを1文書ずつ生成"""
+    rng = random.Random(seed)
+    min_sentences, max_sentences = PROFILES[profile]
+    for _ in range(num_docs):
+        yield generate_document(rng, min_sentences, max_sentences)
+
+
+def _max_rss_kb():
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except ImportError:
+        return None
+
+
+class StageRunner:
+    """段階ごとに処理時間（繰り返しの最良値）とメモリ使用量を計測する"""
+
+    def __init__(self, repeat=1, memory=False):
+        self.repeat = max(1, repeat)
+        self.memory = memory
+        self.results = []
+
+    def run(self, name, func, **info):
+        """func を計測して結果を記録し、最後の戻り値を返す（失敗時はNone）"""
+        record = {'stage': name}
+        record.update(info)
+        result = None
+
+        try:
+            timings = []
+            rss_before = _max_rss_kb()
+            for _ in range(self.repeat):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    started = time.perf_counter()
+                    result = func()
+                    timings.append(time.perf_counter() - started)
+            record['seconds'] = min(timings)
+            record['seconds_all'] = timings
+
+            rss_after = _max_rss_kb()
+            if rss_before is not None:
+                record['max_rss_growth_kb'] = rss_after - rss_before
+
+            # tracemallocは処理を遅くするため、時間計測とは別に実行する
+            if self.memory:
+                tracemalloc.start()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    func()
+                record['peak_python_kb'] = tracemalloc.get_traced_memory()[1] // 1024
+                tracemalloc.stop()
+
+            for key in ('documents', 'tokens', 'items'):
+                if key in record and record['seconds'] > 0:
+                    record[f'{key}_per_second'] = record[key] / record['seconds']
+
+        except Exception as e:
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+            record['error'] = f"{type(e).__name__}: {e}"
+
+        print(f"{name}: {record.get('seconds', float('nan')):.3f}秒"
+              + (f"（エラー: {record['error']}）" if 'error' in record else ''), file=sys.stderr)
+        self.results.append(record)
+        return result
+
+
+def _tokenize_engines(miner):
+    """利用可能な形態素解析エンジンごとに解析関数を返す"""
+    engines = {}
+
+    for name in otm.TOKENIZER_BACKENDS:
+        if name == miner.tokenizer_backend.name:
+            backend = miner.tokenizer_backend
+        else:
+            with contextlib.redirect_stdout(io.StringIO()):
+                backend = otm.create_tokenizer_backend(name)
+        if backend is None:
+            continue
+
+        engine_miner = copy.copy(miner)
+        engine_miner.tokenizer_backend = backend
+        engines[name] = engine_miner.tokenize_many
+
+    return engines
+
+
+def _token_records(texts):
+    """フィルタ単体の計測用に (表層形, 原形, 品詞3階層) の列を作る"""
+    from janome.tokenizer import Tokenizer
+    tokenizer = Tokenizer()
+    records = []
+    for text in texts:
+        for token in tokenizer.tokenize(text):
+            pos_info = token.part_of_speech.split(',')
+            base_form = token.base_form if token.base_form != '*' else token.surface
+            records.append((token.surface, base_form, pos_info[0], pos_info[1], pos_info[2]))
+    return records
+
+
+def centrality_graph(num_nodes, seed=0):
+    """中心性の計測用に、共起ネットワークに似た次数分布の重み付きグラフを作る
+    
+    同じ語がウィンドウ内で繰り返されると共起ペアは自己ループになるため、
+    一部のノード（約5%）に自己ループも加える。
+    """
+    import networkx as nx
+    G = nx.barabasi_albert_graph(num_nodes, 3, seed=seed)
+    rng = random.Random(seed)
+    G.add_edges_from((node, node) for node in rng.sample(list(G), max(1, num_nodes // 20)))
+    for u, v in G.edges():
+        G[u][v]['weight'] = rng.randint(1, 50)
+    return G
+
+
+def _centrality_accuracy(exact, approx, top=20):
+    """NetworkXの厳密値に対する近似値の誤差・順位相関・上位語の一致率"""
+    from scipy.stats import spearmanr
+    nodes = list(exact)
+    x = [exact[node] for node in nodes]
+    y = [approx[node] for node in nodes]
+    top_exact = set(sorted(nodes, key=exact.get, reverse=True)[:top])
+    top_approx = set(sorted(nodes, key=approx.get, reverse=True)[:top])
+    return {
+        'max_abs_error': max(abs(a - b) for a, b in zip(x, y)),
+        'spearman': float(spearmanr(x, y)[0]),
+        f'top{top}_overlap': len(top_exact & top_approx) / top,
+    }
+
+
+def _benchmark_centrality(runner, args):
+    """NetworkXの厳密計算と疎行列版（厳密・k始点近似）の速度と精度を比較"""
+    import networkx as nx
+    G = centrality_graph(args.centrality_nodes, args.seed)
+    info = {'items': len(G), 'edges': G.number_of_edges()}
+
+    def networkx_centrality():
+        return {'degree': nx.degree_centrality(G), 'pagerank': nx.pagerank(G),
+                'betweenness': nx.betweenness_centrality(G)}
+    exact = runner.run('centrality[networkx]', networkx_centrality, **info)
+
+    variants = [('centrality[sparse]', None)]
+    if args.betweenness_samples and args.betweenness_samples < len(G):
+        variants.append((f'centrality[sparse,k={args.betweenness_samples}]', args.betweenness_samples))
+    for name, k in variants:
+        def sparse_centrality():
+            centrality = otm.SparseCentrality.from_graph(G)
+            return {'degree': centrality.degree(), 'pagerank': centrality.pagerank(),
+                    'betweenness': centrality.betweenness(k, args.seed)}
+        result = runner.run(name, sparse_centrality, **info)
+        if exact is not None and result is not None:
+            runner.results[-1]['accuracy'] = {measure: _centrality_accuracy(exact[measure], result[measure])
+                                              for measure in ('degree', 'pagerank', 'betweenness')}
+
+
+def run_benchmark(args):
+    stages = set(args.stages.split(',')) if args.stages else set(STAGES)
+    unknown = stages - set(STAGES)
+    if unknown:
+        raise SystemExit(f"不明な段階: {', '.join(sorted(unknown))}（指定可能: {', '.join(STAGES)}）")
+
+    runner = StageRunner(repeat=args.repeat, memory=args.memory)
+    output_dir = tempfile.mkdtemp(prefix='otm_bench_')
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        miner = otm.AdvancedTextMiner(args.config)
+    miner.config['output_dir'] = output_dir
+    miner.config['enable_semantic_filtering'] = False
+    # 繰り返し計測で前回の配置が初期値にならないよう配置キャッシュは使わない
+    miner.config['network_layout_incremental'] = False
+
+    texts = runner.run('generate_corpus',
+                       lambda: list(generate_corpus(args.docs, args.profile, args.seed)),
+                       documents=args.docs)
+    chars = sum(len(text) for text in texts)
+
+    # 1. 形態素解析（エンジン別）。フィルタ以外の段階は選択されたエンジンのトークン列を使う
+    token_docs = None
+    if stages - {'filter', 'centrality'}:
+        for engine, tokenize in _tokenize_engines(miner).items():
+            docs = runner.run(f'tokenize[{engine}]', lambda: tokenize(texts), documents=len(texts), chars=chars)
+            if engine == miner.tokenizer_backend.name:
+                token_docs = docs
+    tokens = sum(len(words) for words in token_docs or [])
+
+    # 2. 語彙フィルタ（基準実装と高速フィルタ、判定の一致も確認）
+    if 'filter' in stages:
+        records = _token_records(texts[:args.filter_docs])
+        reference = runner.run('filter[_is_meaningful_word_enhanced]',
+                               lambda: [miner._is_meaningful_word_enhanced(*r) for r in records],
+                               items=len(records))
+
+        def compiled_filter():
+            miner._build_word_filter()
+            return [miner.word_filter(*r) for r in records]
+        compiled = runner.run('filter[word_filter]', compiled_filter, items=len(records))
+
+        if reference is not None and compiled is not None:
+            runner.results[-1]['mismatches'] = sum(a != b for a, b in zip(reference, compiled))
+
+    # 3. 共起集計
+    if 'cooccurrence' in stages and token_docs is not None:
+        def cooccurrence():
+            total = otm.CooccurrenceMatrix(miner.vocabulary)
+            for words in token_docs:
+                pairs = otm.CooccurrenceMatrix(miner.vocabulary)
+                pairs.add_document(words)
+                total.update(pairs)
+            total.tocsr()
+            return total
+        pair_counter = runner.run('cooccurrence', cooccurrence, documents=len(token_docs), tokens=tokens)
+    else:
+        pair_counter = None
+
+    all_features = None
+    if 'extract_enhanced_features' in stages or 'create_analysis_dashboard' in stages:
+        all_features = runner.run('extract_enhanced_features',
+                                  lambda: [miner.extract_enhanced_features(text) for text in texts],
+                                  documents=len(texts), chars=chars)
+
+    if pair_counter is None and token_docs is not None:
+        pair_counter = otm.CooccurrenceMatrix(miner.vocabulary)
+        for words in token_docs:
+            pair_counter.add_document(words)
+    word_freq = Counter()
+    for words in token_docs or []:
+        word_freq.update(words)
+
+    # 4. トピックモデリング
+    topics = None
+    if token_docs is not None:
+        if 'find_optimal_topics' in stages:
+            runner.run('find_optimal_topics', lambda: miner._find_optimal_topics(token_docs),
+                       documents=len(token_docs))
+        if 'advanced_topic_modeling' in stages:
+            result = runner.run('advanced_topic_modeling', lambda: miner.advanced_topic_modeling(token_docs),
+                                documents=len(token_docs))
+            topics = result[0] if result else None
+
+    # 5. 可視化
+    network_path = os.path.join(output_dir, 'network_filtered.png')
+    if pair_counter is not None:
+        network = None
+        if 'build_network' in stages:
+            network = runner.run('build_network', lambda: miner.build_network(pair_counter),
+                                 note='グラフ・配置・中心性の計算')
+        if 'create_interactive_network' in stages:
+            runner.run('create_interactive_network',
+                       lambda: miner.create_interactive_network(pair_counter, network_path, network),
+                       note='静的ネットワーク図の生成を含む'
+                            + ('（配置計算を除く）' if network is not None else ''))
+        if 'create_static_network' in stages:
+            runner.run('create_static_network',
+                       lambda: miner._create_static_network(pair_counter, network_path, network))
+    if 'create_wordcloud' in stages and word_freq:
+        runner.run('create_wordcloud',
+                   lambda: miner.create_wordcloud(word_freq, os.path.join(output_dir, 'wordcloud_filtered.png')))
+    if 'create_analysis_dashboard' in stages and all_features:
+        runner.run('create_analysis_dashboard',
+                   lambda: miner.create_analysis_dashboard(all_features, topics, output_dir))
+
+    # 6. 中心性（合成グラフでNetworkXの厳密値と比較）
+    if 'centrality' in stages:
+        _benchmark_centrality(runner, args)
+
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'documents': args.docs,
+            'profile': args.profile,
+            'seed': args.seed,
+            'chars': chars,
+            'tokens': tokens,
+            'repeat': args.repeat,
+            'memory': args.memory,
+            'engine': miner.tokenizer_backend.describe(),
+            'output_dir': output_dir,
+        },
+        'stages': runner.results,
+    }
+
+
+def compare_results(current, baseline, tolerance):
+    """前回の結果と比較し、処理時間が tolerance を超えて悪化した段階を返す"""
+    baseline_seconds = {r['stage']: r['seconds'] for r in baseline['stages'] if 'seconds' in r}
+    regressions = []
+
+    for record in current['stages']:
+        before = baseline_seconds.get(record['stage'])
+        if before is None or 'seconds' not in record or before <= 0:
+            continue
+        ratio = record['seconds'] / before
+        record['baseline_seconds'] = before
+        record['ratio'] = ratio
+        if ratio > 1 + tolerance:
+            regressions.append(record['stage'])
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='パイプライン各段階のベンチマーク')
+    parser.add_argument('--docs', type=int, default=1000, help='合成する文書数（1,000〜1,000,000程度）')
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='mail', help='文書の長さのプロファイル')
+    parser.add_argument('--seed', type=int, default=0, help='コーパス生成の乱数シード')
+    parser.add_argument('--stages', help=f"計測する段階（カンマ区切り、既定は全段階: {','.join(STAGES)}）")
+    parser.add_argument('--repeat', type=int, default=1, help='各段階の繰り返し回数（最良値を採用）')
+    parser.add_argument('--memory', action='store_true', help='tracemallocでPythonのピークメモリも計測')
+    parser.add_argument('--filter-docs', type=int, default=1000, help='フィルタ計測に使う文書数')
+    parser.add_argument('--centrality-nodes', type=int, default=1000, help='中心性計測用の合成グラフのノード数')
+    parser.add_argument('--betweenness-samples', type=int, default=256,
+                        help='近似媒介中心性の始点数（0で近似版を計測しない）')
+    parser.add_argument('--config', help='AdvancedTextMiner の設定ファイル（JSON）')
+    parser.add_argument('--output', help='結果JSONの出力先（省略時は標準出力）')
+    parser.add_argument('--compare', help='比較する前回の結果JSON')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='悪化とみなす処理時間の増加率')
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args)
+
+    regressions = []
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            regressions = compare_results(results, json.load(f), args.tolerance)
+        results['regressions'] = regressions
+
+    payload = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(payload)
+    else:
+        print(payload)
+
+    if regressions:
+        print(f"処理時間が悪化した段階: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,60 +1,2062 @@
 import os
+import re
+import sys
 import shutil
 import json
+import hashlib
+import io
+import contextlib
+import argparse
+import time
+import threading
+import queue
+import functools
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from janome.tokenizer import Tokenizer
-from collections import Counter, defaultdict
-import networkx as nx
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-from matplotlib import rcParams
-from matplotlib.colors import Normalize
-import matplotlib.cm as cm
-import seaborn as sns
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
+from collections import Counter
 import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email.mime.text import MIMEText
 from email import encoders
-from gensim import corpora, models
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.decomposition import PCA, LatentDirichletAllocation
-from sklearn.cluster import KMeans
-from sklearn.metrics import silhouette_score
-from sklearn.manifold import TSNE
 import numpy as np
-import pandas as pd
-from wordcloud import WordCloud
-import MeCab
-from textstat import flesch_reading_ease
 import warnings
 warnings.filterwarnings('ignore')
 
-# 日本語フォント設定
-rcParams['font.family'] = 'IPAGothic'
-plt.rcParams['font.size'] = 12
-sns.set_style("whitegrid")
-sns.set_palette("husl")
+# 形態素解析・可視化・機械学習ライブラリは起動を速くするため使用する段階で読み込む
+# （janome, MeCab, scipy, networkx, matplotlib, seaborn, plotly, pandas, sklearn, gensim, wordcloud）
+
+_matplotlib_ready = False
+
+
+def _pyplot():
+    """matplotlibを読み込み、日本語フォントと描画スタイルを初回のみ設定して返す"""
+    global _matplotlib_ready
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    
+    if not _matplotlib_ready:
+        import seaborn as sns
+        
+        # 日本語フォント設定
+        plt.rcParams['font.family'] = 'IPAGothic'
+        plt.rcParams['font.size'] = 12
+        sns.set_style("whitegrid")
+        sns.set_palette("husl")
+        _matplotlib_ready = True
+    
+    return plt
+
+
+# 成果物の描画品質（render_profile で選択）
+# wordcloud_dpi が None ならmatplotlibを経由せずWordCloudの画像をそのまま保存する
+RENDER_PROFILES = {
+    'draft': {'wordcloud_scale': 0.5, 'wordcloud_dpi': None, 'network_dpi': 72,
+              'network_svg': False, 'attachment_max_mb': None},
+    'email': {'wordcloud_scale': 1.0, 'wordcloud_dpi': None, 'network_dpi': 100,
+              'network_svg': False, 'attachment_max_mb': 1.0},
+    'print': {'wordcloud_scale': 1.0, 'wordcloud_dpi': 300, 'network_dpi': 300,
+              'network_svg': True, 'attachment_max_mb': None},
+}
+
+# さらに詳細な除外パターン（敬称と様態表現を強化）
+ADDITIONAL_EXCLUSION_PATTERNS = {
+    # 敬称パターン（確実に除外）
+    'honorifics_strict': frozenset({'さん', 'ちゃん', 'くん', '様', 'さま', '氏', '君'}),
+
+    # 様態表現（確実に除外）
+    'modal_expressions': frozenset({
+        'よう', 'ような', 'ように', 'ようだ', 'ようで', 'ようです',
+        'みたい', 'みたいな', 'みたいに', 'みたいだ', 'みたいで',
+        'っぽい', 'っぽく', 'っぽさ', 'らしい', 'らしく', 'らしさ'
+    }),
+
+    # 人名パターン（拡張）
+    'person_names': frozenset({'ジヒョ', 'チェヨン', 'ツウィ', 'ナヨン', 'モモ', 'サナ', 'ダヒョン', 'ジョンヨン', 'ミナ'}),
+
+    # 記号的表現
+    'symbols': frozenset({'。', '、', '！', '？', ')', '(', '」', '「', '『', '』', '【', '】', '〈', '〉'}),
+
+    # 単位・助数詞
+    'units': frozenset({'円', '万', '千', '百', '億', '兆', 'kg', 'km', 'cm', 'mm', 'g', 'ml', 'l'}),
+
+    # 一般的すぎる副詞
+    'common_adverbs': frozenset({'とても', 'かなり', 'ずいぶん', 'だいぶ', 'わりと', 'けっこう', 'ちょっと', 'すこし', '少し'})
+}
+
+# 語尾による敬称チェック用の接尾辞
+HONORIFIC_SUFFIXES = ('さん', 'ちゃん', 'くん', '様', 'さま', '氏')
+
+# 様態表現の語尾チェック用の接尾辞
+MODAL_SUFFIXES = ('よう', 'ような', 'ように', 'みたい', 'らしい', 'っぽい')
+
+# 固有名詞から除外する組織名の一般的な語尾
+ORG_SUFFIXES = ('会社', '株式会社', '有限会社', '財団法人', '社団法人', '大学', '学校', '病院')
+
+# 一般的すぎる形容詞
+COMMON_ADJECTIVES = frozenset({'良い', 'よい', 'いい', '悪い', 'わるい', '多い', '少ない', '大きい', '小さい'})
+
+# 人名らしきカタカナ語の判定（4文字以下は呼び出し側で確認）
+_KATAKANA_ONLY = re.compile('[\u30A0-\u30FF]+')
+
+
+# 語彙フィルタの除外理由（判定順）と表示名
+FILTER_REJECTION_LABELS = {
+    'basic': '短い語・英数字',
+    'inference_emotion': '推論・感情語',
+    'structural': '構造語',
+    'functional': '機能語',
+    'honorific': '敬称・敬語',
+    'additional_patterns': '追加除外パターン',
+    'honorific_suffix': '敬称の語尾',
+    'modal_suffix': '様態表現の語尾',
+    'proper_noun': '人名・組織名らしき固有名詞',
+    'pos': '品詞',
+}
+
+
+class CompiledWordFilter:
+    """設定と除外語辞書から一度だけ構築する語彙フィルタ
+
+    _is_meaningful_word_enhanced と同一の判定を、統合済みの除外語表・
+    タプルによる一括語尾照合・判定結果のメモ化で高速に行う。
+    判定のたびに除外理由（FILTER_REJECTION_LABELS のキー）を stats に数える。
+    """
+
+    ACCEPTED = ''
+
+    def __init__(self, config, inference_emotion_words, structural_words,
+                 functional_words, honorific_words, cache_size=500000):
+        self.min_word_length = config['min_word_length']
+        self.strict_pos_filtering = config.get('strict_pos_filtering', True)
+        self.functional_words = frozenset(functional_words)
+        self.common_adverbs = ADDITIONAL_EXCLUSION_PATTERNS['common_adverbs']
+
+        # 有効なカテゴリと追加パターンを語→カテゴリ順位の単一の表に統合
+        categories = []
+        if config.get('exclude_inference_emotion', True):
+            categories.append(('inference_emotion', inference_emotion_words))
+        if config.get('exclude_structural_words', True):
+            categories.append(('structural', structural_words))
+        categories.append(('functional', functional_words))
+        categories.append(('honorific', honorific_words))
+        for pattern_set in ADDITIONAL_EXCLUSION_PATTERNS.values():
+            categories.append(('additional_patterns', pattern_set))
+
+        self.exclusion_categories = [name for name, _ in categories]
+        self.excluded = {}
+        for rank, (_, words) in enumerate(categories):
+            for word in words:
+                self.excluded.setdefault(word, rank)
+
+        self.cache_size = cache_size
+        self._verdicts = {}
+        self.stats = Counter()
+        self._stats_lock = threading.Lock()
+
+    def __call__(self, surface, base_form, pos_major, pos_minor1, pos_minor2):
+        key = (surface, base_form, pos_major, pos_minor1, pos_minor2)
+        reason = self._verdicts.get(key)
+        if reason is None:
+            if len(self._verdicts) >= self.cache_size:
+                self._verdicts.clear()
+            reason = self._verdicts[key] = self._judge(*key)
+        self.stats[reason] += 1
+        return not reason
+
+    def filter_tokens(self, tokens):
+        """(表層形, 原形, 品詞, 品詞細分類1, 品詞細分類2) のリストから採用された組だけを返す
+        
+        判定は一括で引き、未判定の組だけを個別に判定する。統計の更新はスレッド間で排他する。
+        """
+        verdicts = self._verdicts
+        reasons = [verdicts.get(key) for key in tokens]
+        for i, reason in enumerate(reasons):
+            if reason is None:
+                reasons[i] = verdicts[tokens[i]] = self._judge(*tokens[i])
+        if len(verdicts) >= self.cache_size:
+            verdicts.clear()
+        
+        with self._stats_lock:
+            self.stats.update(reasons)
+        return [key for key, reason in zip(tokens, reasons) if not reason]
+
+    def rejection_counts(self):
+        """除外理由ごとの除外件数"""
+        return {reason: count for reason, count in self.stats.items() if reason}
+
+    def _judge(self, surface, base_form, pos_major, pos_minor1, pos_minor2):
+        """メモ化されていない語彙の判定（採用は ACCEPTED、除外は除外理由を返す）"""
+        # 基本的な除外条件
+        if (len(surface) < self.min_word_length or
+            surface.isascii() or
+            surface.isdigit()):
+            return 'basic'
+
+        # カテゴリ別除外語・追加パターンの一括チェック（先に判定されるカテゴリを理由とする）
+        surface_rank = self.excluded.get(surface)
+        base_rank = self.excluded.get(base_form)
+        if surface_rank is not None or base_rank is not None:
+            rank = min(r for r in (surface_rank, base_rank) if r is not None)
+            return self.exclusion_categories[rank]
+
+        # 敬称・様態表現の語尾チェック
+        if surface.endswith(HONORIFIC_SUFFIXES) or base_form.endswith(HONORIFIC_SUFFIXES):
+            return 'honorific_suffix'
+        if surface.endswith(MODAL_SUFFIXES) or base_form.endswith(MODAL_SUFFIXES):
+            return 'modal_suffix'
+
+        # 品詞による詳細フィルタリング
+        if pos_major == '名詞':
+            if pos_minor1 in ('一般', '固有名詞', 'サ変接続'):
+                if pos_minor1 == '固有名詞':
+                    # 人名らしきパターンを除外
+                    if len(surface) <= 4 and _KATAKANA_ONLY.fullmatch(surface):
+                        return 'proper_noun'
+                    # 組織名の一般的なパターンを除外
+                    if surface.endswith(ORG_SUFFIXES):
+                        return 'proper_noun'
+                return self.ACCEPTED
+            elif pos_minor1 in ('代名詞', '数'):
+                return 'pos'
+            elif pos_minor2 in ('助数詞', '接尾', '非自立'):
+                return 'pos'
+            else:
+                return self.ACCEPTED if len(surface) >= 2 else 'basic'
+
+        elif pos_major == '動詞':
+            if pos_minor1 == '自立':
+                return 'functional' if base_form in self.functional_words else self.ACCEPTED
+            return 'pos'
+
+        elif pos_major == '形容詞':
+            if pos_minor1 == '自立':
+                return 'pos' if base_form in COMMON_ADJECTIVES else self.ACCEPTED
+            return 'pos'
+
+        elif pos_major == '副詞':
+            if self.strict_pos_filtering:
+                return 'pos'
+            return 'additional_patterns' if surface in self.common_adverbs else self.ACCEPTED
+
+        # その他の品詞は除外
+        return 'pos'
+
+
+class TokenCache:
+    """本文のハッシュとフィルタ設定の指紋をキーとするディスク上のトークンキャッシュ
+
+    同じ文書を同じ設定で再解析する場合に形態素解析を省略する。
+    並列ワーカーから同時に書き込まれても壊れないよう、一時ファイル経由で保存する。
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, cache_dir, fingerprint):
+        self.cache_dir = cache_dir
+        self.fingerprint = fingerprint
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, text):
+        digest = hashlib.sha256()
+        digest.update(self.fingerprint.encode('ascii'))
+        digest.update(text.encode('utf-8'))
+        key = digest.hexdigest()
+        return os.path.join(self.cache_dir, key[:2], key + '.json')
+
+    def get(self, text):
+        """キャッシュ済みのトークン列を返す（未登録・破損時はNone）"""
+        try:
+            with open(self._path(text), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, text, words):
+        """トークン列をキャッシュに保存（失敗しても解析は継続）"""
+        path = self._path(text)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(words, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"トークンキャッシュの保存に失敗: {e}")
+
+
+class RenderCache:
+    """描画入力のハッシュをキーとする成果物（PNG/HTML）のディスクキャッシュ
+
+    入力（頻度・共起ペア・描画設定・フォント）が前回と同じなら描画を省略し、
+    保存済みのファイルを出力先へコピーする。参照のたびにエントリの更新時刻を
+    更新し、件数・合計サイズの上限を超えたら最も長く参照されていないものから削除する。
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, cache_dir, max_bytes, max_entries):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, kind, payload):
+        """成果物の種類と描画入力からキーを作る"""
+        digest = hashlib.sha256()
+        digest.update(f"{kind}:{self.FORMAT_VERSION}:".encode('ascii'))
+        digest.update(json.dumps(payload, ensure_ascii=False, sort_keys=True, default=float).encode('utf-8'))
+        return digest.hexdigest()
+
+    def fetch(self, key, outputs):
+        """キャッシュ済みなら成果物を outputs（名前 → 出力先パス）へコピーしてTrueを返す"""
+        entry = os.path.join(self.cache_dir, key)
+        if not os.path.isdir(entry):
+            return False
+        
+        try:
+            for name, path in outputs.items():
+                cached = os.path.join(entry, name)
+                if not os.path.exists(cached):
+                    continue
+                tmp_path = f"{path}.tmp{os.getpid()}"
+                shutil.copyfile(cached, tmp_path)
+                os.replace(tmp_path, path)
+            os.utime(entry)
+        except OSError as e:
+            print(f"描画キャッシュを読み込めませんでした: {e}")
+            return False
+        return True
+
+    def store(self, key, outputs):
+        """生成した成果物を保存し、上限を超えた古いエントリを削除（失敗しても処理は継続）"""
+        entry = os.path.join(self.cache_dir, key)
+        tmp_entry = f"{entry}.tmp{os.getpid()}.{threading.get_ident()}"
+        try:
+            os.makedirs(tmp_entry, exist_ok=True)
+            for name, path in outputs.items():
+                shutil.copyfile(path, os.path.join(tmp_entry, name))
+            os.replace(tmp_entry, entry)
+        except OSError as e:
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+            # 別プロセスが同じ成果物を先に保存した場合は何もしない
+            if not os.path.isdir(entry):
+                print(f"描画キャッシュの保存に失敗: {e}")
+            return
+        self.evict()
+
+    def evict(self):
+        """最近参照した順に上限まで残し、それより古いエントリを削除"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            entry = os.path.join(self.cache_dir, name)
+            if '.tmp' in name or not os.path.isdir(entry):
+                continue
+            try:
+                size = sum(os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry))
+                entries.append((os.path.getmtime(entry), size, entry))
+            except OSError:
+                continue
+        
+        entries.sort(reverse=True)
+        total = 0
+        for index, (_, size, entry) in enumerate(entries):
+            total += size
+            if index >= self.max_entries or total > self.max_bytes:
+                for _, _, old_entry in entries[index:]:
+                    shutil.rmtree(old_entry, ignore_errors=True)
+                break
+
+
+class Vocabulary:
+    """語と整数IDの対応表（IDは登録順に0から採番）"""
+
+    def __init__(self, words=()):
+        self.word2id = {}
+        self.id2word = []
+        for word in words:
+            self.add(word)
+
+    def __len__(self):
+        return len(self.id2word)
+
+    def __contains__(self, word):
+        return word in self.word2id
+
+    def add(self, word):
+        """語を登録してIDを返す（登録済みなら既存のID）"""
+        word_id = self.word2id.get(word)
+        if word_id is None:
+            word_id = self.word2id[word] = len(self.id2word)
+            self.id2word.append(word)
+        return word_id
+
+    def encode(self, words):
+        """語のリストをID配列に変換（未登録語は登録する）"""
+        word2id = self.word2id
+        add = self.add
+        return np.fromiter((word2id[w] if w in word2id else add(w) for w in words),
+                           dtype=np.uint32, count=len(words))
+
+    def decode(self, ids):
+        """ID配列を語のリストに変換"""
+        id2word = self.id2word
+        return [id2word[i] for i in ids]
+
+
+class CooccurrenceMatrix:
+    """整数ID配列と疎行列による重み付き共起集計
+
+    語をIDに変換し、距離（オフセット）ごとにずらした配列同士でペアを一括生成する。
+    ウィンドウ幅3/5/10の重み 1/3 + 1/5 + 1/10 は距離ごとに合算して1回で加算し、
+    ペアはID順の上三角（行 <= 列）に正規化して保持する。
+    Counter互換の most_common / items / update / [] で共起ペアを参照できる。
+    
+    most_common の上位結果は内容が変わるまで保持し、同じ件数以下の再呼び出しは
+    上位K件の参照だけで返す。capacity を指定すると近似集計（Space-Saving方式）になり、
+    保持ペア数が capacity を超えるたびに重みの小さいペアを捨てる。捨てた重みの最大値を
+    error_bound とし、その後に初めて現れたペアには error_bound を上乗せするため、
+    各ペアの重みは真値以上・真値 + error_bound 以下に収まる。
+    """
+
+    WINDOW_SIZES = (3, 5, 10)
+
+    def __init__(self, vocabulary=None, window_sizes=WINDOW_SIZES, consolidate_threshold=2000000,
+                 capacity=None):
+        self.vocabulary = vocabulary if vocabulary is not None else Vocabulary()
+        self.window_sizes = tuple(window_sizes)
+        self.offset_weights = self._offset_weights(self.window_sizes)
+        # チャンク境界をまたぐ共起に必要な直前トークン数
+        self.context_size = len(self.offset_weights)
+        self.consolidate_threshold = consolidate_threshold
+        self.capacity = capacity
+        self.error_bound = 0.0
+        self._matrix = None
+        self._pending = []
+        self._pending_nnz = 0
+        self._ranking = None
+
+    @property
+    def approximate(self):
+        """近似集計でペアを捨てたことがあるか（保留中の加算も間引いてから判定）"""
+        if self.capacity is not None:
+            self._consolidate()
+        return self.error_bound > 0
+
+    @staticmethod
+    def _offset_weights(window_sizes):
+        """距離d（1始まり）ごとの合算重み：d < window となる全ウィンドウの 1/window の和"""
+        max_offset = max(window_sizes) - 1
+        weights = np.zeros(max_offset)
+        for window in window_sizes:
+            weights[:window - 1] += 1.0 / window
+        return weights
+
+    def add_document(self, words, context=()):
+        """文書のトークン列から共起ペアを加算
+        
+        context には直前チャンクの末尾トークン（最大 context_size 語）を渡す。
+        context 同士のペアは加算済みとみなし、words を含むペアだけを数える。
+        """
+        start = len(context)
+        ids = self.vocabulary.encode(list(context) + list(words) if context else words)
+        n = len(ids)
+        rows, cols, data = [], [], []
+        
+        for offset, weight in enumerate(self.offset_weights, start=1):
+            # 右側の語が words に含まれる位置だけを対象にする
+            first = max(0, start - offset)
+            count = n - offset - first
+            if count <= 0:
+                break
+            left, right = ids[first:n - offset], ids[first + offset:]
+            rows.append(np.minimum(left, right))
+            cols.append(np.maximum(left, right))
+            data.append(np.full(count, weight))
+        
+        if rows:
+            self._append(np.concatenate(rows), np.concatenate(cols), np.concatenate(data))
+
+    def _append(self, rows, cols, data):
+        self._pending.append((rows, cols, data))
+        self._pending_nnz += len(data)
+        self._ranking = None
+        if self._pending_nnz >= self.consolidate_threshold:
+            self._consolidate()
+
+    def _consolidate(self):
+        """保留中のCOO断片を重複合算済みのCSR行列にまとめる（近似集計では容量まで間引く）"""
+        size = len(self.vocabulary)
+        if not self._pending:
+            if self._matrix is not None and self._matrix.shape[0] < size:
+                self._matrix.resize((size, size))
+            return
+        
+        from scipy import sparse
+        
+        parts = self._pending
+        if self._matrix is not None:
+            current = self._matrix.tocoo()
+            parts = [(current.row, current.col, current.data)] + parts
+        
+        rows = np.concatenate([p[0] for p in parts])
+        cols = np.concatenate([p[1] for p in parts])
+        data = np.concatenate([p[2] for p in parts])
+        matrix = sparse.coo_matrix((data, (rows, cols)), shape=(size, size)).tocsr()
+        
+        if self.capacity is not None:
+            matrix = self._bound_to_capacity(matrix, current if self._matrix is not None else None)
+        
+        self._matrix = matrix
+        self._pending = []
+        self._pending_nnz = 0
+
+    def _bound_to_capacity(self, matrix, previous):
+        """Space-Saving方式の間引き：新出ペアに誤差上限を上乗せし、容量を超えた分を捨てる"""
+        from scipy import sparse
+        
+        size = matrix.shape[0]
+        coo = matrix.tocoo()
+        rows, cols, data = coo.row, coo.col, coo.data
+        
+        # 間引き後に初めて現れたペアは、捨てられた過去の重みを含む可能性がある
+        if self.error_bound > 0 and previous is not None:
+            keys = rows.astype(np.int64) * size + cols
+            previous_keys = np.sort(previous.row.astype(np.int64) * size + previous.col)
+            position = np.minimum(np.searchsorted(previous_keys, keys), max(len(previous_keys) - 1, 0))
+            is_new = previous_keys[position] != keys if len(previous_keys) else np.ones(len(keys), bool)
+            data = data + np.where(is_new, self.error_bound, 0.0)
+        
+        if len(data) > self.capacity:
+            keep = np.argpartition(-data, self.capacity - 1)[:self.capacity]
+            dropped = np.ones(len(data), dtype=bool)
+            dropped[keep] = False
+            self.error_bound = max(self.error_bound, float(data[dropped].max()))
+            rows, cols, data = rows[keep], cols[keep], data[keep]
+        
+        return sparse.coo_matrix((data, (rows, cols)), shape=(size, size)).tocsr()
+
+    @classmethod
+    def from_csr(cls, matrix, vocabulary, **kwargs):
+        """集計済みのCSR行列（行・列は vocabulary のID、上三角）から復元"""
+        cooccurrence = cls(vocabulary, **kwargs)
+        cooccurrence._matrix = matrix.tocsr()
+        return cooccurrence
+
+    def tocsr(self):
+        """上三角のCSR行列（行・列は self.vocabulary のID）"""
+        self._consolidate()
+        if self._matrix is None:
+            from scipy import sparse
+            size = len(self.vocabulary)
+            self._matrix = sparse.csr_matrix((size, size))
+        return self._matrix
+
+    def merge(self, other):
+        """別の共起行列を加算（語彙が異なる場合はIDを変換して併合）"""
+        if other is self:
+            raise ValueError("自分自身とは併合できません")
+        
+        parts = list(other._pending)
+        if other._matrix is not None:
+            coo = other._matrix.tocoo()
+            parts.append((coo.row, coo.col, coo.data))
+        
+        self.error_bound += other.error_bound
+        if other.vocabulary is self.vocabulary:
+            for rows, cols, data in parts:
+                self._append(rows, cols, data)
+        else:
+            id_map = self.vocabulary.encode(other.vocabulary.id2word)
+            for rows, cols, data in parts:
+                mapped_rows, mapped_cols = id_map[rows], id_map[cols]
+                self._append(np.minimum(mapped_rows, mapped_cols),
+                             np.maximum(mapped_rows, mapped_cols), data)
+        return self
+
+    def update(self, other):
+        """Counter.update 互換：共起行列または (語, 語) → 重み のマッピングを加算"""
+        if isinstance(other, CooccurrenceMatrix):
+            return self.merge(other)
+        
+        pairs = list(other.items())
+        if pairs:
+            first = self.vocabulary.encode([w1 for (w1, _), _ in pairs])
+            second = self.vocabulary.encode([w2 for (_, w2), _ in pairs])
+            self._append(np.minimum(first, second), np.maximum(first, second),
+                         np.array([weight for _, weight in pairs], dtype=float))
+        return self
+
+    def _pair(self, row, col):
+        """IDペアを従来と同じ文字列順の語ペアに変換"""
+        w1, w2 = self.vocabulary.id2word[row], self.vocabulary.id2word[col]
+        return (w1, w2) if w1 <= w2 else (w2, w1)
+
+    def most_common(self, n=None):
+        """重みの大きい順に ((語, 語), 重み) を返す（nは上位件数）
+        
+        上位結果は次に内容が変わるまで保持し、それ以下の件数の呼び出しに再利用する。
+        """
+        if n is not None and n <= 0:
+            return []
+        
+        ranking = self._ranking
+        if ranking is None or (n is None or n > len(ranking)) and not ranking.complete:
+            ranking = self._ranking = self._rank(n)
+        
+        return ranking[:n] if n is not None else list(ranking)
+
+    def _rank(self, n):
+        """上位n件（Noneで全件）を重みの降順に並べた結果を作る"""
+        coo = self.tocsr().tocoo()
+        data = coo.data
+        if n is None or n >= len(data):
+            order = np.argsort(-data, kind='stable')
+        else:
+            top = np.argpartition(-data, n - 1)[:n]
+            order = top[np.argsort(-data[top], kind='stable')]
+        ranking = _Ranking((self._pair(coo.row[i], coo.col[i]), float(data[i])) for i in order)
+        ranking.complete = len(order) == len(data)
+        return ranking
+
+    def items(self):
+        coo = self.tocsr().tocoo()
+        for row, col, weight in zip(coo.row, coo.col, coo.data):
+            yield self._pair(row, col), float(weight)
+
+    def __iter__(self):
+        for pair, _ in self.items():
+            yield pair
+
+    def __len__(self):
+        return self.tocsr().nnz
+
+    def __getitem__(self, pair):
+        w1, w2 = pair
+        word2id = self.vocabulary.word2id
+        if w1 not in word2id or w2 not in word2id:
+            return 0
+        i, j = sorted((word2id[w1], word2id[w2]))
+        return float(self.tocsr()[i, j])
+
+    def to_counter(self):
+        """従来形式の Counter に変換"""
+        return Counter(dict(self.items()))
+
+    def association(self, measure, min_weight=0.0):
+        """共起の重みを統計的な関連度に置き換えた共起行列を返す（非ゼロ要素数に線形）
+        
+        measure は ASSOCIATION_MEASURES のいずれか（'weight' は自身をそのまま返す）。
+        周辺度数は共起行列を対称化した行和、総数はその合計とし、重みが min_weight
+        未満のペア・同一語のペア・関連度が正でないペアは除く。対数尤度比は
+        期待値より少ない（反発する）ペアを負とする符号付きの値。
+        """
+        if measure == 'weight':
+            return self
+        if measure not in ASSOCIATION_MEASURES:
+            raise ValueError(f"未知の関連度です: {measure}（{', '.join(ASSOCIATION_MEASURES)} から選択）")
+        
+        from scipy import sparse
+        
+        matrix = self.tocsr()
+        size = matrix.shape[0]
+        coo = matrix.tocoo()
+        rows, cols, f = coo.row, coo.col, coo.data
+        
+        # 対称化した行列の行和（対角要素は一度だけ数える）
+        diagonal = rows == cols
+        marginal = (np.bincount(rows, weights=f, minlength=size) +
+                    np.bincount(cols, weights=f, minlength=size) -
+                    np.bincount(rows[diagonal], weights=f[diagonal], minlength=size))
+        total = marginal.sum()
+        
+        keep = ~diagonal & (f >= min_weight)
+        rows, cols, f = rows[keep], cols[keep], f[keep]
+        ci, cj = marginal[rows], marginal[cols]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if measure in ('pmi', 'npmi'):
+                score = np.log(f * total / (ci * cj))
+                if measure == 'npmi':
+                    score = score / -np.log(f / total)
+            elif measure == 'jaccard':
+                score = f / (ci + cj - f)
+            elif measure == 'dice':
+                score = 2 * f / (ci + cj)
+            else:
+                # 2x2分割表の観測度数と期待度数から G^2 = 2 Σ O log(O/E)
+                observed = (f, ci - f, cj - f, total - ci - cj + f)
+                expected = (ci * cj / total, ci * (total - cj) / total,
+                            (total - ci) * cj / total, (total - ci) * (total - cj) / total)
+                score = 2 * sum(np.where(o > 0, o * np.log(o / e), 0.0) for o, e in zip(observed, expected))
+                score = np.where(f < expected[0], -score, score)
+        
+        valid = np.isfinite(score) & (score > 0)
+        scored = sparse.csr_matrix((score[valid], (rows[valid], cols[valid])), shape=(size, size))
+        return CooccurrenceMatrix.from_csr(scored, self.vocabulary)
+
+
+# 共起ネットワークの辺の順位付けに使える関連度
+ASSOCIATION_MEASURES = ('weight', 'pmi', 'npmi', 'jaccard', 'dice', 'log_likelihood')
+
+
+class SparseCentrality:
+    """疎な隣接行列上でネットワークの中心性を計算する（大規模グラフ向け）
+
+    NetworkXの degree_centrality / pagerank / betweenness_centrality（既定引数）と
+    同じ定義で、PageRankはべき乗法、媒介中心性はBrandes法を行列演算で
+    まとめて行う。媒介中心性は k 個の始点の標本から近似できる。
+    """
+
+    def __init__(self, nodes, adjacency):
+        self.nodes = list(nodes)
+        self.adjacency = adjacency.tocsr()
+
+    @classmethod
+    def from_graph(cls, G, weight='weight'):
+        """NetworkXの無向グラフから隣接行列（辺の重み付き）を作る"""
+        import networkx as nx
+        nodes = list(G)
+        return cls(nodes, nx.to_scipy_sparse_array(G, nodelist=nodes, weight=weight, format='csr'))
+
+    def _as_dict(self, values):
+        return {node: float(value) for node, value in zip(self.nodes, values)}
+
+    def degree(self):
+        """次数中心性（次数 / (ノード数 - 1)、NetworkXと同じく自己ループは次数2と数える）"""
+        n = len(self.nodes)
+        if n <= 1:
+            return self._as_dict(np.ones(n))
+        degrees = np.diff(self.adjacency.indptr) + (self.adjacency.diagonal() != 0)
+        return self._as_dict(degrees / (n - 1))
+
+    def pagerank(self, alpha=0.85, max_iter=100, tol=1e-6):
+        """辺の重みで遷移するPageRank（べき乗法、収束判定はNetworkXと同じ）"""
+        import scipy.sparse as sp
+        
+        n = len(self.nodes)
+        if n == 0:
+            return {}
+        strength = np.asarray(self.adjacency.sum(axis=1)).ravel()
+        dangling = strength == 0
+        inverse = np.divide(1.0, strength, out=np.zeros(n), where=~dangling)
+        transition = (sp.diags(inverse) @ self.adjacency).T.tocsr()
+        
+        x = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            previous = x
+            x = alpha * (transition @ x + x[dangling].sum() / n) + (1 - alpha) / n
+            if np.abs(x - previous).sum() < n * tol:
+                return self._as_dict(x)
+        print(f"⚠️ PageRankが{max_iter}回で収束しませんでした")
+        return self._as_dict(x)
+
+    def betweenness(self, k=None, seed=None, batch_size=64):
+        """重みなし最短経路の媒介中心性（正規化済み、端点を含めない）
+        
+        k を指定すると k 個の始点を seed で抽出した近似値（n / k 倍に補正）を返す。
+        始点は batch_size 個ずつ幅優先探索の段ごとに疎行列積でまとめて処理する。
+        """
+        n = len(self.nodes)
+        if n <= 2:
+            return self._as_dict(np.zeros(n))
+        
+        links = self.adjacency.copy()
+        links.data = np.ones_like(links.data, dtype=np.float64)
+        
+        if k is None or k >= n:
+            sources = np.arange(n)
+        else:
+            sources = np.random.default_rng(seed).choice(n, size=k, replace=False)
+        
+        totals = np.zeros(n)
+        for start in range(0, len(sources), batch_size):
+            batch = sources[start:start + batch_size]
+            columns = np.arange(len(batch))
+            
+            # 前進：各始点からの距離と最短経路数
+            sigma = np.zeros((n, len(batch)))
+            sigma[batch, columns] = 1.0
+            depth = np.full((n, len(batch)), -1)
+            depth[batch, columns] = 0
+            frontier = sigma.copy()
+            level = 0
+            while True:
+                reached = links @ frontier
+                reached[depth >= 0] = 0.0
+                if not reached.any():
+                    break
+                level += 1
+                depth[reached > 0] = level
+                sigma += reached
+                frontier = reached
+            
+            # 後退：深い段から依存度を集計
+            delta = np.zeros_like(sigma)
+            safe_sigma = np.where(sigma > 0, sigma, 1.0)
+            for current in range(level, 0, -1):
+                share = np.where(depth == current, (1.0 + delta) / safe_sigma, 0.0)
+                delta += np.where(depth == current - 1, sigma * (links @ share), 0.0)
+            delta[batch, columns] = 0.0
+            totals += delta.sum(axis=1)
+        
+        # NetworkXの正規化（無向グラフは順序対で数えるため 1/((n-1)(n-2))、標本なら n/k 倍）
+        scale = 1.0 / ((n - 1) * (n - 2)) * n / len(sources)
+        return self._as_dict(totals * scale)
+
+
+class _Ranking(list):
+    """most_common の保持結果（complete は全ペアを含むか）"""
+    complete = False
+
+
+class DocumentFeatures:
+    """1文書の特徴量（語ID列と語彙頻度を配列で持ち、派生値は参照時に計算する）
+
+    語ID列は array('I')、語彙頻度は語IDと出現回数の並列配列（初出順）で保持し、
+    語のリストや Counter は必要になったときに語彙ID表から復元する。従来の
+    特徴量辞書と同じキー（'words', 'word_frequency', 'pairs', 'word_count' など）で
+    参照・代入できる。ストリーミング処理した文書は語ID列を持たず、'words' は None。
+    """
+
+    __slots__ = ('vocabulary', 'token_ids', 'freq_ids', 'freq_counts',
+                 'char_count', 'total_word_length', 'pairs', 'path')
+
+    KEYS = ('words', 'pairs', 'word_count', 'unique_words', 'char_count',
+            'avg_word_length', 'ttr', 'word_frequency', 'path')
+
+    def __init__(self, vocabulary, token_ids, freq_ids, freq_counts, char_count, total_word_length,
+                 pairs=None):
+        self.vocabulary = vocabulary
+        self.token_ids = token_ids
+        self.freq_ids = freq_ids
+        self.freq_counts = freq_counts
+        self.char_count = char_count
+        self.total_word_length = total_word_length
+        self.pairs = pairs
+        self.path = None
+
+    @classmethod
+    def from_words(cls, vocabulary, words, char_count, pairs=None):
+        """トークン列から作成（語は vocabulary に登録する）"""
+        ids = vocabulary.encode(words)
+        unique, first_pos, counts = np.unique(ids, return_index=True, return_counts=True)
+        order = np.argsort(first_pos, kind='stable')
+        unique, counts = unique[order], counts[order]
+        lengths = np.fromiter((len(word) for word in vocabulary.decode(unique.tolist())),
+                              dtype=np.int64, count=len(unique))
+        return cls(vocabulary, _uint32_array(ids), _uint32_array(unique), _uint32_array(counts),
+                   char_count, int(lengths @ counts), pairs)
+
+    @classmethod
+    def from_frequency(cls, vocabulary, word_frequency, char_count, total_word_length, pairs=None):
+        """語彙頻度から作成（トークン列を保持しないストリーミング処理用）"""
+        ids = vocabulary.encode(list(word_frequency.keys()))
+        counts = np.fromiter(word_frequency.values(), dtype=np.uint32, count=len(word_frequency))
+        return cls(vocabulary, None, _uint32_array(ids), _uint32_array(counts),
+                   char_count, total_word_length, pairs)
+
+    def rebind(self, vocabulary):
+        """語IDを vocabulary のIDに付け替える（ワーカーの語彙ID表で作った特徴量を親の表に揃える）
+        
+        トークン列を先に変換するため、新出語は直列処理と同じ出現順で登録される。
+        """
+        if self.vocabulary is vocabulary:
+            return self
+        source = self.vocabulary
+        if self.token_ids is not None:
+            self.token_ids = _uint32_array(vocabulary.encode(source.decode(self.token_ids)))
+        self.freq_ids = _uint32_array(vocabulary.encode(source.decode(self.freq_ids)))
+        self.vocabulary = vocabulary
+        return self
+
+    @property
+    def words(self):
+        if self.token_ids is None:
+            return None
+        return self.vocabulary.decode(self.token_ids)
+
+    @property
+    def word_frequency(self):
+        return Counter(dict(zip(self.vocabulary.decode(self.freq_ids), self.freq_counts)))
+
+    @property
+    def word_count(self):
+        return sum(self.freq_counts) if self.token_ids is None else len(self.token_ids)
+
+    @property
+    def unique_words(self):
+        return len(self.freq_ids)
+
+    @property
+    def avg_word_length(self):
+        word_count = self.word_count
+        return self.total_word_length / word_count if word_count else 0
+
+    @property
+    def ttr(self):
+        word_count = self.word_count
+        return self.unique_words / word_count if word_count > 0 else 0
+
+    def _check_key(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+
+    def __getitem__(self, key):
+        self._check_key(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in ('pairs', 'path'):
+            raise KeyError(f"{key} は代入できません")
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.KEYS
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self.KEYS else default
+
+    def pop(self, key, *default):
+        """'pairs' / 'path' を取り出して None にする"""
+        if key not in ('pairs', 'path'):
+            if default:
+                return default[0]
+            raise KeyError(key)
+        value = getattr(self, key)
+        setattr(self, key, None)
+        return value
+
+    def keys(self):
+        return self.KEYS
+
+
+def _uint32_array(values):
+    """整数の配列を array('I')（4バイト符号なし整数）に変換"""
+    result = array('I')
+    result.frombytes(np.asarray(values, dtype=np.uint32).tobytes())
+    return result
+
+
+class DocumentTermMatrix:
+    """文書×語（1-gram・2-gram）の頻度を持つCSR行列
+
+    フィルタリング済みのトークン列から一度だけ構築し、TF-IDF・sklearnのLDA・
+    gensimで共有する（文字列への連結と再分割を行わない）。先頭 num_unigrams 列が
+    語彙ID順の1-gram、続く列が隣接する語ペアの2-gram。1-gramの語彙IDは
+    gensimの Dictionary(texts) と同じ順（文書順、文書内は語の辞書順）に採番する。
+    """
+
+    def __init__(self, token_docs=(), bigrams=True):
+        vocabulary = Vocabulary()
+        doc_ids = [vocabulary.encode(words) for words in token_docs]
+        offsets = np.zeros(len(doc_ids) + 1, dtype=np.int64)
+        np.cumsum([len(ids) for ids in doc_ids], out=offsets[1:])
+        ids = np.concatenate(doc_ids) if doc_ids else np.zeros(0, dtype=np.uint32)
+        self._build(ids, offsets, vocabulary, bigrams)
+
+    @classmethod
+    def from_ids(cls, ids, offsets, vocabulary, bigrams=True):
+        """連結した語ID配列と文書の開始位置（offsets[0] == 0、末尾は len(ids)）から構築
+        
+        ids は vocabulary のIDで、memmapのスライスをコピーせずに渡せる。
+        """
+        dtm = cls.__new__(cls)
+        dtm._build(ids, offsets, vocabulary, bigrams)
+        return dtm
+
+    def _build(self, ids, offsets, vocabulary, bigrams):
+        from scipy import sparse
+        
+        n_docs = len(offsets) - 1
+        doc_index = np.repeat(np.arange(n_docs), np.diff(offsets))
+        
+        # 使われた語を「初出の文書順、同じ文書内は語の辞書順」に並べ直して列番号にする
+        used, first_pos, inverse = np.unique(ids, return_index=True, return_inverse=True)
+        words = np.array(vocabulary.decode(used.tolist()), dtype=str)
+        order = np.lexsort((words, doc_index[first_pos]))
+        rank = np.empty(len(used), dtype=np.int64)
+        rank[order] = np.arange(len(used))
+        unigram_columns = rank[inverse]
+        
+        self.vocabulary = Vocabulary(words[order].tolist())
+        self.num_unigrams = size = len(used)
+        
+        # 2-gramは同じ文書内で隣接する (前の語, 後の語) を1つの整数にまとめて列番号を振る
+        self.bigram_keys = np.zeros(0, dtype=np.int64)
+        rows, columns = doc_index, unigram_columns
+        if bigrams and len(ids) > 1:
+            same_doc = doc_index[:-1] == doc_index[1:]
+            keys = unigram_columns[:-1][same_doc] * size + unigram_columns[1:][same_doc]
+            self.bigram_keys, bigram_columns = np.unique(keys, return_inverse=True)
+            rows = np.concatenate([doc_index, doc_index[:-1][same_doc]])
+            columns = np.concatenate([unigram_columns, size + bigram_columns])
+        
+        self.matrix = sparse.csr_matrix((np.ones(len(columns), dtype=np.int64), (rows, columns)),
+                                        shape=(n_docs, size + len(self.bigram_keys)))
+        self.matrix.sum_duplicates()
+
+    @property
+    def num_docs(self):
+        return self.matrix.shape[0]
+
+    def feature_names(self, columns=None):
+        """列の語（2-gramは空白区切り）。columns を指定するとその列のみ"""
+        id2word = self.vocabulary.id2word
+        size = self.num_unigrams
+        if columns is None:
+            columns = range(self.matrix.shape[1])
+        names = []
+        for column in columns:
+            if column < size:
+                names.append(id2word[column])
+            else:
+                first, second = divmod(int(self.bigram_keys[column - size]), size)
+                names.append(f"{id2word[first]} {id2word[second]}")
+        return names
+
+    def select_columns(self, min_df=1, max_df=1.0, max_features=None):
+        """文書頻度で列を絞り込む（TfidfVectorizer と同じ解釈: 整数は文書数、小数は割合）"""
+        n_docs = self.num_docs
+        df = np.bincount(self.matrix.indices, minlength=self.matrix.shape[1])
+        min_count = min_df if isinstance(min_df, (int, np.integer)) else min_df * n_docs
+        max_count = max_df if isinstance(max_df, (int, np.integer)) else max_df * n_docs
+        columns = np.flatnonzero((df >= min_count) & (df <= max_count))
+        
+        if max_features is not None and len(columns) > max_features:
+            # 総出現回数の多い順（同数なら語の辞書順）に残す
+            term_freq = np.asarray(self.matrix[:, columns].sum(axis=0)).ravel()
+            order = np.lexsort((np.array(self.feature_names(columns)), -term_freq))
+            columns = np.sort(columns[order[:max_features]])
+        if len(columns) == 0:
+            raise ValueError("文書頻度の条件を満たす語がありません")
+        return columns
+
+    def tfidf(self, min_df=1, max_df=1.0, max_features=None):
+        """絞り込んだ列のTF-IDF行列（l2正規化・平滑化idf）と列の語を返す"""
+        from sklearn.feature_extraction.text import TfidfTransformer
+        
+        columns = self.select_columns(min_df, max_df, max_features)
+        counts = self.matrix[:, columns]
+        return TfidfTransformer().fit_transform(counts), self.feature_names(columns)
+
+    def gensim_corpus(self):
+        """1-gram列のgensim形式BoWコーパス（繰り返し読み出せるビュー）"""
+        return _CSRCorpus(self.matrix[:, :self.num_unigrams].tocsr())
+
+    def gensim_dictionary(self):
+        """語彙IDをそのまま使うgensimのDictionary"""
+        from gensim.corpora import Dictionary
+        
+        unigrams = self.matrix[:, :self.num_unigrams]
+        dictionary = Dictionary()
+        dictionary.token2id = dict(self.vocabulary.word2id)
+        dictionary.dfs = dict(enumerate(np.bincount(unigrams.indices, minlength=self.num_unigrams).tolist()))
+        dictionary.cfs = dict(enumerate(np.asarray(unigrams.sum(axis=0)).ravel().tolist()))
+        dictionary.num_docs = self.num_docs
+        dictionary.num_pos = int(unigrams.sum())
+        dictionary.num_nnz = unigrams.nnz
+        return dictionary
+
+
+class _CSRCorpus:
+    """CSR行列の各行を gensim のBoW（(語ID, 頻度) のリスト）として順に返すビュー"""
+
+    def __init__(self, matrix):
+        self.matrix = matrix
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def __iter__(self):
+        indptr = self.matrix.indptr
+        indices = self.matrix.indices.tolist()
+        data = self.matrix.data.tolist()
+        for i in range(len(self)):
+            start, end = indptr[i], indptr[i + 1]
+            yield list(zip(indices[start:end], data[start:end]))
+
+
+class DocumentColumns:
+    """文書ごとの統計量の列形式ビュー（列 → 配列）
+
+    column() は配列をコピーせずに返す。反復・添字では従来の特徴量辞書と同じキーの
+    辞書を返すため、文書のリストを受け取る関数にもそのまま渡せる。
+    """
+
+    def __init__(self, columns):
+        self.columns = columns
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def column(self, name):
+        return self.columns[name]
+
+    def __getitem__(self, index):
+        return {name: values[index].item() for name, values in self.columns.items()}
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+def _stat_column(all_features, name):
+    """文書統計の列を配列で取り出す（DocumentColumns ならコピーしない）"""
+    if isinstance(all_features, DocumentColumns):
+        return all_features.column(name)
+    return np.array([f[name] for f in all_features])
+
+
+class CorpusStore:
+    """文書のトークン列と統計量を列形式で追記していくディスク上のコーパス
+
+    ディレクトリに語彙表（vocab.jsonl、1行1語）、全文書を連結した語ID列
+    （tokens.u4）、文書ごとの終了位置（offsets.i8）とトークン列の有無
+    （has_tokens.u1）、固定長の統計量列（word_count.i8、ttr.f8 など）を
+    リトルエンディアンの生配列で置き、件数は meta.json に記録する。拡張子は
+    numpyの型コード（バイト数）で、ARRAYS の dtype から付ける。読み出しは numpy.memmap の
+    スライスで行い、Pythonのリストに展開しない。
+    
+    追記はメモリ上に溜めて flush() でまとめて書き出す。meta.json を最後に
+    置き換えるため、書き出し途中で止まっても前回の flush までの内容が読める
+    （余分な末尾は次の flush で切り詰める）。ストリーミング処理した文書は
+    トークン列を持たないため、統計量だけを記録する。
+    """
+
+    VERSION = 1
+    STAT_COLUMNS = {
+        'word_count': '<i8',
+        'unique_words': '<i8',
+        'char_count': '<i8',
+        'avg_word_length': '<f8',
+        'ttr': '<f8',
+    }
+    ARRAYS = dict({'tokens': '<u4', 'offsets': '<i8', 'has_tokens': '|u1'}, **STAT_COLUMNS)
+
+    def __init__(self, path, flush_docs=1000):
+        self.path = path
+        self.flush_docs = flush_docs
+        self.vocabulary = Vocabulary()
+        self._buffer = []
+        self._views = {}
+        self._truncated = False
+        
+        meta = {'num_docs': 0, 'num_tokens': 0, 'vocab_size': 0, 'vocab_bytes': 0}
+        meta_path = os.path.join(path, 'meta.json')
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('version') != self.VERSION:
+                raise ValueError(f"コーパスストアの形式が対応していません: version={meta.get('version')}（対応: {self.VERSION}）")
+            with open(os.path.join(path, 'vocab.jsonl'), 'rb') as f:
+                for line in f.read(meta['vocab_bytes']).splitlines():
+                    self.vocabulary.add(json.loads(line))
+        
+        # 読み出し側が参照する確定済みの件数（flushごとに1回の代入で更新）
+        self._committed = (meta['num_docs'], meta['num_tokens'], meta['vocab_bytes'], len(self.vocabulary))
+
+    @property
+    def num_docs(self):
+        """書き出し済みの文書数"""
+        return self._committed[0]
+
+    @property
+    def total_docs(self):
+        """未書き出しの分を含む文書数（次に追記する文書の番号）"""
+        return self._committed[0] + len(self._buffer)
+
+    def _file(self, name):
+        if name == 'vocab':
+            return os.path.join(self.path, 'vocab.jsonl')
+        return os.path.join(self.path, f"{name}.{self.ARRAYS[name].strip('<|')}")
+
+    def append(self, features):
+        """特徴量辞書の1文書分を追記（flush_docs 件溜まったら書き出す）"""
+        words = features.get('words')
+        ids = self.vocabulary.encode(words) if words is not None else np.zeros(0, dtype=np.uint32)
+        self._buffer.append((ids, words is not None, [features[column] for column in self.STAT_COLUMNS]))
+        if len(self._buffer) >= self.flush_docs:
+            self.flush()
+
+    def flush(self):
+        """溜めた文書を各列のファイルに追記し、meta.json を置き換える"""
+        if not self._buffer:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        num_docs, num_tokens, vocab_bytes, vocab_size = self._committed
+        if not self._truncated:
+            self._truncate(num_docs, num_tokens, vocab_bytes)
+        
+        lengths = np.array([len(ids) for ids, _, _ in self._buffer], dtype=np.int64)
+        arrays = {
+            'tokens': np.concatenate([ids for ids, _, _ in self._buffer]),
+            'offsets': num_tokens + np.cumsum(lengths),
+            'has_tokens': np.array([has_tokens for _, has_tokens, _ in self._buffer]),
+        }
+        for i, column in enumerate(self.STAT_COLUMNS):
+            arrays[column] = np.array([stats[i] for _, _, stats in self._buffer])
+        for name, values in arrays.items():
+            with open(self._file(name), 'ab') as f:
+                values.astype(self.ARRAYS[name]).tofile(f)
+        
+        # 語彙表は前回の flush 以降に登録された語だけを追記
+        new_words = self.vocabulary.id2word[vocab_size:]
+        data = ''.join(json.dumps(word, ensure_ascii=False) + '\n' for word in new_words).encode('utf-8')
+        with open(self._file('vocab'), 'ab') as f:
+            f.write(data)
+        
+        committed = (num_docs + len(self._buffer), num_tokens + int(lengths.sum()),
+                     vocab_bytes + len(data), vocab_size + len(new_words))
+        meta = {
+            'version': self.VERSION,
+            'num_docs': committed[0],
+            'num_tokens': committed[1],
+            'vocab_size': committed[3],
+            'vocab_bytes': committed[2],
+        }
+        meta_path = os.path.join(self.path, 'meta.json')
+        tmp_path = f"{meta_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+        
+        self._buffer = []
+        self._committed = committed
+
+    def _truncate(self, num_docs, num_tokens, vocab_bytes):
+        """前回の書き出しが途中で止まった場合に備え、各ファイルを確定済みの長さに切り詰める"""
+        lengths = {'tokens': num_tokens, 'vocab': vocab_bytes}
+        for name in self.ARRAYS:
+            lengths.setdefault(name, num_docs)
+        for name, length in lengths.items():
+            path = self._file(name)
+            size = length if name == 'vocab' else length * np.dtype(self.ARRAYS[name]).itemsize
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                with open(path, 'r+b') as f:
+                    f.truncate(size)
+        self._truncated = True
+
+    def _array(self, name):
+        """確定済みの範囲の列をmemmapで開く（同じ件数の間は開いたものを再利用）"""
+        committed = self._committed
+        key = (name, committed)
+        view = self._views.get(key)
+        if view is None:
+            length = committed[1] if name == 'tokens' else committed[0]
+            dtype = np.dtype(self.ARRAYS[name])
+            if length == 0:
+                view = np.zeros(0, dtype=dtype)
+            else:
+                view = np.memmap(self._file(name), dtype=dtype, mode='r', shape=(length,))
+            self._views = {k: v for k, v in self._views.items() if k[1] == committed}
+            self._views[key] = view
+        return view
+
+    def _range(self, start, stop):
+        stop = self.num_docs if stop is None else min(stop, self.num_docs)
+        return start, stop
+
+    def token_offsets(self, start=0, stop=None):
+        """文書 start〜stop のトークン列の開始位置（末尾に終了位置を含む len+1 個）"""
+        start, stop = self._range(start, stop)
+        ends = self._array('offsets')
+        begin = ends[start - 1] if start > 0 else 0
+        return np.concatenate([[begin], ends[start:stop]]).astype(np.int64)
+
+    def document_stats(self, start=0, stop=None):
+        """文書 start〜stop の統計量（memmapのスライスを列に持つ DocumentColumns）"""
+        start, stop = self._range(start, stop)
+        return DocumentColumns({column: self._array(column)[start:stop] for column in self.STAT_COLUMNS})
+
+    def tokenized(self, start=0, stop=None):
+        """文書 start〜stop のうちトークン列を持つ文書の番号"""
+        start, stop = self._range(start, stop)
+        return start + np.flatnonzero(self._array('has_tokens')[start:stop])
+
+    def token_docs(self, start=0, stop=None):
+        """トークン列を持つ文書の語のリスト（gensimのコヒーレンス計算など語の列が必要な処理向け）"""
+        start, stop = self._range(start, stop)
+        tokens = self._array('tokens')
+        offsets = self.token_offsets(start, stop)
+        id2word = self.vocabulary.id2word
+        return [[id2word[i] for i in tokens[offsets[doc]:offsets[doc + 1]].tolist()]
+                for doc in self.tokenized(start, stop) - start]
+
+    def document_term_matrix(self, start=0, stop=None, bigrams=True):
+        """トークン列を持つ文書の DocumentTermMatrix（語ID列はmemmapのスライスをそのまま使う）"""
+        start, stop = self._range(start, stop)
+        offsets = self.token_offsets(start, stop)
+        ids = self._array('tokens')[offsets[0]:offsets[-1]]
+        # トークン列のない文書は長さ0なので、その区切りを除くだけで連続性が保たれる
+        kept = self.tokenized(start, stop) - start
+        offsets = np.concatenate([offsets[:1], offsets[1:][kept]]) - offsets[0]
+        return DocumentTermMatrix.from_ids(ids, offsets, self.vocabulary, bigrams=bigrams)
+
+    def word_frequencies(self, start=0, stop=None):
+        """文書ごとの語彙頻度（Counter）を順に返す（トークン列のない文書は None）"""
+        tokens = self._array('tokens')
+        offsets = self.token_offsets(start, stop)
+        has_tokens = self._array('has_tokens')
+        id2word = self.vocabulary.id2word
+        start, stop = self._range(start, stop)
+        for i in range(stop - start):
+            if not has_tokens[start + i]:
+                yield None
+                continue
+            ids, counts = np.unique(tokens[offsets[i]:offsets[i + 1]], return_counts=True)
+            yield Counter(dict(zip((id2word[w] for w in ids.tolist()), counts.tolist())))
+
+
+class CorpusState:
+    """実行をまたいで併合するコーパス全体の集計状態
+
+    語彙ID・語彙頻度・共起行列・文書ごとの統計量・文書ごとの語彙頻度
+    （gensimのBoWコーパスに相当）をバージョン付きのnpzファイルに保存する。
+    共起行列が近似集計なら容量上限と誤差上限も保存し、読み込み後も同じ保証を保つ。
+    各実行では新着文書の分だけを併合するため、全期間を再解析する必要がない。
+    """
+
+    VERSION = 2
+    STAT_COLUMNS = {
+        'word_count': np.int64,
+        'unique_words': np.int64,
+        'char_count': np.int64,
+        'avg_word_length': np.float64,
+        'ttr': np.float64,
+    }
+
+    def __init__(self):
+        self.vocabulary = Vocabulary()
+        self.word_counts = np.zeros(0, dtype=np.int64)
+        self.pairs = CooccurrenceMatrix(self.vocabulary)
+        self.doc_stats = {column: np.zeros(0, dtype=dtype) for column, dtype in self.STAT_COLUMNS.items()}
+        self.bow_offsets = np.zeros(1, dtype=np.int64)
+        self.bow_ids = np.zeros(0, dtype=np.uint32)
+        self.bow_counts = np.zeros(0, dtype=np.uint32)
+
+    @property
+    def num_docs(self):
+        return len(self.bow_offsets) - 1
+
+    @property
+    def word_frequency(self):
+        """コーパス全体の語彙頻度（Counter）"""
+        nonzero = np.flatnonzero(self.word_counts)
+        id2word = self.vocabulary.id2word
+        return Counter({id2word[i]: int(self.word_counts[i]) for i in nonzero})
+
+    def merge_run(self, all_features, pair_counter, word_frequencies=None):
+        """今回の実行で抽出した文書の特徴量と共起集計を併合
+        
+        word_frequencies を渡すと、文書ごとの語彙頻度を特徴量ではなくそこから読む。
+        """
+        new_ids, new_counts = [], []
+        new_stats = {column: [] for column in self.STAT_COLUMNS}
+        if word_frequencies is None:
+            word_frequencies = (features['word_frequency'] for features in all_features)
+        
+        for features, freq in zip(all_features, word_frequencies):
+            ids = self.vocabulary.encode(list(freq.keys()))
+            counts = np.fromiter(freq.values(), dtype=np.uint32, count=len(freq))
+            order = np.argsort(ids, kind='stable')
+            new_ids.append(ids[order])
+            new_counts.append(counts[order])
+            for column in self.STAT_COLUMNS:
+                new_stats[column].append(features[column])
+        
+        if new_ids:
+            lengths = np.array([len(ids) for ids in new_ids], dtype=np.int64)
+            self.bow_offsets = np.concatenate([self.bow_offsets, self.bow_offsets[-1] + np.cumsum(lengths)])
+            self.bow_ids = np.concatenate([self.bow_ids] + new_ids)
+            self.bow_counts = np.concatenate([self.bow_counts] + new_counts)
+            
+            for column, dtype in self.STAT_COLUMNS.items():
+                self.doc_stats[column] = np.concatenate(
+                    [self.doc_stats[column], np.array(new_stats[column], dtype=dtype)])
+            
+            word_counts = np.zeros(len(self.vocabulary), dtype=np.int64)
+            word_counts[:len(self.word_counts)] = self.word_counts
+            np.add.at(word_counts, np.concatenate(new_ids), np.concatenate(new_counts).astype(np.int64))
+            self.word_counts = word_counts
+        
+        # 近似集計の実行を併合したら、以降も同じ容量上限で間引く
+        if self.pairs.capacity is None and isinstance(pair_counter, CooccurrenceMatrix):
+            self.pairs.capacity = pair_counter.capacity
+        self.pairs.update(pair_counter)
+
+    def document_stats(self):
+        """文書ごとの統計量（列をコピーせずに持つ DocumentColumns）"""
+        return DocumentColumns(self.doc_stats)
+
+    def gensim_corpus(self):
+        """gensim形式のBoWコーパス（文書ごとの (語ID, 頻度) リスト）を順に返す"""
+        for i in range(self.num_docs):
+            start, end = self.bow_offsets[i], self.bow_offsets[i + 1]
+            yield list(zip(self.bow_ids[start:end].tolist(), self.bow_counts[start:end].tolist()))
+
+    def gensim_dictionary(self):
+        """語彙IDをそのまま使うgensimのDictionary"""
+        from gensim.corpora import Dictionary
+        
+        size = len(self.vocabulary)
+        dictionary = Dictionary()
+        dictionary.token2id = dict(self.vocabulary.word2id)
+        dictionary.dfs = dict(enumerate(np.bincount(self.bow_ids, minlength=size).tolist()))
+        dictionary.cfs = dict(enumerate(self.word_counts.tolist()))
+        dictionary.num_docs = self.num_docs
+        dictionary.num_pos = int(self.word_counts.sum())
+        dictionary.num_nnz = len(self.bow_ids)
+        return dictionary
+
+    def save(self, path):
+        """npz形式で保存（一時ファイルに書いてから置き換える）"""
+        matrix = self.pairs.tocsr()
+        arrays = {
+            'version': np.array(self.VERSION),
+            'vocab': np.array(self.vocabulary.id2word, dtype=str),
+            'word_counts': self.word_counts,
+            'pair_data': matrix.data,
+            'pair_indices': matrix.indices,
+            'pair_indptr': matrix.indptr,
+            # 容量上限なし（厳密集計）は -1 で表す
+            'pair_capacity': np.array(-1 if self.pairs.capacity is None else self.pairs.capacity),
+            'pair_error_bound': np.array(self.pairs.error_bound),
+            'bow_offsets': self.bow_offsets,
+            'bow_ids': self.bow_ids,
+            'bow_counts': self.bow_counts,
+        }
+        for column, values in self.doc_stats.items():
+            arrays[f'stat_{column}'] = values
+        
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """npzファイルから復元（形式のバージョンが異なる場合はValueError）"""
+        from scipy import sparse
+        
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data['version'])
+            if version != cls.VERSION:
+                raise ValueError(f"コーパス状態の形式が対応していません: version={version}（対応: {cls.VERSION}）")
+            
+            state = cls()
+            state.vocabulary = Vocabulary(data['vocab'].tolist())
+            size = len(state.vocabulary)
+            state.word_counts = data['word_counts']
+            matrix = sparse.csr_matrix(
+                (data['pair_data'], data['pair_indices'], data['pair_indptr']), shape=(size, size))
+            capacity = int(data['pair_capacity'])
+            state.pairs = CooccurrenceMatrix.from_csr(matrix, state.vocabulary,
+                                                      capacity=capacity if capacity >= 0 else None)
+            state.pairs.error_bound = float(data['pair_error_bound'])
+            state.bow_offsets = data['bow_offsets']
+            state.bow_ids = data['bow_ids']
+            state.bow_counts = data['bow_counts']
+            state.doc_stats = {column: data[f'stat_{column}'] for column in cls.STAT_COLUMNS}
+        
+        return state
+
+
+def _current_rss_bytes():
+    """現在の常駐メモリ量（取得できない環境ではNone）"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _peak_rss_bytes():
+    """プロセス開始以降の最大常駐メモリ量（取得できない環境ではNone）"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOSはバイト単位、Linuxはキロバイト単位
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class StdoutMetricsSink:
+    """計測結果を標準出力に要約表示する"""
+
+    def write(self, snapshot):
+        print("\n⏱ 段階別の計測結果:")
+        for name, stage in snapshot['stages'].items():
+            line = f"・{name}: {stage['seconds']:.2f}秒"
+            if stage.get('peak_rss_growth_bytes') is not None:
+                line += f"（最大RSSの増加 {stage['peak_rss_growth_bytes'] / 1024 / 1024:.0f}MB"
+                if stage.get('python_peak_bytes') is not None:
+                    line += f"、Pythonのピーク {stage['python_peak_bytes'] / 1024 / 1024:.0f}MB"
+                line += "）"
+            print(line)
+        
+        for name, value in snapshot['gauges'].items():
+            print(f"・{name}: {value:,.1f}")
+        
+        filter_stats = snapshot.get('filter')
+        if filter_stats and filter_stats['checked']:
+            print(f"・フィルタ判定 {filter_stats['checked']:,}件のうち除外 {filter_stats['rejected_total']:,}件")
+            for reason, rate in sorted(filter_stats['rejection_rate'].items(), key=lambda x: -x[1]):
+                print(f"    {FILTER_REJECTION_LABELS.get(reason, reason)}: {rate:.1%}")
+
+
+class JsonLinesMetricsSink:
+    """計測結果を1実行1行のJSONとして追記する"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def write(self, snapshot):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(snapshot, ensure_ascii=False, default=float) + '\n')
+
+
+class PrometheusTextfileSink:
+    """node_exporter の textfile collector 形式で最新の計測結果を書き出す"""
+
+    PREFIX = 'otm_'
+
+    def __init__(self, path):
+        self.path = path
+
+    @classmethod
+    def _metric_name(cls, name):
+        return cls.PREFIX + re.sub(r'[^a-zA-Z0-9_]', '_', name)
+
+    def write(self, snapshot):
+        lines = []
+        
+        def emit(name, metric_type, samples):
+            lines.append(f"# TYPE {name} {metric_type}")
+            for labels, value in samples:
+                label_text = ','.join(f'{k}="{v}"' for k, v in labels.items())
+                lines.append(f"{name}{{{label_text}}} {float(value)!r}" if label_text else f"{name} {float(value)!r}")
+        
+        stages = snapshot['stages']
+        emit(self._metric_name('stage_seconds'), 'gauge',
+             [({'stage': name}, stage['seconds']) for name, stage in stages.items()])
+        emit(self._metric_name('stage_peak_rss_growth_bytes'), 'gauge',
+             [({'stage': name}, stage['peak_rss_growth_bytes']) for name, stage in stages.items()
+              if stage.get('peak_rss_growth_bytes') is not None])
+        python_peaks = [({'stage': name}, stage['python_peak_bytes']) for name, stage in stages.items()
+                        if stage.get('python_peak_bytes') is not None]
+        if python_peaks:
+            emit(self._metric_name('stage_python_peak_bytes'), 'gauge', python_peaks)
+        process_peaks = [stage['process_peak_rss_bytes'] for stage in stages.values()
+                         if stage.get('process_peak_rss_bytes') is not None]
+        if process_peaks:
+            emit(self._metric_name('process_peak_rss_bytes'), 'gauge', [({}, max(process_peaks))])
+        
+        for name, value in snapshot['counters'].items():
+            emit(self._metric_name(name) + '_total', 'counter', [({}, value)])
+        for name, value in snapshot['gauges'].items():
+            emit(self._metric_name(name), 'gauge', [({}, value)])
+        
+        filter_stats = snapshot.get('filter')
+        if filter_stats:
+            emit(self._metric_name('filter_checked_total'), 'counter', [({}, filter_stats['checked'])])
+            emit(self._metric_name('filter_rejected_total'), 'counter',
+                 [({'category': reason}, count) for reason, count in filter_stats['rejected'].items()])
+            emit(self._metric_name('filter_rejection_ratio'), 'gauge',
+                 [({'category': reason}, rate) for reason, rate in filter_stats['rejection_rate'].items()])
+        
+        emit(self._metric_name('last_run_timestamp_seconds'), 'gauge', [({}, snapshot['finished'])])
+        
+        # 収集中に読まれても壊れないよう一時ファイル経由で置き換える
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_path, self.path)
+
+
+class Instrumentation:
+    """処理段階ごとの経過時間・カウンタ・メモリ使用量を計測し、出力先へ書き出す
+
+    profile_stages に含まれる段階は cProfile / tracemalloc で詳細に計測し、
+    結果を profile_dir に保存する（プロセス並列部分はワーカー内を計測しない）。
+    
+    段階ごとのメモリは、その段階でプロセスの最大RSSが増えた量（peak_rss_growth_bytes、
+    それまでの最大を超えなければ0）と前後のRSSの差（rss_delta_bytes）で記録する。
+    process_peak_rss_bytes は段階終了時点でのプロセス開始以降の最大RSSで、段階固有の値ではない。
+    tracemalloc で計測する段階は、その段階内でのPythonの割り当てのピーク（python_peak_bytes）も記録する。
+    """
+
+    PROFILE_TOOLS = ('cprofile', 'tracemalloc')
+
+    def __init__(self, sinks=(), profile_stages=(), profile_tools=('cprofile',), profile_dir=None):
+        self.sinks = list(sinks)
+        self.profile_stages = set(profile_stages)
+        self.profile_tools = [tool for tool in profile_tools if tool in self.PROFILE_TOOLS]
+        self.profile_dir = profile_dir
+        self.reset()
+
+    def reset(self):
+        """実行ごとの計測値を初期化"""
+        self.stages = {}
+        self.counters = Counter()
+        self.gauges = {}
+        self.filter_stats = None
+        self.started = time.time()
+
+    def count(self, name, value=1):
+        self.counters[name] += value
+
+    def gauge(self, name, value):
+        self.gauges[name] = value
+
+    def record_filter(self, stats):
+        """語彙フィルタの判定件数（CompiledWordFilter.stats 形式）を記録"""
+        if self.filter_stats is None:
+            self.filter_stats = Counter()
+        self.filter_stats.update(stats)
+
+    def record_stage(self, name, seconds, calls=1):
+        """別スレッドなどで計った経過時間を段階 name に加算"""
+        record = self.stages.setdefault(name, {'seconds': 0.0, 'calls': 0})
+        record['seconds'] += seconds
+        record['calls'] += calls
+
+    def stage_seconds(self, name):
+        return self.stages.get(name, {}).get('seconds', 0.0)
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """with文で囲んだ処理を段階 name として計測（同名の段階は累積）"""
+        profiler = None
+        started_tracing = False
+        traced_before = 0
+        if name in self.profile_stages:
+            if 'tracemalloc' in self.profile_tools:
+                import tracemalloc
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    started_tracing = True
+                tracemalloc.reset_peak()
+                # 段階の開始前から残っている割り当てはピークから差し引く
+                traced_before = tracemalloc.get_traced_memory()[0]
+            if 'cprofile' in self.profile_tools:
+                import cProfile
+                profiler = cProfile.Profile()
+                profiler.enable()
+        
+        rss_before = _current_rss_bytes()
+        peak_before = _peak_rss_bytes()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            if profiler is not None:
+                profiler.disable()
+            
+            record = self.stages.setdefault(name, {'seconds': 0.0, 'calls': 0})
+            record['seconds'] += elapsed
+            record['calls'] += 1
+            peak_after = _peak_rss_bytes()
+            record['process_peak_rss_bytes'] = peak_after
+            if peak_before is not None and peak_after is not None:
+                record['peak_rss_growth_bytes'] = record.get('peak_rss_growth_bytes', 0) + peak_after - peak_before
+            rss_after = _current_rss_bytes()
+            if rss_before is not None and rss_after is not None:
+                record['rss_delta_bytes'] = rss_after - rss_before
+            
+            if name in self.profile_stages:
+                if 'tracemalloc' in self.profile_tools:
+                    import tracemalloc
+                    if tracemalloc.is_tracing():
+                        record['python_peak_bytes'] = max(record.get('python_peak_bytes', 0),
+                                                          tracemalloc.get_traced_memory()[1] - traced_before)
+                try:
+                    record['profiles'] = self._save_profiles(name, profiler, started_tracing)
+                except Exception as e:
+                    print(f"段階{name}のプロファイル保存中にエラー: {e}")
+
+    def _save_profiles(self, name, profiler, started_tracing):
+        """段階 name のプロファイル結果をファイルに保存し、そのパスを返す"""
+        profile_dir = self.profile_dir or '.'
+        os.makedirs(profile_dir, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        base_path = os.path.join(profile_dir, f"{name}_{stamp}")
+        paths = {}
+        
+        # cProfileの集計結果の割り当てを含めないようtracemallocを先に保存する
+        if 'tracemalloc' in self.profile_tools:
+            import tracemalloc
+            peak = tracemalloc.get_traced_memory()[1]
+            top_stats = tracemalloc.take_snapshot().statistics('lineno')[:30]
+            if started_tracing:
+                tracemalloc.stop()
+            paths['tracemalloc'] = f"{base_path}_tracemalloc.txt"
+            with open(paths['tracemalloc'], 'w', encoding='utf-8') as f:
+                f.write(f"peak_bytes: {peak}\n")
+                for stat in top_stats:
+                    f.write(f"{stat}\n")
+        
+        if profiler is not None:
+            import pstats
+            paths['cprofile'] = f"{base_path}.prof"
+            profiler.dump_stats(paths['cprofile'])
+            with open(f"{base_path}_cprofile.txt", 'w', encoding='utf-8') as f:
+                pstats.Stats(profiler, stream=f).sort_stats('cumulative').print_stats(40)
+        
+        return paths
+
+    def snapshot(self):
+        """計測結果をJSON化できる辞書にまとめる"""
+        snapshot = {
+            'started': self.started,
+            'finished': time.time(),
+            'stages': self.stages,
+            'counters': dict(self.counters),
+            'gauges': self.gauges,
+        }
+        
+        if self.filter_stats is not None:
+            checked = sum(self.filter_stats.values())
+            rejected = {reason: count for reason, count in self.filter_stats.items() if reason}
+            snapshot['filter'] = {
+                'checked': checked,
+                'accepted': self.filter_stats[CompiledWordFilter.ACCEPTED],
+                'rejected_total': sum(rejected.values()),
+                'rejected': rejected,
+                'rejection_rate': {reason: count / checked for reason, count in rejected.items()} if checked else {},
+            }
+        return snapshot
+
+    def emit(self):
+        """全ての出力先へ計測結果を書き出す（書き出しの失敗は分析を止めない）"""
+        if not self.sinks:
+            return
+        snapshot = self.snapshot()
+        for sink in self.sinks:
+            try:
+                sink.write(snapshot)
+            except Exception as e:
+                print(f"計測結果の書き出し中にエラー（{type(sink).__name__}）: {e}")
+
+
+# 形態素解析エンジン（tokenizer_backend で選択し、未登録の名前は使えない）
+TOKENIZER_BACKENDS = {}
+
+
+def register_tokenizer_backend(cls):
+    """形態素解析エンジンを name で登録するクラスデコレータ（登録順が自動選択の候補順）"""
+    TOKENIZER_BACKENDS[cls.name] = cls
+    return cls
+
+
+def create_tokenizer_backend(name, dictionary=None):
+    """登録済みの形態素解析エンジンを初期化する（利用できなければ理由を表示してNone）"""
+    backend_class = TOKENIZER_BACKENDS.get(name)
+    if backend_class is None:
+        print(f"❌ 未登録の形態素解析エンジンです: {name}（{', '.join(TOKENIZER_BACKENDS)} から選択）")
+        return None
+    try:
+        return backend_class(dictionary)
+    except Exception as e:
+        print(f"❌ {name} を初期化できません: {e}")
+        return None
+
+
+class TokenizerBackend:
+    """形態素解析エンジンの共通インタフェース
+
+    tokens(text) は文書全体を解析し、(表層形, 原形, 品詞, 品詞細分類1, 品詞細分類2) の
+    組のリストを返す。品詞はIPA辞書の体系にそろえ、原形が得られない語は表層形とする。
+    解析器はスレッドごとに生成する（parallel_threads が偽のエンジンは共有する）。
+    dictionary_scheme は辞書の体系で、体系が異なるエンジンは語の分割や品詞が変わる。
+    """
+
+    name = None
+    dictionary_scheme = None
+    # 除外語辞書・品詞フィルタが前提とする辞書体系
+    REFERENCE_SCHEME = 'ipadic'
+    parallel_threads = True
+
+    def __init__(self, dictionary=None):
+        self.dictionary = dictionary
+        self._local = threading.local()
+        self._shared = None
+        # 初期化に失敗するエンジンはここで例外にする
+        self._analyzer()
+
+    def _analyzer(self):
+        if not self.parallel_threads:
+            if self._shared is None:
+                self._shared = self._create_analyzer()
+            return self._shared
+        analyzer = getattr(self._local, 'analyzer', None)
+        if analyzer is None:
+            analyzer = self._local.analyzer = self._create_analyzer()
+        return analyzer
+
+    def _create_analyzer(self):
+        raise NotImplementedError
+
+    def tokens(self, text):
+        raise NotImplementedError
+
+    def describe(self):
+        """エンジン・辞書体系・辞書の識別名（トークンキャッシュの指紋とレポートに使う）"""
+        name = f"{self.name}[{self.dictionary_scheme}]"
+        return f"{name}:{self.dictionary}" if self.dictionary else name
+
+
+# 一括解析用のMeCab出力形式：1形態素1行で「表層形 原形 品詞 品詞細分類1 品詞細分類2」をタブ区切り
+# （素性が * の項目は空文字になる）
+MECAB_BATCH_FORMAT = (r' --node-format=%m\\t%f[6]\\t%f[0]\\t%f[1]\\t%f[2]\\n'
+                      r' --unk-format=%m\\t%f[6]\\t%f[0]\\t%f[1]\\t%f[2]\\n'
+                      r' --bos-format= --eos-format=')
+
+
+@register_tokenizer_backend
+class MeCabBackend(TokenizerBackend):
+    """MeCab（IPA辞書）：文書全体を1回で解析し、出力を一括で分解する"""
+
+    name = 'mecab'
+    dictionary_scheme = 'ipadic'
+
+    def __init__(self, dictionary=None):
+        import MeCab
+        self.dict_args = self._find_dictionary(MeCab, dictionary)
+        super().__init__(dictionary)
+
+    @staticmethod
+    def _dictionary_candidates(dictionary):
+        """試す辞書指定（指定がなければシステム既定、Debian系の配置、ipadicパッケージの順）"""
+        if dictionary:
+            yield f'-d "{dictionary}"'
+            return
+        yield ''
+        yield '-d /usr/lib/x86_64-linux-gnu/mecab/dic/ipadic-utf8'
+        try:
+            import ipadic
+            yield ipadic.MECAB_ARGS
+        except ImportError:
+            pass
+
+    def _find_dictionary(self, MeCab, dictionary):
+        """IPA辞書の形式（ChaSen出力）で動作する辞書指定を返す"""
+        errors = []
+        for dict_args in self._dictionary_candidates(dictionary):
+            try:
+                if MeCab.Tagger(f'-Ochasen {dict_args}').parse("テスト文章です。").strip():
+                    return dict_args
+            except RuntimeError as e:
+                errors.append(str(e).strip().splitlines()[-1] if str(e).strip() else type(e).__name__)
+        raise RuntimeError(f"IPA辞書で動作するMeCabの設定が見つかりません（{' / '.join(errors)}）")
+
+    def _create_analyzer(self):
+        import MeCab
+        return MeCab.Tagger(self.dict_args + MECAB_BATCH_FORMAT)
+
+    def tokens(self, text):
+        # %f[n] は素性の '*' を空文字で出力するため、ノード単位の解析と同じ '*' に戻す
+        # （原形がない語は表層形を原形とする）
+        fields = iter(self._analyzer().parse(text).replace('\n', '\t').split('\t'))
+        return [(surface, base_form or surface, pos_major or '*', pos_minor1 or '*', pos_minor2 or '*')
+                for surface, base_form, pos_major, pos_minor1, pos_minor2
+                in zip(fields, fields, fields, fields, fields)]
+
+
+# UniDic系の品詞（Sudachi・UniDic）からIPA辞書の品詞体系への対応
+_UNIDIC_COMMON_NOUN_TYPES = {
+    '一般': '一般', 'サ変可能': 'サ変接続', 'サ変形状詞可能': 'サ変接続',
+    '形状詞可能': '形容動詞語幹', '副詞可能': '副詞可能', '助数詞可能': '一般',
+}
+_UNIDIC_PROPER_NOUN_TYPES = {'一般': '一般', '人名': '人名', '地名': '地域'}
+_UNIDIC_SUFFIX_TYPES = {'名詞的': '名詞', '形状詞的': '名詞', '動詞的': '動詞', '形容詞的': '形容詞'}
+
+
+@functools.lru_cache(maxsize=None)
+def _unidic_pos_to_ipa(pos1, pos2, pos3):
+    """UniDic系の品詞3階層をIPA辞書の (品詞, 品詞細分類1, 品詞細分類2) に対応付ける"""
+    if pos1 == '名詞':
+        if pos2 == '普通名詞':
+            return ('名詞', _UNIDIC_COMMON_NOUN_TYPES.get(pos3, '一般'), '*')
+        if pos2 == '固有名詞':
+            return ('名詞', '固有名詞', _UNIDIC_PROPER_NOUN_TYPES.get(pos3, '一般'))
+        if pos2 == '数詞':
+            return ('名詞', '数', '*')
+        return ('名詞', '特殊', '助動詞語幹')
+    if pos1 == '代名詞':
+        return ('名詞', '代名詞', '一般')
+    if pos1 == '形状詞':
+        return ('名詞', '特殊' if pos2 == '助動詞語幹' else '形容動詞語幹', '*')
+    if pos1 == '接尾辞':
+        if pos2 == '名詞的':
+            return ('名詞', '接尾', '助数詞' if pos3 == '助数詞' else '一般')
+        return (_UNIDIC_SUFFIX_TYPES.get(pos2, pos1), '接尾', '*')
+    if pos1 in ('動詞', '形容詞'):
+        # UniDicの「非自立可能」（する・いる等）は自立語として扱い、機能語辞書で除外する
+        return (pos1, '自立', '*')
+    if pos1 == '接頭辞':
+        return ('接頭詞', '名詞接続', '*')
+    if pos1 in ('補助記号', '記号', '空白'):
+        return ('記号', '空白' if pos1 == '空白' else '一般', '*')
+    return (pos1, pos2, pos3)
+
+
+@register_tokenizer_backend
+class FugashiBackend(TokenizerBackend):
+    """fugashi（UniDic、既定は unidic-lite）：品詞をIPA辞書の体系に対応付ける"""
+
+    name = 'fugashi'
+    dictionary_scheme = 'unidic'
+
+    def _create_analyzer(self):
+        import fugashi
+        return fugashi.Tagger(f'-d "{self.dictionary}"' if self.dictionary else '')
+
+    def tokens(self, text):
+        tokens = []
+        for word in self._analyzer()(text):
+            feature = word.feature
+            surface = word.surface
+            # 原形は表記を保った orthBase（lemma は漢字表記に正規化されるため使わない）
+            base_form = getattr(feature, 'orthBase', None)
+            if not base_form or base_form == '*':
+                base_form = surface
+            tokens.append((surface, base_form) + _unidic_pos_to_ipa(feature.pos1, feature.pos2, feature.pos3))
+        return tokens
+
+
+@register_tokenizer_backend
+class SudachiBackend(TokenizerBackend):
+    """SudachiPy（短単位のAモード）：品詞をIPA辞書の体系に対応付ける
+
+    dictionary には 'core' / 'small' / 'full' または辞書ファイルのパスを指定する。
+    """
+
+    name = 'sudachi'
+    dictionary_scheme = 'sudachidict'
+    # Sudachiが一度に解析できる入力の上限（約48KB）に余裕を持たせた分割サイズ
+    MAX_INPUT_BYTES = 40000
+
+    def _create_analyzer(self):
+        from sudachipy import dictionary, tokenizer
+        sudachi_dictionary = dictionary.Dictionary(dict=self.dictionary or 'core')
+        mode = tokenizer.Tokenizer.SplitMode.A
+        if hasattr(sudachi_dictionary, 'tokenizer'):
+            return sudachi_dictionary.tokenizer(mode=mode)
+        return sudachi_dictionary.create(mode)
+
+    def _pieces(self, text):
+        """入力上限を超えないよう行境界（長い行は文末「。」）で区切る"""
+        if len(text.encode('utf-8')) <= self.MAX_INPUT_BYTES:
+            yield text
+            return
+        
+        piece, size = [], 0
+        for line in re.split(r'(?<=[\n。])', text):
+            line_size = len(line.encode('utf-8'))
+            if size + line_size > self.MAX_INPUT_BYTES and piece:
+                yield ''.join(piece)
+                piece, size = [], 0
+            # 文末のない極端に長い行は文字数で区切る
+            while line_size > self.MAX_INPUT_BYTES:
+                cut = self.MAX_INPUT_BYTES // 4
+                yield line[:cut]
+                line = line[cut:]
+                line_size = len(line.encode('utf-8'))
+            piece.append(line)
+            size += line_size
+        if piece:
+            yield ''.join(piece)
+
+    def tokens(self, text):
+        analyzer = self._analyzer()
+        tokens = []
+        for piece in self._pieces(text):
+            for morpheme in analyzer.tokenize(piece):
+                pos = morpheme.part_of_speech()
+                tokens.append((morpheme.surface(), morpheme.dictionary_form() or morpheme.surface())
+                              + _unidic_pos_to_ipa(pos[0], pos[1], pos[2]))
+        return tokens
+
+
+@register_tokenizer_backend
+class JanomeBackend(TokenizerBackend):
+    """Janome（純Python、IPA辞書）：dictionary にはユーザー辞書CSVを指定できる
+
+    品詞情報に原形を含まないため、従来どおり原形は表層形とする。
+    """
+
+    name = 'janome'
+    dictionary_scheme = 'ipadic'
+    parallel_threads = False
+
+    def _create_analyzer(self):
+        from janome.tokenizer import Tokenizer
+        if self.dictionary:
+            return Tokenizer(udic=self.dictionary, udic_enc='utf8')
+        return Tokenizer()
+
+    def tokens(self, text):
+        tokens = []
+        for token in self._analyzer().tokenize(text):
+            pos_info = token.part_of_speech.split(',')
+            pos_info += [''] * (3 - len(pos_info))
+            tokens.append((token.surface, token.surface, pos_info[0], pos_info[1], pos_info[2]))
+        return tokens
+
+
+# 起動時に形態素解析エンジンの速度を比べるための文章
+_TOKENIZER_BENCHMARK_TEXT = (
+    "本日の会議では、新しい製品の開発計画について担当者から詳しい説明がありました。"
+    "市場調査の結果によると、若い世代の利用者が増加しており、販売戦略の見直しが必要です。"
+    "田中さんは来週までに資料を準備し、東京の本社で報告する予定です。\n"
+) * 20
+
 
 class AdvancedTextMiner:
     """高度なテキストマイニング分析システム（推論・感情語・構造語除去機能強化版）"""
     
-    def __init__(self, config_path=None):
+    def __init__(self, config_path=None, config=None):
         # 設定の初期化
-        self.config = self._load_config(config_path) if config_path else self._default_config()
-        self.tokenizer = Tokenizer()
+        if config is not None:
+            self.config = config
+        else:
+            self.config = self._load_config(config_path) if config_path else self._default_config()
         
         # 改良版：言語学的カテゴリ別除外語辞書の初期化
         self._init_linguistic_filters()
+        self._build_word_filter()
+        
+        # 形態素解析エンジンの選択と初期化
+        self.tokenizer_backend = self._setup_tokenizer()
+        
+        # 形態素解析結果のディスクキャッシュ（token_cache_dir 設定時のみ）
+        self._build_token_cache()
+        
+        # ネットワーク図・ワードクラウドの描画キャッシュ（render_cache_dir 設定時のみ）
+        self._build_render_cache()
+        
+        # 共起集計で共有する語彙ID表
+        self.vocabulary = Vocabulary()
+        
+        # 文書のトークン列と統計量の列形式ストア（corpus_store_path 設定時のみ）
+        self._build_corpus_store()
         
-        # MeCabの設定と詳細な状態チェック
-        self.use_mecab = False
-        self.mecab = None
-        self._setup_mecab()
+        # 段階別の計測とプロファイリング
+        self._build_instrumentation()
+        
+        # 常駐モードで再利用する読み込み済みモデル（種類 → (パス, 更新時刻, オブジェクト)）と
+        # 起動済みのワーカープール・描画プール
+        self._warm_models = {}
+        self._worker_pool = None
+        self._render_pool = None
             
         self.results = {}
     
@@ -175,57 +2177,175 @@ class AdvancedTextMiner:
         print(f"・敬称・敬語: {len(self.honorific_words)}語")  # 新しいカテゴリ
         print(f"・総除外語数: {len(self.all_excluded_words)}語")
     
-    def _setup_mecab(self):
-        """MeCabの詳細な設定と状態チェック"""
-        print("\n形態素解析エンジンの設定を確認中...")
+    def _build_word_filter(self):
+        """設定と除外語辞書から高速語彙フィルタを構築（設定変更後は再構築する）"""
+        self.word_filter = CompiledWordFilter(
+            self.config,
+            self.inference_emotion_words,
+            self.structural_words,
+            self.functional_words,
+            self.honorific_words,
+            cache_size=self.config.get('filter_cache_size', 500000)
+        )
+    
+    def _filter_fingerprint(self):
+        """トークン列に影響する設定・辞書・解析エンジンの指紋"""
+        filter_settings = {
+            'format': TokenCache.FORMAT_VERSION,
+            'engine': self.tokenizer_backend.describe(),
+            'config': {key: self.config.get(key, True) for key in (
+                'min_word_length', 'enable_verb_normalization', 'strict_pos_filtering',
+                'exclude_inference_emotion', 'exclude_structural_words')},
+            'inference_emotion_words': sorted(self.inference_emotion_words),
+            'structural_words': sorted(self.structural_words),
+            'functional_words': sorted(self.functional_words),
+            'honorific_words': sorted(self.honorific_words),
+            'additional_patterns': {name: sorted(words) for name, words in ADDITIONAL_EXCLUSION_PATTERNS.items()},
+            'suffixes': [HONORIFIC_SUFFIXES, MODAL_SUFFIXES, ORG_SUFFIXES],
+            'common_adjectives': sorted(COMMON_ADJECTIVES),
+        }
+        payload = json.dumps(filter_settings, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def _build_token_cache(self):
+        """設定に応じてトークンキャッシュを構築（フィルタ設定変更後は再構築する）"""
+        cache_dir = self.config.get('token_cache_dir')
+        self.token_cache = TokenCache(cache_dir, self._filter_fingerprint()) if cache_dir else None
+    
+    def _build_render_cache(self):
+        """設定に応じて描画キャッシュを構築"""
+        cache_dir = self.config.get('render_cache_dir')
+        self.render_cache = None
+        if cache_dir:
+            self.render_cache = RenderCache(cache_dir,
+                                            max_bytes=int(self.config.get('render_cache_max_mb', 200) * 1024 * 1024),
+                                            max_entries=self.config.get('render_cache_max_entries', 50))
+    
+    def _render_profile(self):
+        """render_profile の描画設定に render_dpi・attachment_max_mb の上書きを反映して返す"""
+        name = self.config.get('render_profile', 'print')
+        if name not in RENDER_PROFILES:
+            print(f"⚠️ 未知の描画プロファイル {name} の代わりに print を使用します")
+            name = 'print'
+        profile = dict(RENDER_PROFILES[name])
         
-        # Step 1: MeCabライブラリのインポート確認
-        try:
-            import MeCab
-            print("✓ MeCabライブラリが見つかりました")
-        except ImportError as e:
-            print("❌ MeCabライブラリが見つかりません")
-            print(f"   詳細: {e}")
-            print("   → Janomeを使用します（十分な性能があります）")
-            return
+        dpi = self.config.get('render_dpi')
+        if dpi:
+            profile['network_dpi'] = dpi
+            if profile['wordcloud_dpi'] is not None:
+                profile['wordcloud_dpi'] = dpi
+        if self.config.get('attachment_max_mb'):
+            profile['attachment_max_mb'] = self.config['attachment_max_mb']
+        return profile
+    
+    def _build_corpus_store(self):
+        path = self.config.get('corpus_store_path')
+        self.corpus_store = None
+        if path:
+            self.corpus_store = CorpusStore(path, flush_docs=self.config.get('corpus_store_flush_docs', 1000))
+            print(f"✓ コーパスストア: {path}（{self.corpus_store.num_docs}件）")
+    
+    def _retain_features(self, features):
+        """集計後も保持する文書の特徴量を返す
         
-        # Step 2: MeCabタガーの初期化確認
-        try:
-            # 一般的な設定での初期化を試行
-            self.mecab = MeCab.Tagger('-Ochasen')
-            print("✓ MeCabタガーの初期化に成功しました")
-        except Exception as e:
-            print("❌ MeCabタガーの初期化に失敗しました")
-            print(f"   詳細: {e}")
-            
-            # 辞書パスを明示的に指定して再試行
-            try:
-                self.mecab = MeCab.Tagger('-Ochasen -d /usr/lib/x86_64-linux-gnu/mecab/dic/ipadic-utf8')
-                print("✓ 辞書パス指定でMeCabタガーの初期化に成功しました")
-            except Exception as e2:
-                print(f"❌ 辞書パス指定でも失敗: {e2}")
-                print("   → Janomeを使用します")
-                return
-        
-        # Step 3: 実際の動作テスト
-        try:
-            test_result = self.mecab.parse("テスト文章です。")
-            if test_result and len(test_result.strip()) > 0:
-                print("✓ MeCab動作テストに成功しました")
-                print(f"   テスト結果: {test_result.strip()[:50]}...")
-                self.use_mecab = True
-                print("🎉 MeCabが正常に動作しています！高精度な解析を使用します")
+        文書ごとの共起行列は手放し、ワーカーで抽出した特徴量は語IDを self.vocabulary に
+        付け替える（保持する特徴量はすべて同じ語彙ID表を参照する）。コーパスストアを
+        使う場合はトークン列と統計量をストアに追記し、統計量だけを保持する（語彙頻度・
+        共起は呼び出し側で集計済み）。ストリーミング処理した文書はトークン列がないため、
+        コーパス状態の併合用に語彙頻度も残す。
+        """
+        # 共起は集計済みのため文書ごとの行列は保持しない
+        features['pairs'] = None
+        features.rebind(self.vocabulary)
+        if self.corpus_store is None:
+            return features
+        self.corpus_store.append(features)
+        retained = {column: features[column] for column in CorpusStore.STAT_COLUMNS}
+        if features['words'] is None:
+            retained['word_frequency'] = features['word_frequency']
+        return retained
+    
+    def _build_instrumentation(self):
+        """設定に応じて計測結果の出力先とプロファイル対象の段階を構築"""
+        output_dir = self.config.get('output_dir', '.')
+        sinks = []
+        for sink_name in self.config.get('metrics_sinks', []):
+            if sink_name == 'stdout':
+                sinks.append(StdoutMetricsSink())
+            elif sink_name == 'jsonl':
+                sinks.append(JsonLinesMetricsSink(
+                    self.config.get('metrics_path') or os.path.join(output_dir, 'metrics.jsonl')))
+            elif sink_name == 'prometheus':
+                sinks.append(PrometheusTextfileSink(
+                    self.config.get('metrics_prometheus_path') or os.path.join(output_dir, 'otm_metrics.prom')))
             else:
-                print("❌ MeCab動作テストで空の結果が返されました")
-        except Exception as e:
-            print(f"❌ MeCab動作テストに失敗: {e}")
-            print("   → Janomeを使用します")
+                print(f"⚠️ 未知の計測出力先を無視します: {sink_name}")
+        
+        self.metrics = Instrumentation(
+            sinks,
+            profile_stages=self.config.get('profile_stages', []),
+            profile_tools=self.config.get('profile_tools', ['cprofile']),
+            profile_dir=self.config.get('profile_dir') or os.path.join(output_dir, 'profiles')
+        )
+    
+    def _setup_tokenizer(self):
+        """設定された形態素解析エンジンを初期化
+        
+        'auto' は候補の順に最初に初期化できたエンジンを使う。tokenizer_auto_benchmark が
+        有効な場合だけ、そのエンジンと同じ辞書体系の候補を計測して最速を選ぶ
+        （辞書体系が異なると分割・品詞が変わるため、速度だけでは選ばない）。
+        """
+        print("\n形態素解析エンジンの設定を確認中...")
+        name = self.config.get('tokenizer_backend', 'auto')
+        
+        if name != 'auto':
+            backend = create_tokenizer_backend(name, self.config.get('tokenizer_dictionary'))
+            if backend is not None:
+                print(f"✓ 形態素解析エンジン: {backend.describe()}")
+                return backend
+            print("   → 利用可能なエンジンから自動で選択します")
+        
+        candidates = list(self.config.get('tokenizer_candidates') or TOKENIZER_BACKENDS)
+        best = None
+        while candidates and best is None:
+            best = create_tokenizer_backend(candidates.pop(0))
+        if best is None:
+            raise RuntimeError("利用できる形態素解析エンジンがありません")
         
-        if not self.use_mecab:
-            print("\n📝 MeCabを使用したい場合は、以下のコマンドを試してください:")
-            print("   sudo apt-get install python3-dev build-essential libmecab-dev")
-            print("   pip install mecab-python3")
-            print("\n💡 現在はJanomeを使用します。一般的な用途には十分な性能です！")
+        if self.config.get('tokenizer_auto_benchmark', False):
+            same_scheme = [n for n in candidates
+                           if getattr(TOKENIZER_BACKENDS.get(n), 'dictionary_scheme', None) == best.dictionary_scheme]
+            backends = [best] + [backend for backend in (create_tokenizer_backend(n) for n in same_scheme)
+                                 if backend is not None]
+            if len(backends) > 1:
+                timings = self._benchmark_tokenizers(backends)
+                best = min(backends, key=lambda backend: timings[backend.name])
+                for backend in backends:
+                    mark = '✓ ' if backend is best else '・'
+                    print(f"{mark}{backend.describe()}: {timings[backend.name] * 1000:.1f}ms")
+        print(f"✓ 形態素解析エンジン: {best.describe()}（自動選択）")
+        
+        if best.dictionary_scheme != TokenizerBackend.REFERENCE_SCHEME:
+            print(f"⚠️ IPA辞書のエンジンが使えないため {best.describe()} で解析します。"
+                  f"語の分割・品詞が異なるため、IPA辞書での結果とは比較できません（レポートに記録します）")
+        if best.name == 'janome':
+            print("\n💡 より高速なMeCabを使用したい場合は、以下のコマンドを試してください:")
+            print("   pip install mecab-python3 ipadic")
+        return best
+    
+    @staticmethod
+    def _benchmark_tokenizers(backends, repeat=3):
+        """各エンジンで計測用の文章を解析した時間（繰り返しの最良値、秒）"""
+        timings = {}
+        for backend in backends:
+            backend.tokens(_TOKENIZER_BENCHMARK_TEXT[:200])
+            best = float('inf')
+            for _ in range(repeat):
+                started = time.perf_counter()
+                backend.tokens(_TOKENIZER_BENCHMARK_TEXT)
+                best = min(best, time.perf_counter() - started)
+            timings[backend.name] = best
+        return timings
     
     def _default_config(self):
         """デフォルト設定（改良版フィルタリング機能付き）"""
@@ -240,9 +2360,83 @@ class AdvancedTextMiner:
             'min_word_length': 2,
             'min_frequency': 3,
             'network_top_n': 40,
+            'network_edge_measure': 'weight',       # 辺の順位付け：'weight' / 'pmi' / 'npmi' / 'jaccard' / 'dice' / 'log_likelihood'
+            'association_min_weight': 2.0,          # 関連度で順位付けする際に対象とする共起重みの下限
+            'cooccurrence_mode': 'exact',           # 'approximate' で共起ペア数を上限までに抑える近似集計（監査時は 'exact'）
+            'cooccurrence_capacity': 1000000,       # 近似集計で保持する共起ペア数の上限
+            'network_layout': 'auto',               # 'auto' / 'kamada_kawai' / 'spring' / 'circular' / 'max_variance'
+            'network_large_n': 150,                 # autoでこのノード数を超えたらばね配置を使う
+            'network_layout_seed': 42,              # ばね配置の乱数シード
+            'network_layout_iterations': 50,        # ばね配置の反復回数
+            'network_layout_incremental': True,     # 前回の配置を初期値にして実行間で安定させる
+            'network_layout_cache_path': None,      # 配置の保存先（Noneで output_dir/network_layout.json）
+            'network_centrality': 'auto',           # 'auto'（centrality_large_n 超で sparse） / 'exact'（NetworkX） / 'sparse'
+            'centrality_large_n': 500,              # auto で疎行列版に切り替えるノード数
+            'betweenness_samples': 256,             # sparse での媒介中心性の始点数（Noneで全始点＝厳密値）
+            'betweenness_seed': 42,                 # 始点抽出の乱数シード
             'topic_num': 5,
             'cluster_num': 7,
             
+            # 並列処理設定
+            'workers': 1,                           # 2以上でファイル処理をプロセス並列化
+            'chunk_size': 16,                       # ワーカーに一度に渡すファイル数
+            'token_cache_dir': None,                # 形態素解析結果のキャッシュ先（Noneで無効）
+            'tokenize_threads': 1,                  # tokenize_many のスレッド数（Janome以外で並列）
+            
+            # 形態素解析エンジン
+            'tokenizer_backend': 'auto',            # 'auto' / 'mecab' / 'fugashi' / 'sudachi' / 'janome'（autoは候補順で最初に使えるエンジン）
+            'tokenizer_dictionary': None,           # 指定したエンジンの辞書（mecab/fugashi: 辞書ディレクトリ、sudachi: core/small/full または辞書ファイル、janome: ユーザー辞書CSV）
+            'tokenizer_candidates': None,           # autoで試すエンジンの優先順（Noneで登録順：mecab, fugashi, sudachi, janome）
+            'tokenizer_auto_benchmark': False,      # autoで同じ辞書体系の候補を起動時に計測して最速を選ぶ
+            
+            # 巨大文書のストリーミング処理
+            'streaming_threshold_mb': 64,           # このサイズ以上のファイルはチャンク単位で処理
+            'stream_chunk_chars': 200000,           # 1チャンクあたりの目安文字数
+            
+            # トピック数の探索
+            'topic_k_min': 2,                       # 評価するトピック数の下限
+            'topic_k_max': 10,                      # 評価するトピック数の上限
+            'topic_lda_passes': 10,                 # 各トピック数でのLDA訓練パス数
+            'topic_search_workers': 1,              # 2以上でトピック数をプロセス並列で評価
+            'topic_early_stopping_patience': 3,     # コヒーレンスが連続で改善しない回数の上限（0で無効）
+            
+            # 実行をまたぐコーパス状態（npz）。設定すると新着分を併合し全期間の集計で出力
+            'corpus_state_path': None,
+            
+            # 文書のトークン列・統計量を列形式で追記するディレクトリ。設定すると取り込んだ文書を
+            # Pythonオブジェクトとして保持せず、トピック・ダッシュボード・レポートはmemmapで読み出す
+            'corpus_store_path': None,
+            'corpus_store_flush_docs': 1000,        # この件数ごとにストアへ書き出す
+            
+            # トピックモデルのオンライン更新
+            'topic_model_mode': 'batch',            # 'online' で保存済みモデルを新着文書で逐次更新
+            'topic_model_path': None,               # モデルの保存先（Noneで output_dir/topic_model/lda.model）
+            'topic_drift_threshold': 0.2,           # 未知語率がこれを超えたら再学習
+            
+            # 段階別の計測とプロファイリング
+            'metrics_sinks': [],                    # 'stdout' / 'jsonl' / 'prometheus' を列挙（空で書き出さない）
+            'metrics_path': None,                   # JSON Linesの出力先（Noneで output_dir/metrics.jsonl）
+            'metrics_prometheus_path': None,        # Prometheus textfileの出力先（Noneで output_dir/otm_metrics.prom）
+            'profile_stages': [],                   # 詳細に計測する段階名（例: ['ingest', 'topics']）
+            'profile_tools': ['cprofile'],          # 'cprofile' と 'tracemalloc' から選択
+            'profile_dir': None,                    # プロファイル結果の保存先（Noneで output_dir/profiles）
+            
+            # 成果物の生成
+            'render_workers': 1,                    # 2以上でネットワーク図・ワードクラウドを別プロセスで描画
+            'render_cache_dir': None,               # 描画結果のキャッシュ先（Noneで無効、入力が同じなら再描画しない）
+            'render_cache_max_mb': 200,             # 描画キャッシュの合計サイズ上限
+            'render_cache_max_entries': 50,         # 描画キャッシュの件数上限（古い参照から削除）
+            'render_profile': 'print',              # 描画品質：'draft' / 'email'（小さいPNGを高速に） / 'print'（300dpi＋SVG）
+            'render_dpi': None,                     # 解像度の上書き（Noneでプロファイルの既定値）
+            'attachment_max_mb': None,              # 添付画像1件あたりの上限（超えたら縮小、Noneでプロファイルの既定値）
+            
+            # 常駐モード（watch サブコマンド）
+            'watch_interval': 2.0,                  # source_dir のポーリング間隔（秒）
+            'watch_settle_seconds': 1.0,            # 更新からこの秒数が経ったファイルのみ処理（書き込み途中の回避）
+            'watch_report_interval': 300,           # 新着文書をまとめて分析・レポートする間隔（秒、0で毎回）
+            'watch_report_min_docs': 200,           # この件数の新着が溜まったら間隔を待たずに分析（0で無効）
+            'watch_queue_size': 64,                 # 段階間のキューの上限（満杯なら上流が待つ）
+            
             # 新しい設定項目（フィルタリング強化）
             'enable_verb_normalization': True,      # 動詞の原形化を有効
             'strict_pos_filtering': True,           # 厳密な品詞フィルタリングを有効
@@ -258,51 +2452,39 @@ class AdvancedTextMiner:
             return json.load(f)
     
     def enhanced_tokenize(self, text):
-        """言語学的知見に基づく高度な形態素解析（改良版フィルタリング）"""
-        words = []
-        
-        if self.use_mecab:
-            # MeCabを使用した高精度解析
-            node = self.mecab.parseToNode(text)
-            while node:
-                if node.surface:
-                    surface = node.surface
-                    features = node.feature.split(',')
-                    
-                    if len(features) >= 4:
-                        pos_major = features[0]
-                        pos_minor1 = features[1]
-                        pos_minor2 = features[2]
-                        base_form = features[6] if len(features) > 6 and features[6] != '*' else surface
-                        
-                        # 改良版フィルタリング
-                        if self._is_meaningful_word_enhanced(surface, base_form, pos_major, pos_minor1, pos_minor2):
-                            # 動詞は原形を使用、その他は表層形を使用
-                            word = base_form if pos_major == '動詞' and self.config['enable_verb_normalization'] else surface
-                            words.append(word)
-                
-                node = node.next
-        else:
-            # Janomeによる解析（改良版フィルタリング）
-            tokens = self.tokenizer.tokenize(text)
-            for token in tokens:
-                surface = token.surface
-                pos_info = token.part_of_speech.split(',')
-                
-                if len(pos_info) >= 2:
-                    pos_major = pos_info[0]
-                    pos_minor1 = pos_info[1] if len(pos_info) > 1 else ''
-                    pos_minor2 = pos_info[2] if len(pos_info) > 2 else ''
-                    base_form = pos_info[6] if len(pos_info) > 6 and pos_info[6] != '*' else surface
-                    
-                    if self._is_meaningful_word_enhanced(surface, base_form, pos_major, pos_minor1, pos_minor2):
-                        word = base_form if pos_major == '動詞' and self.config['enable_verb_normalization'] else surface
-                        words.append(word)
+        """言語学的知見に基づく高度な形態素解析（改良版フィルタリング）
         
-        return words
+        文書全体を一度に解析し、形態素の組の列にまとめてから一括でフィルタを適用する。
+        """
+        tokens = self.tokenizer_backend.tokens(text)
+        
+        # 動詞は原形を使用、その他は表層形を使用
+        normalize_verbs = self.config['enable_verb_normalization']
+        return [base_form if normalize_verbs and pos_major == '動詞' else surface
+                for surface, base_form, pos_major, _, _ in self.word_filter.filter_tokens(tokens)]
+    
+    def tokenize_many(self, texts, threads=None):
+        """複数文書をまとめて形態素解析し、文書ごとのトークン列のリストを返す
+        
+        threads（既定は tokenize_threads）個のスレッドで、スレッドごとの解析器を使って
+        解析する。解析中にGILを解放するビルドのエンジンや、トークンキャッシュの読み書きが
+        多い場合に有効。GILを保持するビルドでCPUを使い切るには workers による
+        プロセス並列を使う。Janomeは純Pythonのため常に逐次処理する。
+        """
+        texts = list(texts)
+        threads = threads or self.config.get('tokenize_threads', 1) or 1
+        if not self.tokenizer_backend.parallel_threads or threads <= 1 or len(texts) <= 1:
+            return [self.tokenize_cached(text) for text in texts]
+        
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(threads, len(texts))) as pool:
+            return list(pool.map(self.tokenize_cached, texts))
     
     def _is_meaningful_word_enhanced(self, surface, base_form, pos_major, pos_minor1, pos_minor2):
-        """改良版：語彙が分析対象として意味があるかを判定する高度フィルタ"""
+        """改良版：語彙が分析対象として意味があるかを判定する高度フィルタ
+        
+        判定の基準実装。トークン化では同一の判定を行う self.word_filter を使用する。
+        """
         
         # 基本的な除外条件
         if (len(surface) < self.config['min_word_length'] or 
@@ -328,29 +2510,7 @@ class AdvancedTextMiner:
             return False
         
         # さらに詳細な除外パターン（敬称と様態表現を強化）
-        additional_patterns = {
-            # 敬称パターン（確実に除外）
-            'honorifics_strict': {'さん', 'ちゃん', 'くん', '様', 'さま', '氏', '君'},
-            
-            # 様態表現（確実に除外）
-            'modal_expressions': {
-                'よう', 'ような', 'ように', 'ようだ', 'ようで', 'ようです',
-                'みたい', 'みたいな', 'みたいに', 'みたいだ', 'みたいで',
-                'っぽい', 'っぽく', 'っぽさ', 'らしい', 'らしく', 'らしさ'
-            },
-            
-            # 人名パターン（拡張）
-            'person_names': {'ジヒョ', 'チェヨン', 'ツウィ', 'ナヨン', 'モモ', 'サナ', 'ダヒョン', 'ジョンヨン', 'ミナ'},
-            
-            # 記号的表現
-            'symbols': {'。', '、', '！', '？', ')', '(', '」', '「', '『', '』', '【', '】', '〈', '〉'},
-            
-            # 単位・助数詞
-            'units': {'円', '万', '千', '百', '億', '兆', 'kg', 'km', 'cm', 'mm', 'g', 'ml', 'l'},
-            
-            # 一般的すぎる副詞
-            'common_adverbs': {'とても', 'かなり', 'ずいぶん', 'だいぶ', 'わりと', 'けっこう', 'ちょっと', 'すこし', '少し'}
-        }
+        additional_patterns = ADDITIONAL_EXCLUSION_PATTERNS
         
         # パターンマッチング除外（確実性を向上）
         for pattern_type, pattern_set in additional_patterns.items():
@@ -358,14 +2518,12 @@ class AdvancedTextMiner:
                 return False
         
         # 語尾による敬称チェック（さらなる確実性のため）
-        honorific_suffixes = ['さん', 'ちゃん', 'くん', '様', 'さま', '氏']
-        for suffix in honorific_suffixes:
+        for suffix in HONORIFIC_SUFFIXES:
             if surface.endswith(suffix) or base_form.endswith(suffix):
                 return False
         
         # 様態表現の語尾チェック
-        modal_suffixes = ['よう', 'ような', 'ように', 'みたい', 'らしい', 'っぽい']
-        for suffix in modal_suffixes:
+        for suffix in MODAL_SUFFIXES:
             if surface.endswith(suffix) or base_form.endswith(suffix):
                 return False
         
@@ -379,8 +2537,7 @@ class AdvancedTextMiner:
                         all(ord(char) >= 0x30A0 and ord(char) <= 0x30FF for char in surface)):
                         return False
                     # 組織名の一般的なパターンを除外
-                    org_suffixes = {'会社', '株式会社', '有限会社', '財団法人', '社団法人', '大学', '学校', '病院'}
-                    if any(surface.endswith(suffix) for suffix in org_suffixes):
+                    if any(surface.endswith(suffix) for suffix in ORG_SUFFIXES):
                         return False
                 return True
             elif pos_minor1 in ['代名詞', '数']:
@@ -400,7 +2557,7 @@ class AdvancedTextMiner:
         elif pos_major == '形容詞':
             if pos_minor1 in ['自立']:
                 # 一般的すぎる形容詞を除外
-                return base_form not in {'良い', 'よい', 'いい', '悪い', 'わるい', '多い', '少ない', '大きい', '小さい'}
+                return base_form not in COMMON_ADJECTIVES
             else:
                 return False
         
@@ -414,46 +2571,108 @@ class AdvancedTextMiner:
         # その他の品詞は除外
         return False
     
+    def tokenize_cached(self, text):
+        """トークンキャッシュを経由した形態素解析（キャッシュ無効時はそのまま解析）"""
+        if self.token_cache is None:
+            return self.enhanced_tokenize(text)
+        
+        words = self.token_cache.get(text)
+        if words is None:
+            words = self.enhanced_tokenize(text)
+            self.token_cache.put(text, words)
+        return words
+    
     def extract_enhanced_features(self, text):
         """テキストから拡張された特徴量を抽出（改良版）"""
-        words = self.enhanced_tokenize(text)
+        words = self.tokenize_cached(text)
         
         # フィルタリング統計の出力
         if self.config.get('enable_semantic_filtering', True):
             print(f"フィルタリング後の語彙数: {len(words)}語")
         
-        # 基本統計
-        char_count = len(text)
-        word_count = len(words)
-        unique_words = len(set(words))
-        avg_word_length = np.mean([len(w) for w in words]) if words else 0
+        # 共起ペアの抽出（動的ウィンドウサイズ3/5/10の重みを距離ごとに一括加算）
+        weighted_pairs = CooccurrenceMatrix(self.vocabulary)
+        weighted_pairs.add_document(words)
         
-        # 語彙の豊富さ（TTR: Type-Token Ratio）
-        ttr = unique_words / word_count if word_count > 0 else 0
+        # 語数・異なり語数・平均語長・TTR（Type-Token Ratio）は参照時に計算
+        return DocumentFeatures.from_words(self.vocabulary, words, len(text), weighted_pairs)
+    
+    def extract_features_streaming(self, chunks):
+        """テキストのチャンク列から特徴量を逐次抽出（巨大文書向け）
         
-        # 共起ペアの抽出（改良版）
-        weighted_pairs = Counter()
+        トークン列は保持せず、頻度と共起の集計だけを更新する。直前チャンクの
+        末尾トークンを引き継ぐため、共起ウィンドウはチャンク境界でも正確に数えられる。
+        戻り値は extract_enhanced_features と同じ形式で、'words' は None になる。
+        空白のみの文書は None を返す。
+        """
+        word_frequency = Counter()
+        weighted_pairs = CooccurrenceMatrix(self.vocabulary)
+        context = []
+        char_count = 0
+        total_word_length = 0
+        has_content = False
         
-        # 動的ウィンドウサイズでの共起抽出
-        window_sizes = [3, 5, 10]
+        for chunk in chunks:
+            char_count += len(chunk)
+            has_content = has_content or bool(chunk.strip())
+            
+            words = self.tokenize_cached(chunk)
+            word_frequency.update(words)
+            total_word_length += sum(len(w) for w in words)
+            weighted_pairs.add_document(words, context)
+            context = (context + words)[-weighted_pairs.context_size:]
         
-        for window in window_sizes:
-            weight = 1.0 / window
-            for i in range(len(words)):
-                for j in range(i + 1, min(i + window, len(words))):
-                    pair = tuple(sorted((words[i], words[j])))
-                    weighted_pairs[pair] += weight
+        if not has_content:
+            return None
         
-        return {
-            'words': words,
-            'pairs': weighted_pairs,
-            'word_count': word_count,
-            'unique_words': unique_words,
-            'char_count': char_count,
-            'avg_word_length': avg_word_length,
-            'ttr': ttr,
-            'word_frequency': Counter(words)
-        }
+        if self.config.get('enable_semantic_filtering', True):
+            print(f"フィルタリング後の語彙数: {sum(word_frequency.values())}語（ストリーミング処理）")
+        
+        return DocumentFeatures.from_frequency(self.vocabulary, word_frequency, char_count,
+                                               total_word_length, weighted_pairs)
+    
+    def _iter_text_chunks(self, f, chunk_chars):
+        """ファイルを行境界（改行のない長い行は文末「。」）で区切って順に読み出す"""
+        pieces = []
+        size = 0
+        
+        while True:
+            piece = f.readline(chunk_chars)
+            if not piece:
+                break
+            pieces.append(piece)
+            size += len(piece)
+            
+            if size >= chunk_chars:
+                buffer = ''.join(pieces)
+                if buffer.endswith('\n'):
+                    cut = len(buffer)
+                else:
+                    # 行の途中なら最後の文末で区切り、残りは次のチャンクへ
+                    cut = buffer.rfind('。') + 1 or len(buffer)
+                yield buffer[:cut]
+                pieces = [buffer[cut:]] if cut < len(buffer) else []
+                size = len(buffer) - cut
+        
+        if pieces:
+            yield ''.join(pieces)
+    
+    def extract_features_from_file(self, file_path):
+        """ファイルから特徴量を抽出（空白のみの文書はNone）
+        
+        streaming_threshold_mb 以上のファイルは全文を読み込まずにチャンク単位で処理する。
+        """
+        threshold = self.config.get('streaming_threshold_mb', 64) * 1024 * 1024
+        
+        with open(file_path, 'r', encoding='utf-8') as f:
+            if os.path.getsize(file_path) >= threshold:
+                chunk_chars = self.config.get('stream_chunk_chars', 200000)
+                return self.extract_features_streaming(self._iter_text_chunks(f, chunk_chars))
+            text = f.read()
+        
+        if not text.strip():
+            return None
+        return self.extract_enhanced_features(text)
     
     def create_filtering_report(self):
         """フィルタリング効果のレポートを生成"""
@@ -496,31 +2715,246 @@ class AdvancedTextMiner:
         """
         return report.strip()
     
-    def create_interactive_network(self, pair_counter, output_path):
-        """インタラクティブなネットワーク図の作成"""
+    def _network_top_pairs(self, pair_counter):
+        """ネットワークの辺にする、設定した関連度の上位ペア"""
+        # 'weight' は窓重み付きの共起回数そのまま
+        measure = self.config.get('network_edge_measure', 'weight')
+        if measure not in ASSOCIATION_MEASURES:
+            print(f"⚠️ 未知の関連度 {measure} の代わりに weight を使用します")
+            measure = 'weight'
+        if measure != 'weight' and isinstance(pair_counter, CooccurrenceMatrix):
+            pair_counter = pair_counter.association(measure, self.config.get('association_min_weight', 2.0))
+        return pair_counter.most_common(self.config['network_top_n'])
+    
+    def build_network(self, pair_counter, top_pairs=None):
+        """共起上位ペアのグラフ・レイアウト・中心性を一度だけ計算する
+        
+        戻り値の辞書はインタラクティブ版と静的版の両方の描画で共有する。
+        top_pairs を渡せば上位ペアを選び直さない。
+        """
+        import networkx as nx
+        
         # NetworkXグラフの構築
         G = nx.Graph()
-        top_pairs = pair_counter.most_common(self.config['network_top_n'])
+        if top_pairs is None:
+            top_pairs = self._network_top_pairs(pair_counter)
         
         for (w1, w2), weight in top_pairs:
             G.add_edge(w1, w2, weight=weight)
         
+        network = {'graph': G, 'layout': None, 'pos': {},
+                   'centrality': {}, 'betweenness': {}, 'pagerank': {}}
+        if not G.edges():
+            return network
+        
         # レイアウトの計算
-        layouts = {
-            'spring': nx.spring_layout(G, k=3, iterations=50),
-            'kamada_kawai': nx.kamada_kawai_layout(G),
-            'circular': nx.circular_layout(G)
-        }
+        network['layout'], network['pos'] = self._compute_network_layout(G)
         
-        # 最も分散の大きいレイアウトを選択
-        best_layout = max(layouts.items(), 
-                         key=lambda x: np.var([pos[0] for pos in x[1].values()]))
-        pos = best_layout[1]
+        # ノードの重要度計算（大規模グラフは疎行列版、媒介中心性は始点の標本で近似）
+        method = self.config.get('network_centrality', 'auto')
+        if method not in ('auto', 'exact', 'sparse'):
+            print(f"⚠️ 未知の中心性の計算方法 {method} の代わりに auto を使用します")
+            method = 'auto'
+        if method == 'auto':
+            method = 'sparse' if len(G) > self.config.get('centrality_large_n', 500) else 'exact'
         
-        # ノードの重要度計算
-        centrality = nx.degree_centrality(G)
-        betweenness = nx.betweenness_centrality(G)
-        pagerank = nx.pagerank(G)
+        if method == 'sparse':
+            centrality = SparseCentrality.from_graph(G)
+            network['centrality'] = centrality.degree()
+            network['betweenness'] = centrality.betweenness(self.config.get('betweenness_samples', 256),
+                                                            self.config.get('betweenness_seed', 42))
+            network['pagerank'] = centrality.pagerank()
+        else:
+            network['centrality'] = nx.degree_centrality(G)
+            network['betweenness'] = nx.betweenness_centrality(G)
+            network['pagerank'] = nx.pagerank(G)
+        
+        return network
+    
+    def _compute_network_layout(self, G):
+        """設定された手法でノード配置を計算し、（手法名, 配置）を返す
+        
+        'auto' はノード数が network_large_n 以下ならKamada-Kawai、超えれば
+        シード固定のばね配置（500ノード以上は疎行列版）を使う。'max_variance' は
+        3種類の配置からx方向の分散が最大のものを選ぶ従来の方式。
+        前回の配置が保存されていれば初期値に使い、実行間で配置を安定させる。
+        """
+        import networkx as nx
+        
+        method = self.config.get('network_layout', 'auto')
+        seed = self.config.get('network_layout_seed', 42)
+        iterations = self.config.get('network_layout_iterations', 50)
+        
+        if method not in ('auto', 'max_variance', 'kamada_kawai', 'spring', 'circular'):
+            print(f"⚠️ 未知のネットワーク配置 {method} の代わりに auto を使用します")
+            method = 'auto'
+        if method == 'auto':
+            method = 'kamada_kawai' if len(G) <= self.config.get('network_large_n', 150) else 'spring'
+        
+        initial_pos = self._initial_network_positions(G, seed)
+        
+        if method == 'max_variance':
+            layouts = {
+                'spring': nx.spring_layout(G, k=3, pos=initial_pos, iterations=iterations, seed=seed),
+                'kamada_kawai': nx.kamada_kawai_layout(G, pos=initial_pos),
+                'circular': nx.circular_layout(G)
+            }
+            
+            # 最も分散の大きいレイアウトを選択
+            method, pos = max(layouts.items(),
+                              key=lambda x: np.var([pos[0] for pos in x[1].values()]))
+        elif method == 'kamada_kawai':
+            pos = nx.kamada_kawai_layout(G, pos=initial_pos)
+        elif method == 'spring':
+            pos = nx.spring_layout(G, pos=initial_pos, iterations=iterations, seed=seed)
+        else:
+            pos = nx.circular_layout(G)
+        
+        self._save_network_positions(pos)
+        return method, pos
+    
+    def _network_layout_cache_path(self):
+        """配置キャッシュの保存先（network_layout_incremental が無効ならNone）"""
+        if not self.config.get('network_layout_incremental', True):
+            return None
+        return (self.config.get('network_layout_cache_path') or
+                os.path.join(self.config['output_dir'], 'network_layout.json'))
+    
+    def _initial_network_positions(self, G, seed):
+        """保存済みの配置から初期配置を作る（新出語は隣接語の重心付近に置く）"""
+        path = self._network_layout_cache_path()
+        if not path or not os.path.exists(path):
+            return None
+        
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)['positions']
+        except (OSError, ValueError, KeyError) as e:
+            print(f"ネットワーク配置キャッシュを読み込めませんでした: {e}")
+            return None
+        
+        pos = {node: np.array(cached[node], dtype=float) for node in G if node in cached}
+        if not pos:
+            return None
+        
+        rng = np.random.default_rng(seed)
+        for node in G:
+            if node in pos:
+                continue
+            placed = [pos[n] for n in G.neighbors(node) if n in pos]
+            if placed:
+                pos[node] = np.mean(placed, axis=0) + rng.normal(scale=0.05, size=2)
+            else:
+                pos[node] = rng.uniform(-1, 1, size=2)
+        return pos
+    
+    def _save_network_positions(self, pos, max_entries=5000):
+        """今回の配置を保存（今回現れなかった語の配置も上限まで引き継ぐ）"""
+        path = self._network_layout_cache_path()
+        if not path:
+            return
+        
+        positions = {node: [float(x), float(y)] for node, (x, y) in pos.items()}
+        try:
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    for node, xy in json.load(f).get('positions', {}).items():
+                        if len(positions) >= max_entries:
+                            break
+                        positions.setdefault(node, xy)
+            
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            tmp_path = f"{path}.tmp{os.getpid()}"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'positions': positions}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except (OSError, ValueError) as e:
+            print(f"ネットワーク配置キャッシュを保存できませんでした: {e}")
+    
+    def _restore_network_positions(self, layout_path):
+        """描画キャッシュに保存した配置を配置キャッシュへ書き戻す"""
+        try:
+            with open(layout_path, 'r', encoding='utf-8') as f:
+                positions = json.load(f)['positions']
+        except (OSError, ValueError, KeyError) as e:
+            print(f"ネットワーク配置キャッシュを読み込めませんでした: {e}")
+            return
+        self._save_network_positions(positions)
+    
+    def create_interactive_network(self, pair_counter, output_path, network=None, top_pairs=None):
+        """インタラクティブなネットワーク図の作成（静的な画像も同じ配置で生成）
+        
+        top_pairs（_network_top_pairs の結果）を渡せば pair_counter は使わない（None でよい）。
+        描画キャッシュが有効なら、上位ペアと配置・描画設定が前回と同じ場合に
+        レイアウト計算と描画を省略する（network を渡した場合は使わない）。
+        network_layout_incremental が有効なら計算した配置もエントリに保存し、
+        再利用時に配置キャッシュへ書き戻すため、次回以降の初期配置も変わらない。
+        """
+        html_path = output_path.replace('.png', '_interactive.html')
+        if network is None and self.render_cache is not None:
+            if top_pairs is None:
+                top_pairs = self._network_top_pairs(pair_counter)
+            profile = self._render_profile()
+            key = self.render_cache.key('network', {
+                'pairs': top_pairs,
+                'config': {name: self.config.get(name) for name in (
+                    'network_top_n', 'network_edge_measure', 'association_min_weight', 'network_layout',
+                    'network_layout_seed', 'network_layout_iterations', 'network_large_n',
+                    'network_layout_incremental',
+                    'network_centrality', 'centrality_large_n', 'betweenness_samples', 'betweenness_seed')},
+                'font_family': 'IPAGothic',
+                'dpi': profile['network_dpi'],
+                'svg': profile['network_svg'],
+            })
+            outputs = {'interactive.html': html_path, 'static.png': output_path}
+            if profile['network_svg']:
+                outputs['static.svg'] = os.path.splitext(output_path)[0] + '.svg'
+            layout_path = None
+            if self._network_layout_cache_path():
+                layout_path = f"{output_path}.layout{os.getpid()}.json"
+                outputs['layout.json'] = layout_path
+            
+            try:
+                if self.render_cache.fetch(key, outputs):
+                    if layout_path and os.path.exists(layout_path):
+                        self._restore_network_positions(layout_path)
+                    print("✓ 描画キャッシュのネットワーク図を再利用しました")
+                    return html_path
+                
+                network = self.build_network(pair_counter, top_pairs)
+                self._render_interactive_network(network, html_path)
+                if self._create_static_network(pair_counter, output_path, network) is None:
+                    outputs.pop('static.png')
+                    outputs.pop('static.svg', None)
+                if layout_path:
+                    with open(layout_path, 'w', encoding='utf-8') as f:
+                        json.dump({'positions': {node: [float(x), float(y)]
+                                                 for node, (x, y) in network['pos'].items()}},
+                                  f, ensure_ascii=False)
+                self.render_cache.store(key, outputs)
+            finally:
+                if layout_path and os.path.exists(layout_path):
+                    os.remove(layout_path)
+            return html_path
+        
+        if network is None:
+            network = self.build_network(pair_counter, top_pairs)
+        self._render_interactive_network(network, html_path)
+        
+        # 静的な画像も生成
+        self._create_static_network(pair_counter, output_path, network)
+        
+        return html_path
+    
+    def _render_interactive_network(self, network, html_path):
+        """build_network の結果をPlotlyで描画してHTMLに保存"""
+        import plotly.graph_objects as go
+        
+        G = network['graph']
+        pos = network['pos']
+        centrality = network['centrality']
+        betweenness = network['betweenness']
+        pagerank = network['pagerank']
         
         # Plotlyでのインタラクティブ可視化
         edge_x, edge_y = [], []
@@ -619,32 +3053,33 @@ class AdvancedTextMiner:
                        ))
         
         # HTMLファイルとして保存
-        html_path = output_path.replace('.png', '_interactive.html')
         fig.write_html(html_path)
-        
-        # 静的な画像も生成
-        self._create_static_network(pair_counter, output_path)
-        
-        return html_path
     
-    def _create_static_network(self, pair_counter, output_path):
-        """静的ネットワーク図の生成"""
-        G = nx.Graph()
-        top_pairs = pair_counter.most_common(self.config['network_top_n'])
+    def _create_static_network(self, pair_counter, output_path, network=None):
+        """静的ネットワーク図の生成（network を渡せば配置・中心性を再計算しない）
         
-        for (w1, w2), weight in top_pairs:
-            G.add_edge(w1, w2, weight=weight)
+        解像度は描画プロファイルに従い、'print' では同名のSVGも保存する。
+        生成した画像のパスを返す（共起関係が足りない場合はNone）。
+        """
+        import networkx as nx
+        import matplotlib
+        from matplotlib.colors import Normalize
+        
+        if network is None:
+            network = self.build_network(pair_counter)
+        G = network['graph']
         
         if not G.edges():
             print("ネットワーク図を作成するのに十分な共起関係が見つかりませんでした。")
             return
         
         # 現代のmatplotlib対応
+        plt = _pyplot()
         fig, ax = plt.subplots(figsize=(16, 12))
-        pos = nx.kamada_kawai_layout(G)
+        pos = network['pos']
         
         # ノードの重要度計算
-        centrality = nx.degree_centrality(G)
+        centrality = network['centrality']
         
         # エッジの重み正規化
         weights = [G[u][v]['weight'] for u, v in G.edges()]
@@ -685,64 +3120,106 @@ class AdvancedTextMiner:
         
         ax.axis('off')
         plt.tight_layout()
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        profile = self._render_profile()
+        plt.savefig(output_path, dpi=profile['network_dpi'], bbox_inches='tight')
+        if profile['network_svg']:
+            plt.savefig(os.path.splitext(output_path)[0] + '.svg', bbox_inches='tight')
         plt.close()
+        
+        return output_path
+    
+    def _wordcloud_frequencies(self, word_freq):
+        """ワードクラウドに使う min_frequency 以上の語の頻度"""
+        return {word: freq for word, freq in word_freq.items()
+                if freq >= self.config['min_frequency']}
     
     def create_wordcloud(self, word_freq, output_path):
-        """日本語対応のワードクラウド生成"""
+        """日本語対応のワードクラウド生成（描画キャッシュが有効なら同じ入力の再描画を省略）
+        
+        描画プロファイルの wordcloud_dpi が None なら、WordCloudの画像を
+        matplotlibで再ラスタライズせずにそのまま保存する。
+        """
         # 頻度辞書の準備
-        filtered_freq = {word: freq for word, freq in word_freq.items() 
-                        if freq >= self.config['min_frequency']}
+        filtered_freq = self._wordcloud_frequencies(word_freq)
         
         if not filtered_freq:
             return None
-            
-        # ワードクラウドの生成
-        wordcloud = WordCloud(
+        
+        profile = self._render_profile()
+        params = dict(
             font_path='/usr/share/fonts/truetype/fonts-japanese-gothic.ttf',
-            width=1200, height=800,
+            width=int(1200 * profile['wordcloud_scale']), height=int(800 * profile['wordcloud_scale']),
             background_color='white',
             max_words=100,
             colormap='viridis',
             relative_scaling=0.5,
             min_font_size=10
-        ).generate_from_frequencies(filtered_freq)
+        )
+        
+        key = None
+        if self.render_cache is not None:
+            key = self.render_cache.key('wordcloud', {'frequencies': list(filtered_freq.items()),
+                                                      'params': params, 'dpi': profile['wordcloud_dpi']})
+            if self.render_cache.fetch(key, {'wordcloud.png': output_path}):
+                print("✓ 描画キャッシュのワードクラウドを再利用しました")
+                return output_path
+            
+        # ワードクラウドの生成
+        from wordcloud import WordCloud
         
-        plt.figure(figsize=(12, 8))
-        plt.imshow(wordcloud, interpolation='bilinear')
-        plt.axis('off')
+        wordcloud = WordCloud(**params).generate_from_frequencies(filtered_freq)
         
-        plt.tight_layout()
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        if profile['wordcloud_dpi'] is None:
+            wordcloud.to_file(output_path)
+        else:
+            plt = _pyplot()
+            plt.figure(figsize=(12, 8))
+            plt.imshow(wordcloud, interpolation='bilinear')
+            plt.axis('off')
+            
+            plt.tight_layout()
+            plt.savefig(output_path, dpi=profile['wordcloud_dpi'], bbox_inches='tight')
+            plt.close()
+        
+        if key is not None:
+            self.render_cache.store(key, {'wordcloud.png': output_path})
         
         return output_path
     
-    def advanced_topic_modeling(self, texts):
-        """改良されたトピックモデリング"""
-        # テキストの前処理
-        processed_docs = []
-        for text in texts:
-            words = self.enhanced_tokenize(text)
-            processed_docs.append(' '.join(words))
+    def advanced_topic_modeling(self, docs, corpus_state=None, dtm=None):
+        """改良されたトピックモデリング
+        
+        docs には生テキストか、特徴抽出済みのトークン列（語のリスト）を渡す。
+        トークン列の場合は形態素解析を再実行しない。docs と同じ文書から作った
+        DocumentTermMatrix を dtm に渡すと行列を作り直さない。
+        topic_model_mode が 'online' の場合は保存済みモデルを docs で逐次更新する
+        （corpus_state があれば再学習時に全期間の文書を使う）。
+        """
+        # テキストの前処理（文書×語行列を一度だけ作り、gensim・TF-IDFで共有）
+        token_docs = [self.tokenize_cached(doc) if isinstance(doc, str) else doc for doc in docs]
         
-        if not any(processed_docs):
+        if not any(token_docs):
             return None, None
+        if dtm is None:
+            dtm = DocumentTermMatrix(token_docs)
+        
+        # オンライン学習モード：保存済みモデルを新着文書で更新
+        if self.config.get('topic_model_mode', 'batch') == 'online':
+            lda_model = self._update_online_topic_model(token_docs, dtm, corpus_state)
+            if lda_model is not None:
+                return self._topics_from_gensim(lda_model), lda_model
+        
+        # 最適なトピック数の探索（コヒーレンス最大のgensimモデルを再訓練せずに採用）
+        best_topics, best_model = self._find_optimal_topics(token_docs, dtm=dtm)
+        if best_model is not None:
+            return self._topics_from_gensim(best_model), best_model
             
-        # TF-IDFベクトル化
-        vectorizer = TfidfVectorizer(
-            max_features=1000,
-            min_df=2,
-            max_df=0.8,
-            ngram_range=(1, 2)
-        )
+        # 探索できなかった場合はTF-IDF + sklearnのLDAで抽出
+        from sklearn.decomposition import LatentDirichletAllocation
         
         try:
-            tfidf_matrix = vectorizer.fit_transform(processed_docs)
-            feature_names = vectorizer.get_feature_names_out()
-            
-            # 最適なトピック数の決定
-            best_topics = self._find_optimal_topics(processed_docs)
+            # TF-IDFベクトル化（1-gram・2-gram、文書頻度で絞り込み）
+            tfidf_matrix, feature_names = dtm.tfidf(min_df=2, max_df=0.8, max_features=1000)
             
             # LDAモデルの訓練
             lda = LatentDirichletAllocation(
@@ -774,47 +3251,179 @@ class AdvancedTextMiner:
             print(f"トピックモデリングエラー: {e}")
             return None, None
     
-    def _find_optimal_topics(self, docs, max_topics=10):
-        """最適なトピック数を見つける"""
+    def _vocabulary_drift(self, dictionary, token_docs):
+        """新着文書の語のうちモデルの語彙にない語の割合（延べ語数ベース）"""
+        total = sum(len(words) for words in token_docs)
+        if total == 0:
+            return 0.0
+        unknown = sum(1 for words in token_docs for word in words if word not in dictionary.token2id)
+        return unknown / total
+    
+    def _update_online_topic_model(self, token_docs, dtm, corpus_state=None):
+        """保存済みのgensim LDAを新着文書のミニバッチで更新して保存する
+        
+        保存済みモデルがない場合や、語彙のずれが topic_drift_threshold を超えた場合は
+        再学習する。トピック数は新着文書での探索結果を使い、corpus_state があれば
+        全期間の文書で訓練する。更新内容は self.topic_model_update に記録する。
+        """
+        from gensim.models import LdaModel
+        
+        model_path = self.config.get('topic_model_path') or os.path.join(
+            self.config['output_dir'], 'topic_model', 'lda.model')
+        threshold = self.config.get('topic_drift_threshold', 0.2)
+        
+        lda_model = None
+        drift = None
+        cached = self._warm_models.get('topic_model')
+        if os.path.exists(model_path):
+            try:
+                if (cached is not None and cached[0] == model_path
+                        and os.path.getmtime(model_path) == cached[1]):
+                    lda_model = cached[2]
+                else:
+                    lda_model = LdaModel.load(model_path)
+                drift = self._vocabulary_drift(lda_model.id2word, token_docs)
+            except Exception as e:
+                print(f"保存済みトピックモデルを読み込めません: {e}")
+                lda_model = None
+        
+        if lda_model is not None and drift <= threshold:
+            # ミニバッチによるオンライン更新（モデルにない語は無視される）
+            lda_model.update([lda_model.id2word.doc2bow(words) for words in token_docs])
+            action = 'update'
+            print(f"トピックモデルを{len(token_docs)}件の文書で更新しました（未知語率{drift:.1%}）")
+        else:
+            if drift is not None:
+                print(f"未知語率{drift:.1%}が閾値{threshold:.1%}を超えたためトピックモデルを再学習します")
+            num_topics, lda_model = self._find_optimal_topics(token_docs, dtm=dtm)
+            
+            if corpus_state is not None and corpus_state.num_docs > len(token_docs):
+                lda_model = LdaModel(
+                    corpus=list(corpus_state.gensim_corpus()),
+                    id2word=corpus_state.gensim_dictionary(),
+                    num_topics=num_topics if lda_model is not None else self.config['topic_num'],
+                    random_state=42,
+                    passes=self.config.get('topic_lda_passes', 10)
+                )
+            if lda_model is None:
+                return None
+            action = 'refit'
+        
+        os.makedirs(os.path.dirname(os.path.abspath(model_path)), exist_ok=True)
+        lda_model.save(model_path)
+        self._warm_models['topic_model'] = (model_path, os.path.getmtime(model_path), lda_model)
+        
+        self.topic_model_update = {
+            'action': action,
+            'drift': drift,
+            'documents': len(token_docs),
+            'num_topics': lda_model.num_topics
+        }
+        return lda_model
+    
+    def _topics_from_gensim(self, lda_model, topn=10):
+        """gensimのLDAモデルから {'id', 'words', 'description'} 形式のトピックを抽出"""
+        topics = []
+        for topic_idx in range(lda_model.num_topics):
+            top_terms = lda_model.show_topic(topic_idx, topn=topn)
+            top_words = [word for word, _ in top_terms]
+            topic_weight = [float(weight) for _, weight in top_terms]
+            
+            topics.append({
+                'id': topic_idx,
+                'words': list(zip(top_words, topic_weight)),
+                'description': ' + '.join([f"{word}({weight:.3f})" 
+                                         for word, weight in zip(top_words[:5], topic_weight[:5])])
+            })
+        return topics
+    
+    def _find_optimal_topics(self, docs, max_topics=None, dtm=None):
+        """最適なトピック数を見つける
+        
+        docs はトークン列（語のリスト）のリスト。dtm に構築済みの DocumentTermMatrix を
+        渡すとその1-gram列をgensimの辞書・コーパスとして使う。
+        topic_k_min〜topic_k_max の各トピック数でgensim LDAを訓練し、c_vコヒーレンスで比較する。
+        topic_search_workers が2以上なら複数のトピック数をプロセス並列で評価し、
+        コヒーレンスが topic_early_stopping_patience 回続けて更新されなければ探索を打ち切る。
+        戻り値は (最適トピック数, そのモデル)。探索できない場合は (既定値, None)。
+        トピック数ごとのスコアと所要時間は self.topic_search_log に記録する。
+        """
+        self.topic_search_log = []
+        
         try:
-            from gensim.corpora import Dictionary
-            from gensim.models import LdaModel
-            from gensim.models.coherencemodel import CoherenceModel
+            texts = docs
+            if dtm is None:
+                dtm = DocumentTermMatrix(texts, bigrams=False)
+            k_min = self.config.get('topic_k_min', 2)
+            k_max = min(max_topics or self.config.get('topic_k_max', 10), len(docs) - 1)
+            candidates = list(range(k_min, k_max + 1))
+            if not candidates:
+                raise ValueError("評価できるトピック数がありません")
             
-            # Gensimでのコヒーレンス計算
-            texts = [doc.split() for doc in docs]
-            dictionary = Dictionary(texts)
-            corpus = [dictionary.doc2bow(text) for text in texts]
+            passes = self.config.get('topic_lda_passes', 10)
+            patience = self.config.get('topic_early_stopping_patience', 3)
+            workers = min(self.config.get('topic_search_workers', 1), len(candidates))
             
-            coherence_scores = []
-            for num_topics in range(2, min(max_topics + 1, len(docs))):
-                lda_model = LdaModel(
-                    corpus=corpus,
-                    id2word=dictionary,
-                    num_topics=num_topics,
-                    random_state=42,
-                    passes=10
-                )
-                
-                coherence_model = CoherenceModel(
-                    model=lda_model,
-                    texts=texts,
-                    dictionary=dictionary,
-                    coherence='c_v'
-                )
-                
-                coherence_scores.append(coherence_model.get_coherence())
+            best_score, best_num, best_model = None, None, None
+            stale = 0
+            
+            if workers > 1:
+                # 常駐モードでは描画スレッドから呼ばれるため、他のスレッドがあればforkしない
+                pool = ProcessPoolExecutor(max_workers=workers,
+                                           mp_context=_thread_safe_mp_context(),
+                                           initializer=_init_topic_worker,
+                                           initargs=(texts, dtm, passes))
+            else:
+                pool = None
+                context = _TopicSearchContext(texts, dtm, passes)
+            
+            def evaluate(topic_counts):
+                if pool is not None:
+                    return list(pool.map(_score_topic_count, topic_counts))
+                return [context.score(k) for k in topic_counts]
+            
+            try:
+                # ワーカー数ずつ評価し、その都度早期終了を判定
+                for start in range(0, len(candidates), workers):
+                    for num_topics, coherence, seconds, lda_model in evaluate(candidates[start:start + workers]):
+                        self.topic_search_log.append({
+                            'num_topics': num_topics,
+                            'coherence': coherence,
+                            'seconds': seconds
+                        })
+                        print(f"トピック数{num_topics}: コヒーレンス{coherence:.4f}（{seconds:.2f}秒）")
+                        
+                        score = coherence if np.isfinite(coherence) else -np.inf
+                        if best_score is None or score > best_score:
+                            best_score, best_num, best_model = score, num_topics, lda_model
+                            stale = 0
+                        else:
+                            stale += 1
+                    
+                    if patience and stale >= patience:
+                        print(f"コヒーレンスが{stale}回続けて改善しないため探索を終了します")
+                        break
+            finally:
+                if pool is not None:
+                    pool.shutdown()
             
-            # 最高スコアのトピック数を返す
-            best_num = range(2, min(max_topics + 1, len(docs)))[np.argmax(coherence_scores)]
-            return best_num
+            # 最高スコアのトピック数とモデルを返す
+            return best_num, best_model
             
-        except:
+        except Exception as e:
             # エラーの場合はデフォルト値
-            return min(self.config['topic_num'], len(docs) // 2)
+            print(f"トピック数の探索をスキップします: {e}")
+            return min(self.config['topic_num'], len(docs) // 2), None
     
-    def create_analysis_dashboard(self, all_features, topics, output_dir):
-        """分析結果のダッシュボード作成"""
+    def create_analysis_dashboard(self, all_features, topics, output_dir, word_freq=None):
+        """分析結果のダッシュボード作成
+        
+        word_freq を渡した場合は文書ごとの語彙頻度を集計せずにそれを使う。
+        """
+        import pandas as pd
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+        
         # 複数のサブプロットを含む総合ダッシュボード
         fig = make_subplots(
             rows=2, cols=2,
@@ -824,9 +3433,10 @@ class AdvancedTextMiner:
         )
         
         # 1. 語彙頻度分布
-        word_freq = Counter()
-        for features in all_features:
-            word_freq.update(features['word_frequency'])
+        if word_freq is None:
+            word_freq = Counter()
+            for features in all_features:
+                word_freq.update(features['word_frequency'])
         
         top_words = word_freq.most_common(20)
         if top_words:
@@ -847,15 +3457,12 @@ class AdvancedTextMiner:
             )
         
         # 3. 文書統計（散布図）
-        doc_stats = pd.DataFrame([
-            {
-                'TTR': f['ttr'],
-                '語数': f['word_count'],
-                '文字数': f['char_count'],
-                '平均語長': f['avg_word_length']
-            }
-            for f in all_features
-        ])
+        doc_stats = pd.DataFrame({
+            'TTR': _stat_column(all_features, 'ttr'),
+            '語数': _stat_column(all_features, 'word_count'),
+            '文字数': _stat_column(all_features, 'char_count'),
+            '平均語長': _stat_column(all_features, 'avg_word_length')
+        })
         
         if not doc_stats.empty:
             fig.add_trace(
@@ -903,25 +3510,34 @@ class AdvancedTextMiner:
         
         return dashboard_path
     
-    def generate_comprehensive_report(self, all_features, topics, pair_counter):
-        """包括的な分析レポートの生成（改良版）"""
+    def generate_comprehensive_report(self, all_features, topics, pair_counter, word_freq=None):
+        """包括的な分析レポートの生成（改良版）
+        
+        word_freq を渡した場合は文書ごとの語彙頻度を集計せずにそれを使う。
+        """
         # 全体統計の計算
-        total_words = sum(f['word_count'] for f in all_features)
-        total_chars = sum(f['char_count'] for f in all_features)
-        unique_words = len(set().union(*[f['words'] for f in all_features]))
+        total_words = int(_stat_column(all_features, 'word_count').sum())
+        total_chars = int(_stat_column(all_features, 'char_count').sum())
         
-        avg_ttr = np.mean([f['ttr'] for f in all_features])
-        avg_word_length = np.mean([f['avg_word_length'] for f in all_features])
+        avg_ttr = np.mean(_stat_column(all_features, 'ttr'))
+        avg_word_length = np.mean(_stat_column(all_features, 'avg_word_length'))
         
         # 最頻出語の分析
-        all_word_freq = Counter()
-        for features in all_features:
-            all_word_freq.update(features['word_frequency'])
+        if word_freq is None:
+            all_word_freq = Counter()
+            for features in all_features:
+                all_word_freq.update(features['word_frequency'])
+        else:
+            all_word_freq = word_freq
+        unique_words = len(all_word_freq)
         
         top_words = all_word_freq.most_common(15)
         
         # 共起関係の分析
         top_cooccurrences = pair_counter.most_common(15)
+        cooccurrence_note = ""
+        if getattr(pair_counter, 'approximate', False):
+            cooccurrence_note = f"（近似集計：関連度の誤差は最大+{pair_counter.error_bound:.3f}）"
         
         # トピック要約
         topic_summary = ""
@@ -951,7 +3567,7 @@ class AdvancedTextMiner:
 ■ 重要語トップ15（フィルタリング適用後）
 {chr(10).join([f'・{word}: {freq}回' for word, freq in top_words])}
 
-■ 注目される共起関係トップ15
+■ 注目される共起関係トップ15{cooccurrence_note}
 {chr(10).join([f'・「{w1}」と「{w2}」: 関連度{freq:.3f}' for (w1, w2), freq in top_cooccurrences])}
 
 ■ 発見されたトピック
@@ -974,7 +3590,7 @@ class AdvancedTextMiner:
 ・感情表現の除去により、客観的な内容分析が実現
 
 ■ 技術的詳細
-・改良版形態素解析: Janome/MeCab + 言語学的フィルタリング
+・形態素解析エンジン: {self.tokenizer_backend.describe()} + 言語学的フィルタリング
 ・除外語辞書: 推論・感情語、構造語、機能語の体系的分類
 ・可視化: インタラクティブネットワーク、改良版ワードクラウド
 ・分析手法: 共起ネットワーク、LDAトピックモデリング、TF-IDF
@@ -986,6 +3602,14 @@ class AdvancedTextMiner:
         return report.strip()
     
     def process_files(self):
+        """メインの処理実行（段階別の計測結果は終了時に設定した出力先へ書き出す）"""
+        self.metrics.reset()
+        try:
+            return self._process_files()
+        finally:
+            self.metrics.emit()
+    
+    def _process_files(self):
         """メインの処理実行（改良版）"""
         print("=== 高度テキストマイニング分析開始 ===")
         print(f"フィルタリング設定: 推論・感情語除外={self.config.get('exclude_inference_emotion', True)}")
@@ -995,11 +3619,6 @@ class AdvancedTextMiner:
         os.makedirs(self.config['archive_dir'], exist_ok=True)
         os.makedirs(self.config['output_dir'], exist_ok=True)
         
-        # ファイル処理
-        all_features = []
-        all_pair_counter = Counter()
-        all_texts = []
-        
         source_files = [f for f in os.listdir(self.config['source_dir']) 
                        if f.endswith('.txt')]
         
@@ -1008,55 +3627,108 @@ class AdvancedTextMiner:
             return
         
         print(f"{len(source_files)}個のファイルを処理中...")
+        self.metrics.count('files', len(source_files))
         
-        for file in source_files:
-            file_path = os.path.join(self.config['source_dir'], file)
-            
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    text = f.read()
-                
-                if text.strip():
-                    features = self.extract_enhanced_features(text)
-                    all_features.append(features)
-                    all_pair_counter.update(features['pairs'])
-                    all_texts.append(text)
-                
-                # ファイルをアーカイブに移動
-                shutil.move(file_path, os.path.join(self.config['archive_dir'], file))
-                
-            except Exception as e:
-                print(f"ファイル{file}の処理中にエラー: {e}")
-                continue
+        # ファイル処理
+        store_start = self.corpus_store.total_docs if self.corpus_store is not None else None
+        with self.metrics.stage('ingest'):
+            if self.config.get('workers', 1) > 1:
+                all_features, all_pair_counter, all_word_freq = self._ingest_files_parallel(source_files)
+            else:
+                all_features, all_pair_counter, all_word_freq = self._ingest_files(source_files)
+            if self.corpus_store is not None:
+                self.corpus_store.flush()
+        self._record_ingest_metrics(all_features)
+        if getattr(all_pair_counter, 'approximate', False):
+            print(f"共起ペアを近似集計しました（保持{len(all_pair_counter):,}組、重みの誤差上限{all_pair_counter.error_bound:.3f}）")
+            self.metrics.gauge('cooccurrence_error_bound', all_pair_counter.error_bound)
         
         if not all_features:
             print("処理可能なテキストデータがありませんでした。")
             return
         
+        self._analyze_and_report(all_features, all_pair_counter, all_word_freq, store_start)
+    
+    def _analyze_and_report(self, all_features, all_pair_counter, all_word_freq, store_start=None):
+        """取り込んだ文書の集計から可視化・トピック・レポートを作成し、メールを送信する
+        
+        コーパスストアを使う場合、今回の文書は store_start 番以降に書き出し済みで、
+        all_features は統計量のみを持つ。トークン列と統計量はストアから読み出す。
+        """
+        store = self.corpus_store if store_start is not None else None
+        store_stop = store_start + len(all_features) if store is not None else None
+        
+        # コーパス状態を使う場合は今回分を併合し、以降は全期間の集計から生成
+        doc_stats = store.document_stats(store_start, store_stop) if store is not None else all_features
+        corpus_state = None
+        state_path = self.config.get('corpus_state_path')
+        if state_path:
+            with self.metrics.stage('corpus_state'):
+                corpus_state = self._load_corpus_state(state_path)
+                word_frequencies = None
+                if store is not None:
+                    # ストリーミング処理した文書の語彙頻度はストアにないため特徴量側を使う
+                    word_frequencies = (freq if freq is not None else features['word_frequency']
+                                        for features, freq in zip(all_features,
+                                                                  store.word_frequencies(store_start, store_stop)))
+                corpus_state.merge_run(all_features, all_pair_counter, word_frequencies)
+                corpus_state.save(state_path)
+                self._warm_models['corpus_state'] = (state_path, os.path.getmtime(state_path), corpus_state)
+            print(f"コーパス状態を更新しました: 累計{corpus_state.num_docs}件（今回{len(all_features)}件）")
+            
+            all_pair_counter = corpus_state.pairs
+            all_word_freq = corpus_state.word_frequency
+            doc_stats = corpus_state.document_stats()
+        
         print("高度分析を実行中...")
         
+        # 常駐モードでは起動済みの描画プロセスを再利用し、それ以外は今回だけ起動する
+        render_pool = self._render_pool or self._create_render_pool()
+        
         # 各種分析の実行
         try:
-            # 1. ネットワーク分析とワードクラウド
+            # 成果物の生成を依存関係に沿って実行（ネットワーク図・ワードクラウドは
+            # render_workers が2以上なら別プロセスで描画し、トピックモデリングと並行させる）
             network_path = os.path.join(self.config['output_dir'], 'network_filtered.png')
-            interactive_network = self.create_interactive_network(all_pair_counter, network_path)
-            
-            # 2. ワードクラウド
-            all_word_freq = Counter()
-            for features in all_features:
-                all_word_freq.update(features['word_frequency'])
-            
             wordcloud_path = os.path.join(self.config['output_dir'], 'wordcloud_filtered.png')
-            self.create_wordcloud(all_word_freq, wordcloud_path)
             
-            # 3. トピックモデリング
-            topics, lda_model = self.advanced_topic_modeling(all_texts)
+            def topic_modeling():
+                # 特徴抽出時のトークン列を再利用（ストリーミング処理した文書はトークン列を保持しないため対象外）
+                dtm = None
+                if store is not None:
+                    # 文書×語行列はストアの語ID列から直接作る
+                    token_docs = store.token_docs(store_start, store_stop)
+                    dtm = store.document_term_matrix(store_start, store_stop)
+                else:
+                    token_docs = [f['words'] for f in all_features if f['words'] is not None]
+                if len(token_docs) < len(all_features):
+                    print(f"ストリーミング処理した{len(all_features) - len(token_docs)}件の文書はトピックモデリングの対象外です")
+                return self.advanced_topic_modeling(token_docs, corpus_state, dtm=dtm)
             
-            # 4. ダッシュボード作成
-            dashboard_path = self.create_analysis_dashboard(all_features, topics, self.config['output_dir'])
+            # 描画プロセスへは共起集計・語彙全体ではなく、描画に使う上位ペア（関連度計算済み）と
+            # 頻度の閾値を超えた語だけを渡す
+            network_pairs = self._network_top_pairs(all_pair_counter)
+            cloud_freq = self._wordcloud_frequencies(all_word_freq)
+            scheduler = RenderScheduler(self.metrics, pool=render_pool)
+            scheduler.add('network', lambda: self.create_interactive_network(None, network_path,
+                                                                             top_pairs=network_pairs),
+                          remote=('create_interactive_network', (None, network_path, None, network_pairs)))
+            scheduler.add('wordcloud', lambda: self.create_wordcloud(cloud_freq, wordcloud_path),
+                          remote=('create_wordcloud', (cloud_freq, wordcloud_path)))
+            scheduler.add('topics', topic_modeling)
+            scheduler.add('dashboard', lambda: self.create_analysis_dashboard(
+                doc_stats, scheduler.results['topics'][0], self.config['output_dir'], word_freq=all_word_freq),
+                deps=('topics',))
+            scheduler.add('report', lambda: self.generate_comprehensive_report(
+                doc_stats, scheduler.results['topics'][0], all_pair_counter, word_freq=all_word_freq),
+                deps=('topics',))
+            results = scheduler.run()
+            scheduler.print_durations()
             
-            # 5. 包括レポート生成
-            report = self.generate_comprehensive_report(all_features, topics, all_pair_counter)
+            interactive_network = results['network']
+            topics, lda_model = results['topics']
+            dashboard_path = results['dashboard']
+            report = results['report']
             
             # 結果の保存
             self.results = {
@@ -1065,7 +3737,9 @@ class AdvancedTextMiner:
                 'interactive_network': interactive_network,
                 'wordcloud_path': wordcloud_path,
                 'dashboard_path': dashboard_path,
-                'topics': topics
+                'topics': topics,
+                'topic_search': getattr(self, 'topic_search_log', []),
+                'topic_model_update': getattr(self, 'topic_model_update', None)
             }
             
             # レポートファイルの保存
@@ -1091,11 +3765,260 @@ class AdvancedTextMiner:
             print(f"\n✅ 特別強化: 「さん」「よう」等の確実な除外を実装")
             
             # メール送信
-            self.send_enhanced_email()
+            with self.metrics.stage('email'):
+                self.send_enhanced_email()
             
         except Exception as e:
             print(f"分析中にエラーが発生: {e}")
             raise
+        finally:
+            if render_pool is not None and render_pool is not self._render_pool:
+                render_pool.shutdown()
+    
+    def _create_render_pool(self):
+        """描画用のプロセスプール（render_workers が1以下ならNone）"""
+        workers = self.config.get('render_workers', 1)
+        if workers <= 1:
+            return None
+        worker_config = dict(self.config, tokenizer_backend=self.tokenizer_backend.name,
+                             corpus_store_path=None)
+        return ProcessPoolExecutor(max_workers=workers,
+                                   initializer=_init_render_worker,
+                                   initargs=(worker_config,))
+    
+    def _load_corpus_state(self, state_path):
+        """コーパス状態を読み込む（常駐中は前回保存した内容をメモリから再利用）"""
+        cached = self._warm_models.get('corpus_state')
+        if (cached is not None and cached[0] == state_path and os.path.exists(state_path)
+                and os.path.getmtime(state_path) == cached[1]):
+            return cached[2]
+        return CorpusState.load(state_path) if os.path.exists(state_path) else CorpusState()
+    
+    def _new_pair_counter(self):
+        """コーパス全体の共起集計用の行列（cooccurrence_mode が 'approximate' なら容量上限付き）"""
+        mode = self.config.get('cooccurrence_mode', 'exact')
+        if mode == 'approximate':
+            return CooccurrenceMatrix(self.vocabulary, capacity=self.config.get('cooccurrence_capacity', 1000000))
+        if mode != 'exact':
+            print(f"⚠️ 未知の共起集計モード {mode} の代わりに exact を使用します")
+        return CooccurrenceMatrix(self.vocabulary)
+    
+    def _record_ingest_metrics(self, all_features):
+        """取り込み段階の文書数・トークン数と処理速度を計測値に記録"""
+        seconds = self.metrics.stage_seconds('ingest')
+        documents = len(all_features)
+        tokens = int(_stat_column(all_features, 'word_count').sum())
+        
+        self.metrics.count('documents', documents)
+        self.metrics.count('tokens', tokens)
+        self.metrics.count('characters', int(_stat_column(all_features, 'char_count').sum()))
+        if seconds > 0:
+            self.metrics.gauge('documents_per_second', documents / seconds)
+            self.metrics.gauge('tokens_per_second', tokens / seconds)
+    
+    def _ingest_files(self, source_files):
+        """ファイルを1件ずつ読み込み・特徴抽出してアーカイブに移動する（逐次処理）"""
+        all_features = []
+        all_pair_counter = self._new_pair_counter()
+        all_word_freq = Counter()
+        filter_before = Counter(self.word_filter.stats)
+        
+        for file in source_files:
+            self._ingest_file(file, all_features, all_pair_counter, all_word_freq)
+        
+        self.metrics.record_filter(self.word_filter.stats - filter_before)
+        return all_features, all_pair_counter, all_word_freq
+    
+    def _ingest_file(self, file, all_features, all_pair_counter, all_word_freq):
+        """1ファイルを特徴抽出して集計に加え、アーカイブに移動する（成否を返す）"""
+        file_path = os.path.join(self.config['source_dir'], file)
+        
+        try:
+            features = self.extract_features_from_file(file_path)
+            
+            if features is not None:
+                all_pair_counter.update(features['pairs'])
+                all_word_freq.update(features['word_frequency'])
+                all_features.append(self._retain_features(features))
+            
+            # ファイルをアーカイブに移動
+            shutil.move(file_path, os.path.join(self.config['archive_dir'], file))
+            return True
+            
+        except Exception as e:
+            print(f"ファイル{file}の処理中にエラー: {e}")
+            self.metrics.count('file_errors')
+            return False
+    
+    def _ingest_files_parallel(self, source_files):
+        """プロセスプールでファイルをチャンク単位に並列処理する
+        
+        各ワーカーは独自の形態素解析器を持ち、チャンク内の共起ペアと語彙頻度を
+        部分集計して返す。部分集計は self.vocabulary の共起行列を起点に
+        トーナメント方式で併合し、ファイルはその文書の結果を取り込んだ後にのみ
+        アーカイブへ移動する。
+        """
+        workers = self.config.get('workers', 1)
+        chunk_size = max(1, self.config.get('chunk_size', 16))
+        file_paths = [os.path.join(self.config['source_dir'], f) for f in source_files]
+        chunks = [file_paths[i:i + chunk_size] for i in range(0, len(file_paths), chunk_size)]
+        
+        print(f"並列処理: {workers}プロセス, チャンクサイズ{chunk_size}（{len(chunks)}チャンク）")
+        
+        all_features = []
+        pair_partials = [self._new_pair_counter()]
+        freq_partials = []
+        
+        # ワーカーでは起動時の計測をせず、選択済みの形態素解析エンジンを使う
+        worker_config = dict(self.config, tokenizer_backend=self.tokenizer_backend.name,
+                             corpus_store_path=None)
+        
+        # 常駐モードでは起動済みのプールを再利用し、辞書の読み込みを繰り返さない
+        if self._worker_pool is not None:
+            pool_context = contextlib.nullcontext(self._worker_pool)
+        else:
+            pool_context = ProcessPoolExecutor(max_workers=workers,
+                                               initializer=_init_ingest_worker,
+                                               initargs=(worker_config,))
+        
+        with pool_context as pool:
+            futures = [pool.submit(_ingest_chunk, chunk) for chunk in chunks]
+            
+            # 文書順を保つため投入順に結果を取り込む
+            for chunk, future in zip(chunks, futures):
+                try:
+                    doc_results, chunk_pairs, chunk_freq, chunk_filter_stats = future.result()
+                except Exception as e:
+                    print(f"チャンク（{os.path.basename(chunk[0])}ほか{len(chunk)}件）の処理中にエラー: {e}")
+                    self.metrics.count('file_errors', len(chunk))
+                    continue
+                
+                self.metrics.record_filter(chunk_filter_stats)
+                for file_path, features, error in doc_results:
+                    file = os.path.basename(file_path)
+                    if error is not None:
+                        print(f"ファイル{file}の処理中にエラー: {error}")
+                        self.metrics.count('file_errors')
+                        continue
+                    
+                    if features is not None:
+                        all_features.append(self._retain_features(features))
+                    
+                    # 結果の取り込み後にアーカイブへ移動
+                    try:
+                        shutil.move(file_path, os.path.join(self.config['archive_dir'], file))
+                    except Exception as e:
+                        print(f"ファイル{file}の移動中にエラー: {e}")
+                
+                pair_partials.append(chunk_pairs)
+                freq_partials.append(chunk_freq)
+        
+        return all_features, _tree_reduce(pair_partials), _tree_reduce(freq_partials)
+    
+    def watch(self, interval=None, report_interval=None, max_polls=None):
+        """source_dir を監視し、到着したファイルを常駐プロセスのパイプラインで取り込む
+        
+        形態素解析器・語彙フィルタ・語彙ID表、読み込み済みのトピックモデルと
+        コーパス状態、並列処理用のワーカープールを保持したまま、検出 → 読み込み →
+        特徴抽出 → 集計をスレッドでつなぎ、1件ごとの所要時間を表示する（詳細は
+        _WatchPipeline）。分析・描画は別スレッドで watch_report_interval 秒ごと、
+        または watch_report_min_docs 件の新着が溜まった時点で実行し、取り込みは
+        止めない。Ctrl+C / SIGTERM で取り込み中の分をレポートしてから終了する
+        （max_polls を指定するとその回数のポーリングで終了）。
+        """
+        import signal
+        
+        pipeline = _WatchPipeline(
+            self,
+            interval=self.config.get('watch_interval', 2.0) if interval is None else interval,
+            report_interval=(self.config.get('watch_report_interval', 300)
+                             if report_interval is None else report_interval),
+            max_polls=max_polls)
+        
+        # SIGTERMでも後始末をして終了できるようにする（メインスレッドのみ登録可能）
+        previous_handler = None
+        if threading.current_thread() is threading.main_thread():
+            previous_handler = signal.signal(signal.SIGTERM, lambda signum, frame: pipeline.stop.set())
+        
+        workers = self.config.get('workers', 1)
+        if workers > 1:
+            worker_config = dict(self.config, tokenizer_backend=self.tokenizer_backend.name,
+                                 corpus_store_path=None)
+            self._worker_pool = ProcessPoolExecutor(max_workers=workers,
+                                                    initializer=_init_ingest_worker,
+                                                    initargs=(worker_config,))
+        self._render_pool = self._create_render_pool()
+        
+        # パイプラインのスレッドを起動する前にワーカープロセスを起動しておく
+        for pool in (self._worker_pool, self._render_pool):
+            if pool is not None:
+                pool.submit(int).result()
+        
+        try:
+            pipeline.run()
+        finally:
+            for pool in (self._worker_pool, self._render_pool):
+                if pool is not None:
+                    pool.shutdown()
+            self._worker_pool = None
+            self._render_pool = None
+            if previous_handler is not None:
+                signal.signal(signal.SIGTERM, previous_handler)
+    
+    def _settled_source_files(self, settle, failed, in_flight=()):
+        """更新から settle 秒以上経ったテキストファイル（処理中のもの、失敗後に変更がないものは除く）"""
+        source_dir = self.config['source_dir']
+        now = time.time()
+        ready = []
+        
+        try:
+            entries = sorted(os.scandir(source_dir), key=lambda entry: entry.name)
+        except OSError as e:
+            print(f"⚠️ {source_dir} を読み取れません: {e}")
+            return ready
+        
+        for entry in entries:
+            if not entry.name.endswith('.txt') or entry.name in in_flight or not entry.is_file():
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            if now - stat.st_mtime < settle:
+                continue
+            if failed.get(entry.name) == (stat.st_size, stat.st_mtime_ns):
+                continue
+            ready.append(entry.name)
+        return ready
+    
+    def _watch_report(self, batch):
+        """常駐モードで溜まった文書を分析・レポートし、計測結果を書き出す（描画スレッドで実行）"""
+        print(f"=== {len(batch.features)}件の新着文書を分析します ===")
+        
+        # 取り込み側は計測値に触れないため、バッチに記録した分をここで反映する
+        self.metrics.reset()
+        self.metrics.count('files', batch.files)
+        if batch.file_errors:
+            self.metrics.count('file_errors', batch.file_errors)
+        self.metrics.record_stage('ingest', batch.busy_seconds, calls=batch.files)
+        self.metrics.record_filter(batch.filter_stats)
+        self._record_ingest_metrics(batch.features)
+        if batch.latencies:
+            ordered = sorted(batch.latencies)
+            self.metrics.gauge('file_latency_ms_p50', ordered[len(ordered) // 2])
+            self.metrics.gauge('file_latency_ms_p95', ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))])
+            self.metrics.gauge('file_latency_ms_max', ordered[-1])
+        if getattr(batch.pairs, 'approximate', False):
+            print(f"共起ペアを近似集計しました（保持{len(batch.pairs):,}組、重みの誤差上限{batch.pairs.error_bound:.3f}）")
+            self.metrics.gauge('cooccurrence_error_bound', batch.pairs.error_bound)
+        
+        try:
+            self._analyze_and_report(batch.features, batch.pairs, batch.word_freq, batch.store_start)
+        except Exception as e:
+            # 常駐を続けるため、分析の失敗は表示して次の周期へ進む
+            print(f"❌ 新着文書の分析に失敗しました: {e}")
+        finally:
+            self.metrics.emit()
     
     def send_enhanced_email(self):
         """改良されたメール送信機能"""
@@ -1118,14 +4041,19 @@ class AdvancedTextMiner:
                 ('wordcloud_filtered.png', self.results['wordcloud_path'])
             ]
             
+            max_mb = self._render_profile()['attachment_max_mb']
             for filename, filepath in attachments:
                 if os.path.exists(filepath):
                     with open(filepath, 'rb') as f:
-                        part = MIMEBase('application', 'octet-stream')
-                        part.set_payload(f.read())
-                        encoders.encode_base64(part)
-                        part.add_header('Content-Disposition', f'attachment; filename="{filename}"')
-                        msg.attach(part)
+                        payload = f.read()
+                    if max_mb and len(payload) > max_mb * 1024 * 1024:
+                        payload = self._shrink_png(payload, int(max_mb * 1024 * 1024))
+                        print(f"添付画像 {filename} を{len(payload) / 1024:.0f}KBに縮小しました")
+                    part = MIMEBase('application', 'octet-stream')
+                    part.set_payload(payload)
+                    encoders.encode_base64(part)
+                    part.add_header('Content-Disposition', f'attachment; filename="{filename}"')
+                    msg.attach(part)
             
             # 送信
             with smtplib.SMTP_SSL('smtp.gmail.com', 465) as smtp:
@@ -1136,8 +4064,621 @@ class AdvancedTextMiner:
             
         except Exception as e:
             print(f"メール送信エラー: {e}")
+    
+    @staticmethod
+    def _shrink_png(payload, max_bytes):
+        """PNG画像を上限サイズに収まるまで縮小して返す（縦横比は維持）"""
+        from PIL import Image
+        
+        image = Image.open(io.BytesIO(payload))
+        while len(payload) > max_bytes and min(image.size) > 64:
+            # 画素数がおおむねサイズに比例するとみて、少し余裕をもって縮める
+            ratio = max(0.9 * (max_bytes / len(payload)) ** 0.5, 0.25)
+            image = image.resize((max(1, int(image.width * ratio)), max(1, int(image.height * ratio))),
+                                 Image.LANCZOS)
+            buffer = io.BytesIO()
+            image.save(buffer, format='PNG', optimize=True)
+            payload = buffer.getvalue()
+        return payload
+
+# 並列処理ワーカー（プロセスごとに形態素解析器を保持）
+_ingest_worker_miner = None
+
+
+def _init_ingest_worker(config):
+    """ワーカープロセスの初期化：プロセス専用のAdvancedTextMinerを構築"""
+    global _ingest_worker_miner
+    with contextlib.redirect_stdout(io.StringIO()):
+        _ingest_worker_miner = AdvancedTextMiner(config=config)
+
+
+def _ingest_chunk(file_paths):
+    """チャンク内のファイルを処理し、文書ごとの結果と部分集計（語彙フィルタの判定件数を含む）を返す
+    
+    語彙ID表はチャンクごとに作り直し、結果にはそのチャンクに現れた語だけを載せる
+    （親プロセスで self.vocabulary に付け替える）。
+    """
+    miner = _ingest_worker_miner
+    miner.vocabulary = Vocabulary()
+    doc_results = []
+    chunk_pairs = miner._new_pair_counter()
+    chunk_freq = Counter()
+    miner.word_filter.stats.clear()
+    
+    for file_path in file_paths:
+        try:
+            features = miner.extract_features_from_file(file_path)
+            
+            if features is None:
+                doc_results.append((file_path, None, None))
+                continue
+            
+            # 共起ペアはチャンク単位で集計済みのため文書結果から除く
+            chunk_pairs.update(features.pop('pairs'))
+            chunk_freq.update(features['word_frequency'])
+            doc_results.append((file_path, features, None))
+            
+        except Exception as e:
+            doc_results.append((file_path, None, str(e)))
+    
+    return doc_results, chunk_pairs, chunk_freq, Counter(miner.word_filter.stats)
+
+
+class RenderScheduler:
+    """成果物の生成処理を依存関係（DAG）に沿って実行し、成果物ごとの所要時間を記録する
+
+    remote（(メソッド名, 引数)）を指定したタスクは、pool があればプロセスプール上の
+    AdvancedTextMiner で実行する（スレッド安全でないmatplotlibの描画をプロセスごとに
+    分離する）。それ以外のタスクは呼び出し元で順に実行し、その間もプール側の
+    タスクは並行して進む。呼び出し元で実行した段階は metrics で詳細計測できるが、
+    プール側はワーカー内の経過時間のみを記録する。
+    """
+
+    def __init__(self, metrics, pool=None):
+        self.metrics = metrics
+        self.pool = pool
+        self.tasks = {}
+        self.results = {}
+        self.durations = {}
+        self.remote = set()
+        self.wall_seconds = 0.0
+
+    def add(self, name, func, deps=(), remote=None):
+        """タスクを登録（func は引数なしで呼ばれ、戻り値は results[name] に入る）"""
+        self.tasks[name] = (func, tuple(deps), remote)
+
+    def run(self):
+        """全タスクを実行して results を返す（タスクの例外はそのまま送出）"""
+        from concurrent.futures import wait, FIRST_COMPLETED
+        
+        pending = dict(self.tasks)
+        futures = {}
+        started = time.perf_counter()
+        
+        try:
+            while pending or futures:
+                ready = [name for name, (_, deps, _) in pending.items()
+                         if all(dep in self.results for dep in deps)]
+                
+                # プールで実行できるものを先に投入し、呼び出し元の処理と重ねる
+                for name in ready:
+                    remote = pending[name][2]
+                    if remote is not None and self.pool is not None:
+                        del pending[name]
+                        self.remote.add(name)
+                        futures[self.pool.submit(_run_render_task, *remote)] = name
+                
+                local = [name for name in ready if name in pending]
+                if local:
+                    name = local[0]
+                    func = pending.pop(name)[0]
+                    task_started = time.perf_counter()
+                    with self.metrics.stage(name):
+                        self.results[name] = func()
+                    self.durations[name] = time.perf_counter() - task_started
+                    continue
+                
+                if futures:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = futures.pop(future)
+                        self.results[name], seconds = future.result()
+                        self.durations[name] = seconds
+                        self.metrics.record_stage(name, seconds)
+                elif pending:
+                    raise ValueError(f"依存関係を満たせないタスクがあります: {', '.join(pending)}")
+        finally:
+            for future in futures:
+                future.cancel()
+        
+        self.wall_seconds = time.perf_counter() - started
+        return self.results
+
+    def print_durations(self):
+        """成果物ごとの所要時間と、逐次実行した場合との比較を表示"""
+        print("⏱ 成果物の生成時間:")
+        for name in self.tasks:
+            if name in self.durations:
+                where = "（別プロセス）" if name in self.remote else ""
+                print(f"・{name}: {self.durations[name]:.2f}秒{where}")
+        total = sum(self.durations.values())
+        print(f"・全体: {self.wall_seconds:.2f}秒（各成果物の合計{total:.2f}秒）")
+
+
+# 描画ワーカー（プロセスごとにAdvancedTextMinerを保持）
+_render_worker_miner = None
+
+
+def _init_render_worker(config):
+    """描画ワーカープロセスの初期化：プロセス専用のAdvancedTextMinerを構築"""
+    global _render_worker_miner
+    with contextlib.redirect_stdout(io.StringIO()):
+        _render_worker_miner = AdvancedTextMiner(config=config)
+
+
+def _run_render_task(method, args):
+    """描画ワーカーで AdvancedTextMiner のメソッドを実行し、(戻り値, 秒数) を返す"""
+    started = time.perf_counter()
+    result = getattr(_render_worker_miner, method)(*args)
+    return result, time.perf_counter() - started
+
+
+class _WatchBatch:
+    """常駐モードで次の分析までに取り込んだ文書の集計"""
+
+    def __init__(self, pair_counter, store_start=None):
+        self.features = []
+        self.store_start = store_start
+        self.pairs = pair_counter
+        self.word_freq = Counter()
+        self.filter_stats = Counter()
+        self.latencies = []
+        self.busy_seconds = 0.0
+        self.files = 0
+        self.file_errors = 0
+
+
+class _WatchPipeline:
+    """常駐モードの取り込みパイプライン
+    
+    検出（ポーリング）→ 読み込み → 特徴抽出 → 集計 をスレッドと上限付きキューで
+    つなぎ、下流が詰まると上流の put が待つことで取り込み量を抑える。集計は呼び出し
+    元のスレッドで行い、ファイルはその文書の結果を取り込んだ後にアーカイブへ移動する。
+    分析・描画は専用スレッドに溜まった分をまとめて渡し、描画中に届いた文書は次の
+    バッチに回す（取り込みは描画を待たない）。
+    
+    語彙ID表を更新するのは逐次処理では特徴抽出スレッドのみ、ワーカープール使用時は
+    集計スレッドのみで、描画スレッドは読み取りだけを行う。
+    """
+
+    _DONE = object()
+
+    def __init__(self, miner, interval, report_interval, max_polls=None):
+        config = miner.config
+        self.miner = miner
+        self.interval = interval
+        self.report_interval = report_interval
+        self.report_min_docs = config.get('watch_report_min_docs', 200)
+        self.settle = config.get('watch_settle_seconds', 1.0)
+        self.max_polls = max_polls
+        self.threshold = config.get('streaming_threshold_mb', 64) * 1024 * 1024
+        
+        queue_size = max(1, config.get('watch_queue_size', 64))
+        self.read_queue = queue.Queue(queue_size)
+        self.extract_queue = queue.Queue(queue_size)
+        self.aggregate_queue = queue.Queue(queue_size)
+        self.render_queue = queue.Queue(1)
+        
+        # プール使用時はワーカー数だけ並べ、各スレッドが1件ずつプールに投げる
+        self.extract_threads = config.get('workers', 1) if miner._worker_pool is not None else 1
+        
+        self.stop = threading.Event()
+        self.render_idle = threading.Event()
+        self.render_idle.set()
+        self.in_flight = set()
+        self.failed = {}
+
+    def run(self):
+        """パイプラインを起動し、停止要求後に取り込み中の分を処理し終えるまで集計を続ける"""
+        miner = self.miner
+        os.makedirs(miner.config['archive_dir'], exist_ok=True)
+        os.makedirs(miner.config['output_dir'], exist_ok=True)
+        
+        print(f"=== 常駐モード開始: {miner.config['source_dir']} を{self.interval}秒間隔で監視 ===")
+        print(f"形態素解析エンジン: {miner.tokenizer_backend.describe()}、"
+              f"レポート間隔{self.report_interval}秒または{self.report_min_docs}件ごと")
+        
+        threads = [threading.Thread(target=self._discover, name='watch-discover', daemon=True),
+                   threading.Thread(target=self._read, name='watch-read', daemon=True)]
+        threads += [threading.Thread(target=self._extract, name=f'watch-extract-{i}', daemon=True)
+                    for i in range(self.extract_threads)]
+        renderer = threading.Thread(target=self._render, name='watch-render', daemon=True)
+        for thread in threads + [renderer]:
+            thread.start()
+        
+        batch = self._new_batch()
+        last_report = time.monotonic()
+        remaining = self.extract_threads
+        
+        while remaining:
+            try:
+                try:
+                    item = self.aggregate_queue.get(timeout=0.2)
+                except queue.Empty:
+                    item = None
+                
+                if item is self._DONE:
+                    remaining -= 1
+                elif item is not None:
+                    self._aggregate(batch, *item)
+                
+                due = (time.monotonic() - last_report >= self.report_interval
+                       or (self.report_min_docs and len(batch.features) >= self.report_min_docs))
+                if batch.features and due and self.render_idle.is_set():
+                    self._hand_off(batch)
+                    batch = self._new_batch()
+                    last_report = time.monotonic()
+            except KeyboardInterrupt:
+                # 1回目の中断は停止要求として扱い、取り込み中の分を処理し切る
+                if self.stop.is_set():
+                    raise
+                self.stop.set()
+        
+        print("常駐モードを終了します")
+        if batch.features:
+            self.render_idle.wait()
+            self._hand_off(batch)
+        self.render_queue.put(self._DONE)
+        renderer.join()
+
+    def _new_batch(self):
+        store = self.miner.corpus_store
+        return _WatchBatch(self.miner._new_pair_counter(),
+                           store.total_docs if store is not None else None)
+
+    def _hand_off(self, batch):
+        # 描画スレッドはストアの書き出し済みの範囲だけを読む
+        if self.miner.corpus_store is not None:
+            self.miner.corpus_store.flush()
+        self.render_idle.clear()
+        self.render_queue.put(batch)
+
+    def _discover(self):
+        """source_dir をポーリングし、書き込みが落ち着いた新着ファイルを送る"""
+        polls = 0
+        try:
+            while not self.stop.is_set():
+                for file in self.miner._settled_source_files(self.settle, self.failed, self.in_flight):
+                    self.in_flight.add(file)
+                    # キューが満杯なら下流が空くまで待つ（その間は検出もしない）
+                    self.read_queue.put((file, time.perf_counter()))
+                
+                polls += 1
+                if self.max_polls is not None and polls >= self.max_polls:
+                    self.stop.set()
+                    break
+                self.stop.wait(self.interval)
+        finally:
+            self.read_queue.put(self._DONE)
+
+    def _read(self):
+        """ファイルを読み込む（巨大ファイルとプール使用時はパスのみを渡し、抽出側で読む）"""
+        source_dir = self.miner.config['source_dir']
+        while True:
+            item = self.read_queue.get()
+            if item is self._DONE:
+                break
+            file, discovered = item
+            path = os.path.join(source_dir, file)
+            try:
+                if self.miner._worker_pool is not None or os.path.getsize(path) >= self.threshold:
+                    text = None
+                else:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        text = f.read()
+            except Exception as e:
+                self.aggregate_queue.put((file, discovered, None, e, None, 0.0))
+                continue
+            self.extract_queue.put((file, discovered, text))
+        
+        for _ in range(self.extract_threads):
+            self.extract_queue.put(self._DONE)
+
+    def _extract(self):
+        """形態素解析と特徴抽出（結果と語彙フィルタの判定件数・処理時間を集計へ送る）"""
+        miner = self.miner
+        source_dir = miner.config['source_dir']
+        while True:
+            item = self.extract_queue.get()
+            if item is self._DONE:
+                break
+            file, discovered, text = item
+            path = os.path.join(source_dir, file)
+            started = time.perf_counter()
+            
+            features = error = filter_stats = None
+            try:
+                if miner._worker_pool is not None:
+                    doc_results, pairs, _, filter_stats = miner._worker_pool.submit(_ingest_chunk, [path]).result()
+                    _, features, error = doc_results[0]
+                    if features is not None:
+                        features['pairs'] = pairs
+                else:
+                    filter_before = Counter(miner.word_filter.stats)
+                    if text is None:
+                        features = miner.extract_features_from_file(path)
+                    elif text.strip():
+                        features = miner.extract_enhanced_features(text)
+                    filter_stats = miner.word_filter.stats - filter_before
+            except Exception as e:
+                error = e
+            
+            self.aggregate_queue.put((file, discovered, features, error, filter_stats,
+                                      time.perf_counter() - started))
+        
+        self.aggregate_queue.put(self._DONE)
+
+    def _aggregate(self, batch, file, discovered, features, error, filter_stats, seconds):
+        """抽出結果をバッチに加え、ファイルをアーカイブへ移動する（集計スレッド）"""
+        miner = self.miner
+        path = os.path.join(miner.config['source_dir'], file)
+        batch.files += 1
+        batch.busy_seconds += seconds
+        if filter_stats:
+            batch.filter_stats.update(filter_stats)
+        
+        if error is None:
+            try:
+                if features is not None:
+                    batch.pairs.update(features['pairs'])
+                    batch.word_freq.update(features['word_frequency'])
+                    batch.features.append(miner._retain_features(features))
+                shutil.move(path, os.path.join(miner.config['archive_dir'], file))
+            except Exception as e:
+                error = e
+        
+        if error is not None:
+            print(f"ファイル{file}の処理中にエラー: {error}")
+            batch.file_errors += 1
+            # 処理できずに残ったファイルは、内容が変わるまで再試行しない
+            try:
+                stat = os.stat(path)
+                self.failed[file] = (stat.st_size, stat.st_mtime_ns)
+            except OSError:
+                pass
+        else:
+            self.failed.pop(file, None)
+            latency_ms = (time.perf_counter() - discovered) * 1000
+            batch.latencies.append(latency_ms)
+            print(f"{file}: {latency_ms:.1f}ms（解析{seconds * 1000:.1f}ms）")
+        self.in_flight.discard(file)
+
+    def _render(self):
+        """渡されたバッチを分析・描画する（取り込みとは独立したスレッド）"""
+        while True:
+            batch = self.render_queue.get()
+            if batch is self._DONE:
+                break
+            try:
+                self.miner._watch_report(batch)
+            finally:
+                self.render_idle.set()
+
+
+class _TopicSearchContext:
+    """トピック数探索用のgensim辞書・コーパス（文書×語行列の1-gram列）を保持し、トピック数ごとに評価する"""
+
+    def __init__(self, texts, dtm, passes):
+        self.texts = texts
+        self.passes = passes
+        self.dictionary = dtm.gensim_dictionary()
+        self.corpus = dtm.gensim_corpus()
+
+    def score(self, num_topics):
+        """LDAを訓練してc_vコヒーレンスを計算し (トピック数, スコア, 秒数, モデル) を返す"""
+        from gensim.models import LdaModel
+        from gensim.models.coherencemodel import CoherenceModel
+        
+        started = time.perf_counter()
+        lda_model = LdaModel(
+            corpus=self.corpus,
+            id2word=self.dictionary,
+            num_topics=num_topics,
+            random_state=42,
+            passes=self.passes
+        )
+        
+        coherence_model = CoherenceModel(
+            model=lda_model,
+            texts=self.texts,
+            dictionary=self.dictionary,
+            coherence='c_v'
+        )
+        coherence = float(coherence_model.get_coherence())
+        
+        return num_topics, coherence, time.perf_counter() - started, lda_model
+
+
+# トピック数探索ワーカー（プロセスごとに辞書・コーパスを構築）
+_topic_worker_context = None
+
+
+def _thread_safe_mp_context():
+    """他のスレッドが動いていればforkserver、そうでなければ既定のプロセス生成方式を返す
+    
+    スレッドが動いている最中のforkは、子プロセスにロックを保持したまま複製される
+    おそれがある（既定がforkのLinuxで、常駐モードのパイプラインから起動する場合）。
+    """
+    import multiprocessing
+    if threading.active_count() > 1 and 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return None
+
+
+def _init_topic_worker(texts, dtm, passes):
+    global _topic_worker_context
+    _topic_worker_context = _TopicSearchContext(texts, dtm, passes)
+
+
+def _score_topic_count(num_topics):
+    return _topic_worker_context.score(num_topics)
+
+
+def _tree_reduce(counters):
+    """Counter（または CooccurrenceMatrix）のリストをトーナメント方式（二分木）で併合する"""
+    counters = list(counters)
+    if not counters:
+        return Counter()
+    
+    while len(counters) > 1:
+        merged = []
+        for i in range(0, len(counters) - 1, 2):
+            counters[i].update(counters[i + 1])
+            merged.append(counters[i])
+        if len(counters) % 2:
+            merged.append(counters[-1])
+        counters = merged
+    
+    return counters[0]
+
+
+def _analyze_paths(miner, paths):
+    """指定ファイルの特徴量を抽出（アーカイブへの移動は行わない）"""
+    all_features = []
+    all_pair_counter = miner._new_pair_counter()
+    all_word_freq = Counter()
+    
+    for path in paths:
+        features = miner.extract_features_from_file(path)
+        if features is None:
+            continue
+        features['path'] = path
+        all_features.append(features)
+        all_pair_counter.update(features['pairs'])
+        all_word_freq.update(features['word_frequency'])
+    
+    return all_features, all_pair_counter, all_word_freq
+
+
+def _cli_tokenize(miner, args):
+    """フィルタリング後のトークン列を1文書1行で出力"""
+    for path in args.files:
+        with open(path, 'r', encoding='utf-8') as f:
+            print(' '.join(miner.tokenize_cached(f.read())))
+
+
+def _cli_features(miner, args):
+    """文書ごとの統計量と上位の共起ペアをJSONで出力"""
+    with contextlib.redirect_stdout(sys.stderr):
+        all_features, _, _ = _analyze_paths(miner, args.files)
+    for features in all_features:
+        print(json.dumps({
+            'path': features['path'],
+            'word_count': features['word_count'],
+            'unique_words': features['unique_words'],
+            'char_count': features['char_count'],
+            'avg_word_length': float(features['avg_word_length']),
+            'ttr': features['ttr'],
+            'top_words': features['word_frequency'].most_common(args.top),
+            'top_pairs': [[w1, w2, weight] for (w1, w2), weight in features['pairs'].most_common(args.top)],
+        }, ensure_ascii=False))
+
+
+def _cli_topics(miner, args):
+    """指定ファイルのトピックを抽出して出力"""
+    with contextlib.redirect_stdout(sys.stderr):
+        all_features, _, _ = _analyze_paths(miner, args.files)
+        token_docs = [f['words'] for f in all_features if f['words'] is not None]
+        topics, _ = miner.advanced_topic_modeling(token_docs)
+    
+    if not topics:
+        print("トピックを抽出できませんでした。")
+        return
+    for topic in topics:
+        print(f"トピック{topic['id'] + 1}: {topic['description']}")
+
+
+def _cli_render(miner, args):
+    """指定ファイルからネットワーク図・ワードクラウド・ダッシュボードを生成"""
+    output_dir = args.output_dir or miner.config['output_dir']
+    os.makedirs(output_dir, exist_ok=True)
+    all_features, all_pair_counter, all_word_freq = _analyze_paths(miner, args.files)
+    
+    if not all_features:
+        print("処理可能なテキストデータがありませんでした。")
+        return
+    
+    network_path = os.path.join(output_dir, 'network_filtered.png')
+    print(f"・インタラクティブ版: {miner.create_interactive_network(all_pair_counter, network_path)}")
+    print(f"・ネットワーク図: {network_path}")
+    print(f"・ワードクラウド: {miner.create_wordcloud(all_word_freq, os.path.join(output_dir, 'wordcloud_filtered.png'))}")
+    print(f"・ダッシュボード: {miner.create_analysis_dashboard(all_features, None, output_dir)}")
+
+
+def _cli_watch(miner, args):
+    """source_dir を監視し、到着したファイルを常駐プロセスで処理し続ける"""
+    miner.watch(interval=args.interval, report_interval=args.report_interval)
+
+
+def _cli_report(miner, args):
+    """source_dir の全ファイルを処理し、レポート生成・メール送信まで実行"""
+    miner.process_files()
+
+
+def main(argv=None):
+    """コマンドラインの入口（サブコマンド省略時は report を実行）
+    
+    tokenize / features は形態素解析と共起集計のみを読み込み、
+    可視化・機械学習ライブラリは読み込まない。
+    """
+    parser = argparse.ArgumentParser(description='客観的テキストマイニング分析ツール')
+    parser.add_argument('--config', help='設定ファイル（JSON）のパス')
+    parser.add_argument('--profile', choices=sorted(RENDER_PROFILES),
+                        help='描画品質（省略時は設定の render_profile）')
+    subparsers = parser.add_subparsers(dest='command')
+    
+    tokenize_parser = subparsers.add_parser('tokenize', help='フィルタリング後のトークン列を出力')
+    tokenize_parser.add_argument('files', nargs='+')
+    tokenize_parser.set_defaults(handler=_cli_tokenize)
+    
+    features_parser = subparsers.add_parser('features', help='文書ごとの特徴量をJSONで出力')
+    features_parser.add_argument('files', nargs='+')
+    features_parser.add_argument('--top', type=int, default=10, help='出力する上位語・共起ペアの件数')
+    features_parser.set_defaults(handler=_cli_features)
+    
+    topics_parser = subparsers.add_parser('topics', help='トピックモデリングの結果を出力')
+    topics_parser.add_argument('files', nargs='+')
+    topics_parser.set_defaults(handler=_cli_topics)
+    
+    render_parser = subparsers.add_parser('render', help='ネットワーク図・ワードクラウド・ダッシュボードを生成')
+    render_parser.add_argument('files', nargs='+')
+    render_parser.add_argument('--output-dir', help='出力先（省略時は設定の output_dir）')
+    render_parser.set_defaults(handler=_cli_render)
+    
+    report_parser = subparsers.add_parser('report', help='source_dir を処理してレポートを作成・送信（既定）')
+    report_parser.set_defaults(handler=_cli_report)
+    
+    watch_parser = subparsers.add_parser('watch', help='source_dir を監視して到着ファイルを常駐プロセスで処理')
+    watch_parser.add_argument('--interval', type=float, help='ポーリング間隔（秒、省略時は設定の watch_interval）')
+    watch_parser.add_argument('--report-interval', type=float,
+                              help='新着文書をまとめて分析する間隔（秒、省略時は設定の watch_report_interval）')
+    watch_parser.set_defaults(handler=_cli_watch)
+    
+    args = parser.parse_args(argv)
+    handler = getattr(args, 'handler', _cli_report)
+    
+    # 出力を機械処理しやすいよう、初期化時の診断メッセージは標準エラーへ
+    if handler in (_cli_tokenize, _cli_features, _cli_topics):
+        with contextlib.redirect_stdout(sys.stderr):
+            miner = AdvancedTextMiner(args.config)
+    else:
+        miner = AdvancedTextMiner(args.config)
+    if args.profile:
+        miner.config['render_profile'] = args.profile
+    
+    handler(miner, args)
+
 
 # 実行部分
 if __name__ == "__main__":
-    miner = AdvancedTextMiner()
-    miner.process_files()
+    main()
@@ -0,0 +1,41 @@
+import io
+import os
+import sys
+import contextlib
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import objective_text_miner as otm  # noqa: E402
+
+
+SENTENCES = [
+    '社会の信頼は経済の発展を支える。',
+    '田中さんは新しい技術について研究を進めていると思います。',
+    '地域の教育と文化が大きく変化した。',
+    'しかし、市場の情報によって企業の戦略が変わる。',
+    '環境政策は重要な課題であり、資源の安全を守る。',
+    '医療と労働の制度を見直すためにデータを分析します。',
+]
+
+
+def make_text(index, sentences=8):
+    """文書ごとに異なる語順のテキストを作る"""
+    return ''.join(SENTENCES[(index * 5 + i * 7) % len(SENTENCES)] for i in range(sentences))
+
+
+@pytest.fixture
+def make_miner(tmp_path):
+    """一時ディレクトリを入出力先にした AdvancedTextMiner を作る（エンジンはjanome固定）"""
+    def factory(name='miner', **overrides):
+        base = tmp_path / name
+        config = otm.AdvancedTextMiner._default_config(None)
+        config.update(source_dir=str(base / 'src'), archive_dir=str(base / 'archive'),
+                      output_dir=str(base / 'out'), tokenizer_backend='janome')
+        config.update(overrides)
+        for key in ('source_dir', 'archive_dir', 'output_dir'):
+            os.makedirs(config[key], exist_ok=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            return otm.AdvancedTextMiner(config=config)
+    return factory
@@ -0,0 +1,35 @@
+import random
+
+import networkx as nx
+import pytest
+
+import objective_text_miner as otm
+
+
+def cooccurrence_graph(num_nodes, self_loops, seed=0):
+    G = nx.barabasi_albert_graph(num_nodes, 2, seed=seed)
+    rng = random.Random(seed)
+    G.add_edges_from((node, node) for node in rng.sample(list(G), self_loops))
+    for u, v in G.edges():
+        G[u][v]['weight'] = rng.uniform(1, 20)
+    return G
+
+
+@pytest.mark.parametrize('self_loops', [0, 5])
+def test_sparse_centrality_matches_networkx(self_loops):
+    G = cooccurrence_graph(60, self_loops)
+    centrality = otm.SparseCentrality.from_graph(G)
+
+    expected = {'degree': nx.degree_centrality(G), 'pagerank': nx.pagerank(G),
+                'betweenness': nx.betweenness_centrality(G)}
+    actual = {'degree': centrality.degree(), 'pagerank': centrality.pagerank(),
+              'betweenness': centrality.betweenness()}
+    for measure, values in expected.items():
+        assert actual[measure] == pytest.approx(values, abs=1e-6), measure
+
+
+def test_self_loop_counts_twice_in_degree():
+    G = nx.Graph([('経済', '社会'), ('社会', '信頼'), ('経済', '経済')])
+    degree = otm.SparseCentrality.from_graph(G).degree()
+    assert degree == pytest.approx(nx.degree_centrality(G))
+    assert degree['経済'] == pytest.approx(3 / 2)
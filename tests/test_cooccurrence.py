@@ -0,0 +1,95 @@
+import random
+from collections import Counter
+
+import pytest
+
+import objective_text_miner as otm
+
+
+WORDS = ['経済', '社会', '信頼', '発展', '技術', '研究', '地域', '教育', '文化', '市場',
+         '情報', '企業', '戦略', '環境', '政策', '資源', '医療', '制度']
+
+
+def random_docs(num_docs, seed=0, min_length=0, max_length=60):
+    rng = random.Random(seed)
+    # 語の出現頻度に偏りを持たせ、同じ語が近くに繰り返される（自己ペアの）場合も含める
+    weights = [1 / (rank + 1) for rank in range(len(WORDS))]
+    return [rng.choices(WORDS, weights, k=rng.randint(min_length, max_length)) for _ in range(num_docs)]
+
+
+def reference_pairs(docs, window_sizes=(3, 5, 10)):
+    """従来の三重ループによる重み付き共起集計"""
+    weighted_pairs = Counter()
+    for words in docs:
+        for window in window_sizes:
+            weight = 1.0 / window
+            for i in range(len(words)):
+                for j in range(i + 1, min(i + window, len(words))):
+                    pair = tuple(sorted((words[i], words[j])))
+                    weighted_pairs[pair] += weight
+    return weighted_pairs
+
+
+@pytest.mark.parametrize('consolidate_threshold', [2000000, 50])
+def test_matrix_matches_triple_loop(consolidate_threshold):
+    docs = random_docs(30)
+    matrix = otm.CooccurrenceMatrix(consolidate_threshold=consolidate_threshold)
+    for words in docs:
+        matrix.add_document(words)
+
+    expected = reference_pairs(docs)
+    assert set(matrix) == set(expected)
+    assert matrix.to_counter() == pytest.approx(expected)
+    # [] は語の順序によらず同じ重みを返す
+    assert matrix['経済', '社会'] == matrix['社会', '経済'] == pytest.approx(expected[tuple(sorted(('経済', '社会')))])
+
+
+def test_merge_across_vocabularies_matches_triple_loop():
+    docs = random_docs(20, seed=1)
+    merged = otm.CooccurrenceMatrix()
+    for words in docs[:10]:
+        merged.add_document(words)
+    # 語の登録順が異なる語彙の行列を併合してもIDが正しく変換される
+    other = otm.CooccurrenceMatrix(otm.Vocabulary(reversed(WORDS)))
+    for words in docs[10:]:
+        other.add_document(words)
+    merged.merge(other)
+
+    assert merged.to_counter() == pytest.approx(reference_pairs(docs))
+
+
+def test_most_common_matches_full_sort():
+    matrix = otm.CooccurrenceMatrix()
+    for words in random_docs(30, seed=2):
+        matrix.add_document(words)
+    ranked = sorted(matrix.items(), key=lambda item: -item[1])
+
+    for n in (15, 40, 1, None, 15):
+        top = matrix.most_common(n)
+        assert [weight for _, weight in top] == [weight for _, weight in ranked[:n]]
+        assert dict(top).items() <= dict(matrix.items()).items()
+
+    # 加算後は保持していた上位結果を使わない
+    matrix.add_document(['経済', '社会'] * 50)
+    assert matrix.most_common(1)[0][0] == tuple(sorted(('経済', '社会')))
+
+
+@pytest.mark.parametrize('capacity', [10, 40])
+def test_approximate_weights_stay_within_error_bound(capacity):
+    docs = random_docs(200, seed=3, max_length=30)
+    exact = otm.CooccurrenceMatrix()
+    approximate = otm.CooccurrenceMatrix(capacity=capacity, consolidate_threshold=100)
+    for words in docs:
+        exact.add_document(words)
+        approximate.add_document(words)
+
+    assert approximate.approximate
+    assert len(approximate) <= capacity
+    true_weights = exact.to_counter()
+    bound = approximate.error_bound
+    for pair, estimate in approximate.items():
+        assert true_weights[pair] - 1e-9 <= estimate <= true_weights[pair] + bound + 1e-9
+    # 捨てたペアの真値は誤差上限を超えない
+    for pair, weight in true_weights.items():
+        if approximate[pair] == 0:
+            assert weight <= bound + 1e-9
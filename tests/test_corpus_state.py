@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+import objective_text_miner as otm
+from conftest import make_text
+
+
+def extract_run(miner, indices):
+    all_features = [miner.extract_enhanced_features(make_text(i)) for i in indices]
+    pair_counter = miner._new_pair_counter()
+    for features in all_features:
+        pair_counter.update(features['pairs'])
+    return all_features, pair_counter
+
+
+def bag_of_words(state):
+    id2word = state.vocabulary.id2word
+    return [{id2word[i]: count for i, count in doc} for doc in state.gensim_corpus()]
+
+
+def test_save_load_merge_matches_single_run(make_miner, tmp_path):
+    miner = make_miner()
+    state_path = str(tmp_path / 'state.npz')
+
+    first = otm.CorpusState()
+    first.merge_run(*extract_run(miner, range(4)))
+    first.save(state_path)
+    restored = otm.CorpusState.load(state_path)
+    restored.merge_run(*extract_run(miner, range(4, 9)))
+
+    expected = otm.CorpusState()
+    expected.merge_run(*extract_run(make_miner('single'), range(9)))
+
+    assert restored.num_docs == expected.num_docs == 9
+    assert restored.word_frequency == expected.word_frequency
+    assert restored.pairs.to_counter() == pytest.approx(expected.pairs.to_counter())
+    assert bag_of_words(restored) == bag_of_words(expected)
+    for column in otm.CorpusState.STAT_COLUMNS:
+        np.testing.assert_allclose(restored.doc_stats[column], expected.doc_stats[column])
+
+
+def test_approximate_bounds_survive_save_and_load(make_miner, tmp_path):
+    miner = make_miner(cooccurrence_mode='approximate', cooccurrence_capacity=20)
+    state = otm.CorpusState()
+    all_features, pair_counter = extract_run(miner, range(6))
+    pair_counter.tocsr()
+    assert pair_counter.approximate
+
+    state.merge_run(all_features, pair_counter)
+    state.save(str(tmp_path / 'state.npz'))
+    restored = otm.CorpusState.load(str(tmp_path / 'state.npz'))
+
+    assert restored.pairs.capacity == 20
+    assert restored.pairs.error_bound == state.pairs.error_bound > 0
+    assert len(restored.pairs) <= 20
+
+    exact = otm.CorpusState()
+    exact.save(str(tmp_path / 'exact.npz'))
+    restored = otm.CorpusState.load(str(tmp_path / 'exact.npz'))
+    assert restored.pairs.capacity is None and restored.pairs.error_bound == 0
+
+
+def test_load_rejects_other_versions(tmp_path, monkeypatch):
+    path = str(tmp_path / 'state.npz')
+    monkeypatch.setattr(otm.CorpusState, 'VERSION', otm.CorpusState.VERSION - 1)
+    otm.CorpusState().save(path)
+    monkeypatch.undo()
+
+    with pytest.raises(ValueError):
+        otm.CorpusState.load(path)
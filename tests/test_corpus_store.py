@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+import objective_text_miner as otm
+from conftest import make_text
+
+
+def extract(miner, indices, streamed=()):
+    return [miner.extract_features_streaming([make_text(i)]) if i in streamed
+            else miner.extract_enhanced_features(make_text(i)) for i in indices]
+
+
+def assert_store_matches(store, all_features):
+    assert store.num_docs == len(all_features)
+    tokenized = [i for i, features in enumerate(all_features) if features['words'] is not None]
+    assert store.tokenized().tolist() == tokenized
+    assert store.token_docs() == [all_features[i]['words'] for i in tokenized]
+    assert list(store.word_frequencies()) == [features['word_frequency'] if features['words'] is not None else None
+                                              for features in all_features]
+    stats = store.document_stats()
+    for column in otm.CorpusStore.STAT_COLUMNS:
+        np.testing.assert_allclose(stats.column(column), [features[column] for features in all_features])
+
+
+def test_store_reopen_and_append_round_trip(make_miner, tmp_path):
+    miner = make_miner()
+    path = str(tmp_path / 'store')
+    first = extract(miner, range(5), streamed={3})
+
+    store = otm.CorpusStore(path, flush_docs=2)
+    for features in first:
+        store.append(features)
+    # flush_docs に満たない末尾は flush() まで読み出し側に見えない
+    assert store.num_docs == 4 and store.total_docs == 5
+    store.flush()
+    assert_store_matches(store, first)
+
+    reopened = otm.CorpusStore(path)
+    assert_store_matches(reopened, first)
+    second = extract(miner, range(5, 9))
+    for features in second:
+        reopened.append(features)
+    reopened.flush()
+
+    assert_store_matches(otm.CorpusStore(path), first + second)
+    assert next(otm.CorpusStore(path).word_frequencies(5, 7)) == second[0]['word_frequency']
+
+
+def test_interrupted_flush_is_truncated_on_next_write(make_miner, tmp_path):
+    miner = make_miner()
+    path = str(tmp_path / 'store')
+    all_features = extract(miner, range(6))
+
+    store = otm.CorpusStore(path)
+    for features in all_features[:3]:
+        store.append(features)
+    store.flush()
+
+    # meta.json を更新する前に止まった書き出しの残骸
+    with open(store._file('tokens'), 'ab') as f:
+        f.write(b'\xff' * 12)
+    with open(store._file('vocab'), 'ab') as f:
+        f.write('"途中"\n'.encode('utf-8'))
+
+    reopened = otm.CorpusStore(path)
+    assert_store_matches(reopened, all_features[:3])
+    for features in all_features[3:]:
+        reopened.append(features)
+    reopened.flush()
+    assert_store_matches(otm.CorpusStore(path), all_features)
+
+
+def test_store_rejects_other_versions(make_miner, tmp_path, monkeypatch):
+    path = str(tmp_path / 'store')
+    store = otm.CorpusStore(path)
+    store.append(make_miner().extract_enhanced_features(make_text(0)))
+    store.flush()
+
+    monkeypatch.setattr(otm.CorpusStore, 'VERSION', otm.CorpusStore.VERSION + 1)
+    with pytest.raises(ValueError):
+        otm.CorpusStore(path)
@@ -0,0 +1,53 @@
+import os
+import sys
+import json
+import subprocess
+
+import objective_text_miner as otm
+from conftest import make_text
+
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 起動時に読み込んではならない可視化・機械学習ライブラリ
+HEAVY_MODULES = ('gensim', 'sklearn', 'matplotlib', 'networkx', 'wordcloud',
+                 'plotly', 'seaborn', 'pandas', 'scipy')
+
+# 新しいインタプリタでの import objective_text_miner の上限（numpyの読み込みを含む）
+IMPORT_BUDGET_SECONDS = 1.0
+
+
+def run_python(code, *args):
+    return subprocess.run([sys.executable, '-X', 'importtime', '-c', code, *args], cwd=REPO_DIR,
+                          capture_output=True, text=True, check=True, timeout=120)
+
+
+def loaded_heavy_modules():
+    return f"import sys, json; print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+
+
+def test_import_is_light_and_within_budget():
+    result = run_python("import objective_text_miner; " + loaded_heavy_modules())
+    assert json.loads(result.stdout) == []
+
+    # -X importtime の出力： "import time: 自身(us) | 累積(us) | モジュール名"
+    cumulative = [int(line.split('|')[1]) for line in result.stderr.splitlines()
+                  if line.rstrip().endswith('| objective_text_miner')]
+    assert cumulative, result.stderr[-2000:]
+    assert cumulative[-1] / 1e6 < IMPORT_BUDGET_SECONDS
+
+
+def test_tokenize_command_does_not_load_heavy_modules(tmp_path):
+    config = otm.AdvancedTextMiner._default_config(None)
+    config.update(tokenizer_backend='janome', output_dir=str(tmp_path))
+    config_path = tmp_path / 'config.json'
+    config_path.write_text(json.dumps(config, ensure_ascii=False), encoding='utf-8')
+    text_path = tmp_path / 'doc.txt'
+    text_path.write_text(make_text(0), encoding='utf-8')
+
+    code = ("import sys, objective_text_miner as otm; "
+            "otm.main(['--config', sys.argv[1], 'tokenize', sys.argv[2]]); " + loaded_heavy_modules())
+    result = run_python(code, str(config_path), str(text_path))
+    lines = result.stdout.strip().splitlines()
+    assert '経済' in lines[0]
+    assert json.loads(lines[-1]) == []
@@ -0,0 +1,34 @@
+import sys
+
+import numpy as np
+import pytest
+
+import objective_text_miner as otm
+
+
+MB = 1024 * 1024
+
+
+def allocate(megabytes):
+    block = np.ones(megabytes * MB // 8)
+    return float(block.sum())
+
+
+@pytest.mark.skipif(sys.platform != 'linux', reason='RSSの計測値はLinuxでのみ安定')
+def test_stage_memory_is_reported_per_stage(tmp_path):
+    metrics = otm.Instrumentation(profile_stages=['small'], profile_tools=['tracemalloc'],
+                                  profile_dir=str(tmp_path))
+    with metrics.stage('large'):
+        allocate(160)
+    with metrics.stage('small'):
+        allocate(40)
+
+    large, small = metrics.stages['large'], metrics.stages['small']
+    assert large['peak_rss_growth_bytes'] > 100 * MB
+    # 直前の段階より小さい割り当ては、プロセスの最大RSSを押し上げない
+    assert small['peak_rss_growth_bytes'] < 20 * MB
+    assert small['process_peak_rss_bytes'] >= large['process_peak_rss_bytes']
+    assert 'peak_rss_bytes' not in small
+
+    assert 35 * MB < small['python_peak_bytes'] < 60 * MB
+    assert 'python_peak_bytes' not in large
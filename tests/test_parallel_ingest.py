@@ -0,0 +1,68 @@
+import io
+import os
+import contextlib
+
+import pytest
+
+import objective_text_miner as otm
+from conftest import SENTENCES, make_text
+
+
+NUM_DOCS = 12
+
+
+def write_corpus(miner):
+    paths = []
+    for index in range(NUM_DOCS):
+        path = os.path.join(miner.config['source_dir'], f'doc{index:02d}.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(make_text(index))
+        paths.append(path)
+    return paths
+
+
+def test_chunk_results_carry_only_chunk_vocabulary(make_miner):
+    miner = make_miner()
+    # チャンクごとに異なる文から作り、語彙が重ならないようにする
+    paths = []
+    for index, sentences in enumerate((SENTENCES[:3], SENTENCES[:3], SENTENCES[3:], SENTENCES[3:])):
+        path = os.path.join(miner.config['source_dir'], f'doc{index}.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(''.join(sentences))
+        paths.append(path)
+    otm._init_ingest_worker(miner.config)
+    
+    for chunk in (paths[:2], paths[2:]):
+        doc_results, chunk_pairs, chunk_freq, _ = otm._ingest_chunk(chunk)
+        vocabularies = {id(features.vocabulary) for _, features, _ in doc_results}
+        vocabularies.add(id(chunk_pairs.vocabulary))
+        assert len(vocabularies) == 1
+        # 前のチャンクの語は載せない
+        assert set(chunk_pairs.vocabulary.id2word) == set(chunk_freq)
+
+
+def test_parallel_features_share_parent_vocabulary(make_miner):
+    miner = make_miner('parallel', workers=2, chunk_size=3)
+    texts = [make_text(index) for index in range(NUM_DOCS)]
+    write_corpus(miner)
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        features, pairs, word_freq = miner._ingest_files_parallel(sorted(os.listdir(miner.config['source_dir'])))
+    
+    assert len(features) == NUM_DOCS
+    assert all(f.vocabulary is miner.vocabulary for f in features)
+    assert pairs.vocabulary is miner.vocabulary
+    
+    # 直列処理と同じ結果になる
+    serial = make_miner('serial')
+    expected = [serial.extract_enhanced_features(text) for text in texts]
+    assert [f['words'] for f in features] == [f['words'] for f in expected]
+    assert [f['word_frequency'] for f in features] == [f['word_frequency'] for f in expected]
+    
+    expected_pairs = serial._new_pair_counter()
+    expected_freq = otm.Counter()
+    for f in expected:
+        expected_pairs.update(f['pairs'])
+        expected_freq.update(f['word_frequency'])
+    assert word_freq == expected_freq
+    assert dict(pairs.items()) == pytest.approx(dict(expected_pairs.items()))
@@ -0,0 +1,75 @@
+import os
+import json
+import time
+from collections import Counter
+
+import objective_text_miner as otm
+
+
+PAIRS = Counter({('経済', '社会'): 9.0, ('社会', '信頼'): 7.5, ('信頼', '発展'): 6.0,
+                 ('発展', '技術'): 4.5, ('技術', '研究'): 3.0, ('研究', '経済'): 2.5})
+
+
+def count_calls(monkeypatch, obj, name):
+    calls = []
+    original = getattr(obj, name)
+
+    def wrapper(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(obj, name, wrapper)
+    return calls
+
+
+def test_second_network_render_hits_cache(make_miner, tmp_path, monkeypatch):
+    miner = make_miner(render_cache_dir=str(tmp_path / 'cache'), render_profile='draft')
+    builds = count_calls(monkeypatch, miner, 'build_network')
+    output_path = os.path.join(miner.config['output_dir'], 'network.png')
+    layout_path = os.path.join(miner.config['output_dir'], 'network_layout.json')
+
+    miner.create_interactive_network(PAIRS, output_path)
+    with open(layout_path, encoding='utf-8') as f:
+        first_layout = json.load(f)
+    first_png = open(output_path, 'rb').read()
+    os.remove(output_path)
+
+    # 配置キャッシュが更新されていても、同じ入力なら描画を省略して配置も書き戻す
+    miner.create_interactive_network(PAIRS, output_path)
+    assert len(builds) == 1
+    assert open(output_path, 'rb').read() == first_png
+    with open(layout_path, encoding='utf-8') as f:
+        assert json.load(f) == first_layout
+    assert len(os.listdir(tmp_path / 'cache')) == 1
+    assert not [name for name in os.listdir(miner.config['output_dir']) if '.layout' in name]
+
+    miner.create_interactive_network(PAIRS + Counter({('経済', '技術'): 8.0}), output_path)
+    assert len(builds) == 2
+
+
+def test_render_cache_evicts_least_recently_used(tmp_path):
+    cache = otm.RenderCache(str(tmp_path / 'cache'), max_bytes=10 ** 6, max_entries=2)
+    source = tmp_path / 'artifact.png'
+    keys = [cache.key('wordcloud', {'frequencies': [[word, 1]]}) for word in ('経済', '社会', '信頼')]
+
+    for index, key in enumerate(keys[:2]):
+        source.write_bytes(bytes([index]) * 100)
+        cache.store(key, {'wordcloud.png': str(source)})
+        time.sleep(0.01)
+
+    # 最初のエントリを参照し直すと、次の保存では2番目が削除される
+    restored = tmp_path / 'restored.png'
+    assert cache.fetch(keys[0], {'wordcloud.png': str(restored)})
+    assert restored.read_bytes() == bytes([0]) * 100
+    time.sleep(0.01)
+    cache.store(keys[2], {'wordcloud.png': str(source)})
+
+    assert sorted(os.listdir(tmp_path / 'cache')) == sorted([keys[0], keys[2]])
+    assert not cache.fetch(keys[1], {'wordcloud.png': str(restored)})
+
+    # 合計サイズの上限も同じ順序で適用される
+    small = otm.RenderCache(str(tmp_path / 'small'), max_bytes=150, max_entries=10)
+    for key in keys[:2]:
+        small.store(key, {'wordcloud.png': str(source)})
+        time.sleep(0.01)
+    assert os.listdir(tmp_path / 'small') == [keys[1]]
@@ -0,0 +1,39 @@
+import io
+import pickle
+import contextlib
+from collections import Counter
+
+import objective_text_miner as otm
+from conftest import make_text
+
+
+def test_remote_render_tasks_receive_only_render_inputs(make_miner, monkeypatch):
+    miner = make_miner(render_profile='draft', network_top_n=10, min_frequency=2)
+    for i in range(6):
+        with open(f"{miner.config['source_dir']}/doc{i}.txt", 'w', encoding='utf-8') as f:
+            f.write(make_text(i))
+
+    remote_args = {}
+    original_add = otm.RenderScheduler.add
+
+    def add(self, name, func, deps=(), remote=None):
+        if remote is not None:
+            remote_args[name] = remote
+        return original_add(self, name, func, deps=deps, remote=remote)
+
+    monkeypatch.setattr(otm.RenderScheduler, 'add', add)
+    with contextlib.redirect_stdout(io.StringIO()):
+        miner._process_files()
+
+    method, args = remote_args['network']
+    assert method == 'create_interactive_network'
+    top_pairs = args[3]
+    assert args[0] is None and len(top_pairs) == 10
+    assert all(isinstance(pair, tuple) and isinstance(weight, float) for pair, weight in top_pairs)
+
+    method, (frequencies, _) = remote_args['wordcloud']
+    assert method == 'create_wordcloud'
+    assert frequencies and min(frequencies.values()) >= 2
+    assert not any(isinstance(arg, (otm.CooccurrenceMatrix, Counter, otm.Vocabulary))
+                   for _, task_args in remote_args.values() for arg in task_args)
+    pickle.dumps(remote_args)
@@ -0,0 +1,34 @@
+import io
+
+import pytest
+
+from conftest import make_text
+
+
+TEXT = '\n'.join(make_text(i, sentences=6) for i in range(12)) + '\n' + make_text(12, sentences=30)
+
+
+@pytest.mark.parametrize('chunk_chars', [120, 1000])
+def test_chunks_split_on_line_or_sentence_boundaries(make_miner, chunk_chars):
+    miner = make_miner()
+    chunks = list(miner._iter_text_chunks(io.StringIO(TEXT), chunk_chars))
+
+    assert ''.join(chunks) == TEXT
+    assert len(chunks) > 1
+    assert all(chunk.endswith(('\n', '。')) for chunk in chunks)
+
+
+@pytest.mark.parametrize('chunk_chars', [120, 1000])
+def test_streaming_matches_whole_document(make_miner, tmp_path, chunk_chars):
+    path = tmp_path / 'large.txt'
+    path.write_text(TEXT, encoding='utf-8')
+
+    expected = make_miner('whole').extract_features_from_file(str(path))
+    streamed = make_miner('stream', streaming_threshold_mb=0,
+                          stream_chunk_chars=chunk_chars).extract_features_from_file(str(path))
+
+    assert streamed['words'] is None
+    assert streamed['word_frequency'] == expected['word_frequency']
+    assert streamed['pairs'].to_counter() == pytest.approx(expected['pairs'].to_counter())
+    for column in ('word_count', 'unique_words', 'char_count', 'avg_word_length', 'ttr'):
+        assert streamed[column] == pytest.approx(expected[column]), column
@@ -0,0 +1,80 @@
+import pytest
+
+import objective_text_miner as otm
+from conftest import make_text
+
+
+TEXT = make_text(0) + 'ｗｗｗ Pythonで、ｸﾞｰｸﾞﾙ検索！ジョンスミスとモフモフする。2024年 abc'
+
+
+def node_tokens(tagger, text):
+    """従来のノード単位の解析による (表層形, 原形, 品詞3階層) の列"""
+    tokens = []
+    node = tagger.parseToNode(text)
+    while node:
+        if node.surface:
+            features = node.feature.split(',')
+            if len(features) >= 4:
+                base_form = features[6] if len(features) > 6 and features[6] != '*' else node.surface
+                tokens.append((node.surface, base_form, features[0], features[1], features[2]))
+        node = node.next
+    return tokens
+
+
+def test_mecab_bulk_parse_matches_node_parse():
+    MeCab = pytest.importorskip('MeCab')
+    try:
+        backend = otm.MeCabBackend()
+    except RuntimeError as e:
+        pytest.skip(str(e))
+    
+    expected = node_tokens(MeCab.Tagger(backend.dict_args), TEXT)
+    assert backend.tokens(TEXT) == expected
+    assert any(token[4] == '*' for token in expected)
+
+
+def fake_backend(name, scheme, available=True):
+    class FakeBackend(otm.TokenizerBackend):
+        dictionary_scheme = scheme
+
+        def _create_analyzer(self):
+            if not available:
+                raise RuntimeError(f"{name} is not installed")
+            return object()
+
+        def tokens(self, text):
+            return []
+
+    FakeBackend.name = name
+    return FakeBackend
+
+
+@pytest.fixture
+def fake_backends(monkeypatch):
+    for cls in (fake_backend('ipa_missing', 'ipadic', available=False), fake_backend('ipa_fast', 'ipadic'),
+                fake_backend('unidic_fast', 'unidic'), fake_backend('ipa_slow', 'ipadic')):
+        monkeypatch.setitem(otm.TOKENIZER_BACKENDS, cls.name, cls)
+    benchmarked = []
+
+    def benchmark(backends, repeat=3):
+        benchmarked.append([backend.name for backend in backends])
+        return {backend.name: {'ipa_fast': 0.1, 'unidic_fast': 0.01}.get(backend.name, 1.0)
+                for backend in backends}
+
+    monkeypatch.setattr(otm.AdvancedTextMiner, '_benchmark_tokenizers', staticmethod(benchmark))
+    return benchmarked
+
+
+def test_auto_uses_first_available_candidate_without_benchmark(make_miner, fake_backends):
+    miner = make_miner(tokenizer_backend='auto',
+                       tokenizer_candidates=['ipa_missing', 'unidic_fast', 'ipa_fast'])
+    assert miner.tokenizer_backend.name == 'unidic_fast'
+    assert fake_backends == []
+    assert miner.tokenizer_backend.describe() == 'unidic_fast[unidic]'
+
+
+def test_auto_benchmark_compares_only_same_dictionary_scheme(make_miner, fake_backends):
+    miner = make_miner(tokenizer_backend='auto', tokenizer_auto_benchmark=True,
+                       tokenizer_candidates=['ipa_missing', 'ipa_slow', 'unidic_fast', 'ipa_fast'])
+    assert fake_backends == [['ipa_slow', 'ipa_fast']]
+    assert miner.tokenizer_backend.name == 'ipa_fast'
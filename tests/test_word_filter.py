@@ -0,0 +1,68 @@
+import itertools
+
+import pytest
+
+import objective_text_miner as otm
+
+
+POS_MAJORS = ('名詞', '動詞', '形容詞', '副詞', '助詞', '記号')
+POS_MINOR1 = ('一般', '固有名詞', 'サ変接続', '代名詞', '数', '自立', '非自立', '接尾', '*')
+POS_MINOR2 = ('助数詞', '接尾', '非自立', '一般', '人名', '*')
+
+
+def sample(words, n=3):
+    return sorted(words)[:n]
+
+
+def surfaces(miner):
+    """各除外カテゴリ・語尾・固有名詞の規則に当たる語と、採用される語"""
+    words = ['経済', '信頼', '研究', '発展', '本', 'abc', '2024', '１２３',
+             'タナカ', 'コンピュータ', '東京大学', 'トヨタ株式会社', '田中さん', '子供っぽい', '学生らしい']
+    words += sample(miner.inference_emotion_words) + sample(miner.structural_words)
+    words += sample(miner.functional_words) + sample(miner.honorific_words)
+    for pattern_set in otm.ADDITIONAL_EXCLUSION_PATTERNS.values():
+        words += sample(pattern_set, 2)
+    words += sample(otm.COMMON_ADJECTIVES)
+    return words
+
+
+def token_tuples(miner):
+    """(表層形, 原形, 品詞3階層) の組を網羅的に生成（原形は表層形か除外語）"""
+    words = surfaces(miner)
+    base_forms = [None, sample(miner.functional_words, 1)[0], '良い', '思う']
+    for surface, base_form, major, minor1, minor2 in itertools.product(
+            words, base_forms, POS_MAJORS, POS_MINOR1, POS_MINOR2):
+        yield surface, base_form or surface, major, minor1, minor2
+
+
+@pytest.fixture(scope='module')
+def miner(tmp_path_factory):
+    config = otm.AdvancedTextMiner._default_config(None)
+    config.update(tokenizer_backend='janome', output_dir=str(tmp_path_factory.mktemp('out')))
+    return otm.AdvancedTextMiner(config=config)
+
+
+@pytest.mark.parametrize('min_word_length', [1, 2, 3])
+@pytest.mark.parametrize('strict_pos_filtering', [True, False])
+@pytest.mark.parametrize('exclude_categories', [True, False])
+def test_compiled_filter_matches_reference(miner, min_word_length, strict_pos_filtering, exclude_categories):
+    miner.config.update(min_word_length=min_word_length, strict_pos_filtering=strict_pos_filtering,
+                        exclude_inference_emotion=exclude_categories,
+                        exclude_structural_words=exclude_categories)
+    miner._build_word_filter()
+
+    tokens = list(token_tuples(miner))
+    expected = [miner._is_meaningful_word_enhanced(*token) for token in tokens]
+    assert [miner.word_filter(*token) for token in tokens] == expected
+
+    # 一括判定（メモ化済みの判定を引く経路）も同じ結果
+    assert miner.word_filter.filter_tokens(tokens) == [t for t, ok in zip(tokens, expected) if ok]
+
+
+def test_generated_tokens_reach_every_branch(miner):
+    miner.config.update(min_word_length=2, strict_pos_filtering=True,
+                        exclude_inference_emotion=True, exclude_structural_words=True)
+    miner._build_word_filter()
+
+    reasons = {miner.word_filter._judge(*token) for token in token_tuples(miner)}
+    assert reasons == set(otm.FILTER_REJECTION_LABELS) | {otm.CompiledWordFilter.ACCEPTED}